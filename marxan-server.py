@@ -31,7 +31,11 @@ import tornado.options
 import webbrowser
 import logging
 import fnmatch
+import functools
+import hashlib
+import hmac
 import json
+import orjson
 import psycopg2
 import pandas
 import os
@@ -58,6 +62,8 @@ import asyncio
 import aiohttp
 import monkeypatch
 import numpy
+import pyarrow
+import pyarrow.csv
 import shlex
 from psycopg2.extensions import register_adapter, AsIs
 from tornado.websocket import WebSocketClosedError
@@ -75,12 +81,14 @@ from colorama import Fore, Back, Style
 from sqlalchemy import create_engine
 from collections import OrderedDict
 from subprocess import Popen, PIPE, CalledProcessError
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from threading import Thread
 from urllib.parse import urlparse
 from urllib import request
 from psycopg2 import sql
 from mapbox import Uploader
 from mapbox import errors
+from osgeo import gdal
 from osgeo import ogr
 
 ####################################################################################################################################################################################################################################################################
@@ -88,21 +96,25 @@ from osgeo import ogr
 ####################################################################################################################################################################################################################################################################
 
 # SECURITY SETTINGS
-PERMITTED_METHODS = ["getServerData", "createUser", "validateUser",
-                     "resendPassword", "testTornado", "getProjectsWithGrids"]
+PERMITTED_METHODS = frozenset(["getServerData", "createUser", "validateUser",
+                               "resendPassword", "testTornado", "getProjectsWithGrids"])
 """REST services that do not need authentication/authorisation."""
 ROLE_UNAUTHORISED_METHODS = {
-    "ReadOnly": ["createProject", "createImportProject", "upgradeProject", "deleteProject", "cloneProject", "createProjectGroup", "deleteProjects", "renameProject", "updateProjectParameters", "getCountries", "deletePlanningUnitGrid", "createPlanningUnitGrid", "uploadTilesetToMapBox", "uploadFileToFolder", "uploadFile", "importPlanningUnitGrid", "createFeaturePreprocessingFileFromImport", "createUser", "getUsers", "updateUserParameters", "getFeature", "importFeatures", "getPlanningUnitsData", "updatePUFile", "getSpeciesData", "getSpeciesPreProcessingData", "updateSpecFile", "getProtectedAreaIntersectionsData", "getMarxanLog", "getBestSolution", "getOutputSummary", "getSummedSolution", "getMissingValues", "preprocessFeature", "preprocessPlanningUnits", "preprocessProtectedAreas", "runMarxan", "stopProcess", "testRoleAuthorisation", "deleteFeature", "deleteUser", "getRunLogs", "clearRunLogs", "updateWDPA", "unzipShapefile", "getShapefileFieldnames", "createFeatureFromLinestring", "runGapAnalysis", "toggleEnableGuestUser", "importGBIFData", "deleteGapAnalysis", "shutdown", "addParameter", "block", "resetDatabase", "cleanup", "exportProject", "importProject", 'getCosts', 'updateCosts', 'deleteCost', 'runSQLFile', 'exportPlanningUnitGrid', 'exportFeature'],
-    "User": ["testRoleAuthorisation", "deleteFeature", "getUsers", "deleteUser", "deletePlanningUnitGrid", "clearRunLogs", "updateWDPA", "toggleEnableGuestUser", "shutdown", "addParameter", "block", "resetDatabase", "cleanup", 'runSQLFile'],
+    "ReadOnly": ["createProject", "createImportProject", "upgradeProject", "deleteProject", "cloneProject", "createProjectGroup", "deleteProjects", "renameProject", "updateProjectParameters", "getCountries", "deletePlanningUnitGrid", "createPlanningUnitGrid", "uploadTilesetToMapBox", "uploadFileToFolder", "uploadFile", "importPlanningUnitGrid", "createFeaturePreprocessingFileFromImport", "createUser", "getUsers", "updateUserParameters", "getFeature", "importFeatures", "getPlanningUnitsData", "updatePUFile", "getSpeciesData", "getSpeciesPreProcessingData", "updateSpecFile", "getProtectedAreaIntersectionsData", "getMarxanLog", "getBestSolution", "getOutputSummary", "getSummedSolution", "getMissingValues", "preprocessFeature", "preprocessPlanningUnits", "preprocessProtectedAreas", "runMarxan", "stopProcess", "testRoleAuthorisation", "deleteFeature", "deleteFeatures", "deleteUser", "getRunLogs", "clearRunLogs", "updateWDPA", "unzipShapefile", "getShapefileFieldnames", "createFeatureFromLinestring", "runGapAnalysis", "toggleEnableGuestUser", "importGBIFData", "deleteGapAnalysis", "shutdown", "addParameter", "block", "resetDatabase", "cleanup", "exportProject", "importProject", 'getCosts', 'updateCosts', 'deleteCost', 'runSQLFile', 'exportPlanningUnitGrid', 'exportFeature'],
+    "User": ["testRoleAuthorisation", "deleteFeature", "deleteFeatures", "getUsers", "deleteUser", "deletePlanningUnitGrid", "clearRunLogs", "updateWDPA", "toggleEnableGuestUser", "shutdown", "addParameter", "block", "resetDatabase", "cleanup", 'runSQLFile'],
     "Admin": []
 }
 """Dict that controls access to REST services using role-based authentication. Add REST services that you want to lock down to specific roles - a class added to an array will make that method unavailable for that role"""
+_UNAUTH_BY_ROLE = {role: tuple(methods) for role, methods in ROLE_UNAUTHORISED_METHODS.items()}
+"""Immutable view of ROLE_UNAUTHORISED_METHODS so hot paths can share one tuple per role rather than rebuilding the lookup on every request."""
 MARXAN_SERVER_VERSION = "v1.0.7"
 """The version of marxan-server."""
 MARXAN_REGISTRY = "https://marxanweb.github.io/general/registry/marxan.json"
 """The url of the Marxan Registry which contains information on hosted Marxan Web servers, base maps and other global level variables"""
 GUEST_USERNAME = "guest"
 """The name of the guest user"""
+ARROW_MIME_TYPE = "application/vnd.apache.arrow.stream"
+"""The mime type a client sends in the Accept header to get tabular results as an Arrow IPC stream rather than json."""
 NOT_AUTHENTICATED_ERROR = "Request could not be authenticated. No secure cookie found."
 NO_REFERER_ERROR = "The request header does not specify a referer and this is required for CORS access."
 MAPBOX_USER = "blishten"
@@ -135,6 +147,9 @@ WDPA_DOWNLOAD_FILENAME = "wdpa.zip"
 # file prefixes
 SOLUTION_FILE_PREFIX = "output_r"
 MISSING_VALUES_FILE_PREFIX = "output_mv"
+# upload settings
+MAX_UPLOAD_BODY_SIZE = 2147483648
+"""The maximum size in bytes of an uploaded file - upload bodies are streamed to disk so this does not reserve any memory."""
 # export settings
 EXPORT_F_SHP_FOLDER = "f_shps"
 """The name of the folder where feature shapefiles are exported to during a project export."""
@@ -174,7 +189,7 @@ LOGGING_LEVEL = logging.INFO
 
 #pdoc3 dict to whitelist private members for the documentation
 __pdoc__ = {}
-privateMembers = ['getGeometryType','_addParameter', '_authenticate', '_authoriseRole', '_authoriseUser', '_checkCORS', '_checkZippedShapefile', '_cleanup', '_cloneProject', '_copyDirectory', '_createFeaturePreprocessingFileFromImport', '_createProject', '_createPuFile', '_createUser', '_createZipfile', '_dataFrameContainsValue', '_debugSQLStatement', '_deleteAllFiles', '_deleteArchiveFiles', '_deleteCost', '_deleteFeature', '_deleteFeatureClass', '_deletePlanningUnitGrid', '_deleteProject', '_deleteRecordsInTextFile', '_deleteShutdownFile', '_deleteTileset', '_deleteZippedShapefile', '_dismissNotification', '_estimatePlanningUnitCount', '_exportAndZipShapefile', '_finishCreatingFeature', '_finishImportingFeature', '_getAllProjects', '_getAllSpeciesData', '_getBestSolution', '_getCosts', '_getDictValue', '_getEndOfLine', '_getExceptionLastLine', '_getFeature', '_getFilesInFolderRecursive', '_getGML', '_getIntArrayFromArg', '_getKeyValue', '_getKeyValuesFromFile', '_getKeys', '_getMBAT', '_getMarxanLog', '_getMissingValues', '_getNotificationsData', '_getNumberOfRunsCompleted', '_getNumberOfRunsRequired', '_getOutputFilename', '_getOutputSummary', '_getPlanningUnitGrids', '_getPlanningUnitsCostData', '_getPlanningUnitsData', '_getProjectData', '_getProjectInputData', '_getProjectInputFilename', '_getProjects', '_getProjectsForFeature', '_getProjectsForPlanningGrid', '_getProjectsForUser', '_getProtectedAreaIntersectionsData', '_getPuvsprStats', '_getRESTMethod', '_getRunLogs', '_getSafeProjectName', '_getServerData', '_getShapefileFieldNames', '_getSimpleArguments', '_getSolution', '_getSpeciesData', '_getSpeciesPreProcessingData', '_getSummedSolution', '_getUniqueFeatureclassName', '_getUserData', '_getUsers', '_getUsersData', '_get_free_space_mb', '_guestUserEnabled', '_importDataFrame', '_importPlanningUnitGrid', '_invalidateProtectedAreaIntersections', '_isProjectRunning', '_loadCSV', '_normaliseDataFrame', '_padDict', '_preprocessProtectedAreas', '_puidsArrayToPuDatFormat', '_raiseError', '_readFile', '_readFileUnicode', '_reprocessProtectedAreas', '_requestIsWebSocket', '_resetNotifications', '_runCmd', '_setCORS', '_setFolderPaths', '_setGlobalVariables', '_shapefileHasField', '_tilesetExists', '_txtIntsToList', '_unzipFile', '_unzipShapefile', '_updateCosts', '_updateDataFrame', '_updateParameters', '_updatePuFile', '_updateRunLog', '_updateSpeciesFile', '_uploadTileset', '_uploadTilesetToMapbox', '_validateArguments', '_writeCSV', '_writeFile', '_writeFileUnicode', '_writeToDatFile', '_zipfolder']
+privateMembers = ['getGeometryType','_addParameter', '_authenticate', '_authoriseRole', '_authoriseUser', '_checkCORS', '_checkZippedShapefile', '_cleanup', '_cloneProject', '_copyDirectory', '_copyQueryToFile', '_countRunOutputs','_createFeaturePreprocessingFileFromImport', '_createProject', '_createPuFile', '_createUser', '_createZipfile', '_dataFrameContainsValue', '_dataFrameToRecords','_debugSQLStatement', '_deleteAllFiles', '_deleteArchiveFiles', '_deleteCost', '_deleteFeature', '_deleteFeatureClass', '_deletePlanningUnitGrid', '_deleteProject', '_deleteProjectIfEmpty', '_deleteRecordsInTextFile', '_deleteShutdownFile', '_deleteTileset', '_deleteZippedShapefile', '_dismissNotification', '_estimatePlanningUnitCount', '_exportAndZipShapefile', '_fastCloneProject', '_finishCreatingFeature', '_finishImportingFeature', '_formatSQL', '_gdalImportFile', '_getAllProjects', '_getAllSpeciesData', '_getBestSolution', '_getCachedOutputData', '_getCachedResponseOrRefresh', '_getCosts', '_getCountries', '_getDictValue', '_getEndOfLine', '_getExceptionLastLine', '_getFeature', '_getFilesInFolderRecursive', '_getGML', '_getIntArrayFromArg', '_getKeyValue', '_getKeyValuesFromFile', '_getKeys', '_getMBAT', '_getMapboxSession', '_getMarxanLog', '_getMissingValues', '_getNotificationsData', '_getNumberOfRunsCompleted', '_getNumberOfRunsRequired', '_getOutputFilename', '_getOutputSummary', '_getPlanningUnitGrids', '_getPlanningUnitsCostData', '_getPlanningUnitsData', '_getProjectData', '_getProjectInputData', '_getProjectInputFilename', '_getProjectInputRowIndexes', '_getProjects', '_getProjectsForFeature', '_getProjectsForPlanningGrid', '_getProjectsForUser', '_getProtectedAreaIntersectionsData', '_getPuvsprStats', '_getRESTMethod', '_getRunLogs', '_getSafeProjectName', '_getServerData', '_getShapefileFieldNames', '_getShutdownTime', '_getSimpleArguments', '_getSolution', '_getSpeciesData', '_getSpeciesPreProcessingData', '_getSummedSolution', '_getUniqueFeatureclassName', '_getUpgradeSuffix', '_getUserData', '_getUsers', '_getUsersData', '_get_free_space_mb', '_guestUserEnabled', '_importDataFrame', '_importPlanningUnitGrid', '_initialiseImportWorker', '_invalidateAuthCache', '_invalidateCredentialsCache', '_invalidateProtectedAreaIntersections', '_isProjectRunning', '_loadCSV', '_loadCSVWithRecords', '_loadRunLog','_normaliseDataFrame', '_padDict', '_preprocessProtectedAreas', '_puidsArrayToPuDatFormat', '_raiseError', '_readFile', '_readFileUnicode', '_refreshCachedResponse', '_refreshProjectIndexes', '_reprocessProtectedAreas', '_requestIsWebSocket', '_resetNotifications', '_runCmd', '_setCORS', '_setCachedResponse', '_setFolderPaths', '_setGlobalVariables', '_shapefileHasField', '_tilesetExists', '_txtIntsToList', '_unzipFile', '_unzipShapefile', '_updateCosts', '_updateDataFrame', '_updateParameters', '_updatePuFile', '_updateRunLog', '_updateSpeciesFile', '_uploadTileset', '_uploadTilesetToMapbox', '_validateArguments', '_writeArrowResponse', '_writeCSV', '_writeFile', '_writeFileUnicode', '_writeToDatFile', '_zipfolder']
 for m in privateMembers:
     __pdoc__.update({m: True})
 
@@ -224,6 +239,9 @@ async def _setGlobalVariables():
     global DISABLE_SECURITY
     global DISABLE_FILE_LOGGING
     global ENABLE_RESET
+    global IMPORT_EXECUTOR
+    global OGR2OGR_PG_DSN
+    global OGR2OGR_EXPORT_ARGV_BASE
     global pg
     # get data from the marxan registry
     MBAT = _getMBAT()
@@ -251,15 +269,22 @@ async def _setGlobalVariables():
     ENABLE_RESET = _getDictValue(serverData, 'ENABLE_RESET')
     CONNECTION_STRING = "host='" + DATABASE_HOST + "' dbname='" + DATABASE_NAME + \
         "' user='" + DATABASE_USER + "' password='" + DATABASE_PASSWORD + "'"
+    # pre-build the invariant GDAL/ogr2ogr connection string once rather than concatenating it on every import/export
+    OGR2OGR_PG_DSN = 'PG:host=' + DATABASE_HOST + ' user=' + DATABASE_USER + \
+        ' dbname=' + DATABASE_NAME + ' password=' + DATABASE_PASSWORD
     # initialise the connection pool
     pg = PostGIS()
     await pg.initialise()
+    # create a warm pool of long-lived worker processes for the GDAL imports - each worker loads the drivers once and is reused for all subsequent imports
+    IMPORT_EXECUTOR = ProcessPoolExecutor(
+        max_workers=os.cpu_count(), initializer=_initialiseImportWorker)
     # get the database version
     results = await pg.execute("SELECT version(), PostGIS_Version();", returnFormat="Array")
     DATABASE_VERSION_POSTGRESQL, DATABASE_VERSION_POSTGIS = results[0]
     COOKIE_RANDOM_VALUE = _getDictValue(serverData, 'COOKIE_RANDOM_VALUE')
-    PERMITTED_DOMAINS = _getDictValue(
-        serverData, 'PERMITTED_DOMAINS').split(",")
+    # a frozenset so the CORS checks on every request and websocket open are a single hash lookup
+    PERMITTED_DOMAINS = frozenset(_getDictValue(
+        serverData, 'PERMITTED_DOMAINS').split(","))
     PLANNING_GRID_UNITS_LIMIT = int(_getDictValue(
         serverData, 'PLANNING_GRID_UNITS_LIMIT'))
     # get the GDAL_DATA environment variable
@@ -326,6 +351,9 @@ async def _setGlobalVariables():
                                   "' could not be found. Set it manually in the marxan-server.py file.")
     else:
         log(_padDict("ogr2ogr executable:", OGR2OGR_EXECUTABLE, DICT_PAD))
+    # pre-compile the invariant part of the shapefile export argv - the export folder is substituted at index 3 per call
+    OGR2OGR_EXPORT_ARGV_BASE = [OGR2OGR_EXECUTABLE, '-f', 'ESRI Shapefile',
+                                None, OGR2OGR_PG_DSN + ' ACTIVE_SCHEMA=marxan']
     # set the various folder paths
     MARXAN_USERS_FOLDER = MARXAN_FOLDER + "users" + os.sep
     CLUMP_FOLDER = MARXAN_USERS_FOLDER + "_clumping" + os.sep
@@ -405,8 +433,9 @@ def _raiseError(obj, msg):
     logging.warning(msg)
 
 
+@functools.lru_cache(maxsize=256)
 def _getRESTMethod(path):
-    """Gets the method part of the REST service path, e.g. /marxan-server/validateUser will return validateUser. Returns an empty string if the method is not found.
+    """Gets the method part of the REST service path, e.g. /marxan-server/validateUser will return validateUser. Returns an empty string if the method is not found. The paths are a small closed set matching the registered handlers so the results are cached.
 
     Args:
         path (string): The request path
@@ -476,8 +505,8 @@ def _getUsers():
     return [u for u in users if u[:1] != "_"]
 
 
-def _getUsersData(users):
-    """Gets all the users data for the passed users.
+async def _getUsersData(users):
+    """Gets all the users data for the passed users - the user.dat files are read concurrently on a thread pool so the total latency is roughly that of the slowest read rather than the sum of all of them.
 
     Args:
         users (string[]): The user names to get the data for.
@@ -485,19 +514,23 @@ def _getUsersData(users):
         dict[]: The users data as an array of dict.
     """
     users.sort()
-    usersData = []
-    # create a extendable object to hold the user data
-    tmpObj = ExtendableObject()
-    # iterate through the users
-    for user in users:
+
+    def _readOne(user):
+        # create a extendable object to hold the user data
+        tmpObj = ExtendableObject()
         tmpObj.folder_user = MARXAN_USERS_FOLDER + user + os.sep
         # get the data for the user
         _getUserData(tmpObj)
         # create a dict to save the data
         combinedDict = tmpObj.userData.copy()  # pylint:disable=no-member
         combinedDict.update({'user': user})
-        usersData.append(combinedDict)
-    return usersData
+        return combinedDict
+    loop = IOLoop.current()
+    return await gen.multi([loop.run_in_executor(None, _readOne, user) for user in users])
+
+
+_NOTIFICATIONS_CACHE = {}
+"""Cache of notifications keyed by file path, each value a (st_mtime_ns, ids) tuple - the file is only re-read when its modification time changes."""
 
 
 def _getNotificationsData(obj):
@@ -508,12 +541,17 @@ def _getNotificationsData(obj):
     Returns:
         string[]: The users notification data
     """
+    path = obj.folder_user + NOTIFICATIONS_FILENAME
+    # only re-read the file if it has changed since it was cached
+    mtime = os.stat(path).st_mtime_ns
+    cached = _NOTIFICATIONS_CACHE.get(path)
+    if cached and (cached[0] == mtime):
+        return list(cached[1])
     # get the data from the notifications file
-    s = _readFile(obj.folder_user + NOTIFICATIONS_FILENAME)
-    if (s == ""):
-        return []
-    else:
-        return s.split(",")
+    s = _readFile(path)
+    ids = [] if (s == "") else s.split(",")
+    _NOTIFICATIONS_CACHE[path] = (mtime, tuple(ids))
+    return ids
 
 
 def _dismissNotification(obj, notificationid):
@@ -525,10 +563,15 @@ def _dismissNotification(obj, notificationid):
     Returns:
         None  
     """
+    path = obj.folder_user + NOTIFICATIONS_FILENAME
     # get the data from the notifications file
     ids = _getNotificationsData(obj)
+    # append the id rather than rewriting the whole file, so a dismissal is a single small write however many notifications have already been dismissed
+    _writeFileUnicode(path, notificationid if (
+        ids == []) else "," + notificationid, mode='a')
+    # update the cache in place so the next read does not have to go back to the file
     ids.append(notificationid)
-    _writeFileUnicode(obj.folder_user + NOTIFICATIONS_FILENAME, ",".join(ids))
+    _NOTIFICATIONS_CACHE[path] = (os.stat(path).st_mtime_ns, tuple(ids))
 
 
 def _resetNotifications(obj):
@@ -668,8 +711,9 @@ def _cloneProject(source_folder, destination_folder):
     # recursively check that the folder does not exist until we get a new folder that doesnt exist
     while (os.path.exists(new_project_folder)):
         new_project_folder = new_project_folder[:-1] + "_copy" + os.sep
-    # copy the project
-    shutil.copytree(source_folder, new_project_folder)
+    # copy the project - copyfile keeps the kernel-space sendfile fast path for the file data and skips the per-file metadata copying that the default copy2 does
+    shutil.copytree(source_folder, new_project_folder,
+                    copy_function=shutil.copyfile)
     # update the description and create date
     _updateParameters(new_project_folder + PROJECT_DATA_FILENAME, {'DESCRIPTION': "Clone of project '" +
                                                                    original_project_name + "'",  'CREATEDATE': datetime.datetime.now().strftime("%d/%m/%y %H:%M:%S")})
@@ -677,6 +721,27 @@ def _cloneProject(source_folder, destination_folder):
     return new_project_folder[:-1].split(os.sep)[-1]
 
 
+def _fastCloneProject(source_folder, destination_folder):
+    """Clones a project folder by hardlinking each file instead of copying the bytes - for large input files this is orders of magnitude faster and uses no extra disk space. The project data file is physically copied as it is rewritten in place in the clone, and any file that cannot be hardlinked (e.g. if the destination is on a different device) is copied instead.
+
+    Args:
+        source_folder (string): Full folder path to the project folder to clone.  
+        destination_folder (string): Full folder path to the new project folder.  
+    Returns:
+        None  
+    """
+    def _linkOrCopy(src, dst):
+        if os.path.basename(src) == PROJECT_DATA_FILENAME:
+            shutil.copyfile(src, dst)
+        else:
+            try:
+                os.link(src, dst)
+            except OSError:
+                shutil.copyfile(src, dst)
+    shutil.copytree(source_folder, destination_folder,
+                    copy_function=_linkOrCopy)
+
+
 def _setFolderPaths(obj, arguments):
     """Sets the various paths to the users folder and project folders using the request arguments in the passed object.
 
@@ -686,13 +751,13 @@ def _setFolderPaths(obj, arguments):
     Returns:
         None  
     """
-    if "user" in list(arguments.keys()):
+    if "user" in arguments:
         # argument values are bytes
         user = arguments["user"][0].decode("utf-8")
         obj.folder_user = MARXAN_USERS_FOLDER + user + os.sep
         obj.user = user
         # get the project folder and the input and output folders
-        if "project" in list(arguments.keys()):
+        if "project" in arguments:
             obj.folder_project = obj.folder_user + arguments["project"][0].decode("utf-8").strip()  + os.sep
             obj.folder_input =  obj.folder_project + "input" + os.sep
             obj.folder_output = obj.folder_project + "output" + os.sep
@@ -763,6 +828,10 @@ async def _getProjectInputFilename(obj, fileToGet):
     return obj.projectData["files"][fileToGet]
 
 
+_INPUT_DATA_CACHE = {}
+"""In-memory cache of project input DataFrames keyed by file path, each value a ((st_mtime_ns, st_size), DataFrame) tuple - writes to the .dat files change the mtime so stale entries miss naturally."""
+
+
 async def _getProjectInputData(obj, fileToGet, errorIfNotExists=False):
     """Gets the projects input data using the fileToGet, e.g. SPECNAME will return the data from the file corresponding to the input.dat file SPECNAME setting.
 
@@ -774,7 +843,56 @@ async def _getProjectInputData(obj, fileToGet, errorIfNotExists=False):
         dict: The data from the input file.
     """
     filename = obj.folder_input + os.sep + await _getProjectInputFilename(obj, fileToGet)
-    return _loadCSV(filename, errorIfNotExists)
+    # serve repeated reads of an unchanged file from memory - e.g. when a user clicks through features in the UI the same puvspr.dat is requested many times in quick succession
+    try:
+        st = os.stat(filename)
+    except OSError:
+        return _loadCSV(filename, errorIfNotExists)
+    cached = _INPUT_DATA_CACHE.get(filename)
+    if cached and (cached[0] == (st.st_mtime_ns, st.st_size)):
+        # return a copy so callers that mutate the frame do not poison the cache - a copy is still far cheaper than re-reading the file
+        return cached[1].copy()
+    # keep a feather sidecar next to the .dat file so reopening a project does not re-tokenise the same CSV - the puvspr.dat file in particular can run to millions of rows
+    df = _loadCSV(filename, errorIfNotExists, cacheSidecar=True)
+    if len(_INPUT_DATA_CACHE) > 64:
+        _INPUT_DATA_CACHE.clear()
+    _INPUT_DATA_CACHE[filename] = ((st.st_mtime_ns, st.st_size), df.copy())
+    return df
+
+
+_ROW_INDEX_CACHE = {}
+"""Cache of row position lookups for the project input files keyed by (path, column), each value a ((st_mtime_ns, st_size), dict) tuple where the dict maps each column value to the row positions it occurs at."""
+
+
+async def _getProjectInputRowIndexes(obj, fileToGet, column, df):
+    """Gets a dict mapping each value in the column of the projects input file to the integer row positions it occurs at, so single-value lookups are an O(1) dict hit instead of a boolean mask scan of the whole dataframe. The dict is cached against the files mtime and size and the positions are valid for any dataframe loaded from the same file version.
+
+    Args:
+        obj (MarxanRESTHandler): The request handler instance.
+        fileToGet (string): The name of the input file as specified in the Input Files section of the input.dat file, e.g. PUNAME or PUVSPRNAME.
+        column (string): The column to index the rows by.
+        df (pandas.DataFrame): The dataframe loaded from the input file - used to build the index on a cache miss.
+    Returns:
+        dict: The column values mapped to numpy arrays of row positions.
+    """
+    filename = obj.folder_input + os.sep + await _getProjectInputFilename(obj, fileToGet)
+    try:
+        st = os.stat(filename)
+    except OSError:
+        return df.groupby(column, sort=False).indices
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _ROW_INDEX_CACHE.get((filename, column))
+    if cached and (cached[0] == stamp):
+        return cached[1]
+    indexes = df.groupby(column, sort=False).indices
+    if len(_ROW_INDEX_CACHE) > 128:
+        _ROW_INDEX_CACHE.clear()
+    _ROW_INDEX_CACHE[(filename, column)] = (stamp, indexes)
+    return indexes
+
+
+# precompiled pattern matching a KEY/VALUE line - the key uses the same character set as _getKeys and the value runs to the end of the line whether it is a windows or unix line ending
+_KEY_VALUE_REGEX = re.compile('\\n([A-Z1-9_]{2,}).?([^\\r\\n]*)')
 
 
 def _getKeyValuesFromFile(filename):
@@ -791,16 +909,18 @@ def _getKeyValuesFromFile(filename):
         raise MarxanServicesError("The file '" + filename + "' does not exist")
     # get the file contents
     s = _readFileUnicode(filename)
-    # get the keys from the file
-    keys = _getKeys(s)
-    # iterate through the keys, get their values and add them to a dictionary
+    # get all the key/value pairs in a single pass rather than rescanning the file for each key
     data = {}
-    for k in keys:
-        key, value = _getKeyValue(s, k)
-        # update the  dict
-        if value == "true":
+    for match in _KEY_VALUE_REGEX.finditer(s):
+        key = match.group(1)
+        # the first occurrence of a key wins
+        if key in data:
+            continue
+        value = match.group(2)
+        # convert any boolean text strings to boolean values - these will then get returned as javascript bool types
+        if value == "True" or value == "true":
             value = True
-        if value == "false":
+        if value == "False" or value == "false":
             value = False
         data[key] = value
     return data
@@ -825,6 +945,10 @@ def _get_free_space_mb():
     return (str("{:.1f}".format(space/1000)) + " Gb")
 
 
+_SERVER_DATA_CACHE = None
+"""Cached server configuration as a (st_mtime_ns, dict) tuple - rebuilt when the server.dat file changes, e.g. when the guest user is toggled."""
+
+
 def _getServerData(obj):
     """Gets all of the data about the server including from the server configuration file and the free space, processors and memory. These are set on the passed obj in the serverData attribute.
 
@@ -834,19 +958,26 @@ def _getServerData(obj):
         None  
     """
 
-    # get the data from the server configuration file
-    obj.serverData = _getKeyValuesFromFile(
-        MARXAN_FOLDER + SERVER_CONFIG_FILENAME)
-    # get the free space in Mb
-    space = _get_free_space_mb()
-    # get the number of processors
-    processors = psutil.cpu_count()
-    # get the virtual memory
-    memory = (
-        str("{:.1f}".format(psutil.virtual_memory().total/1000000000)) + " Gb")
-    # set the return values: permitted CORS domains - these are set in this Python module; the server os and hardware; the version of the marxan-server software
-    obj.serverData.update({"RAM": memory, "PROCESSOR_COUNT": processors, "DATABASE_VERSION_POSTGIS": DATABASE_VERSION_POSTGIS, "DATABASE_VERSION_POSTGRESQL": DATABASE_VERSION_POSTGRESQL, "SYSTEM": platform.system(), "NODE": platform.node(), "RELEASE": platform.release(
-    ), "VERSION": platform.version(), "MACHINE": platform.machine(), "PROCESSOR": platform.processor(), "MARXAN_SERVER_VERSION": MARXAN_SERVER_VERSION, "MARXAN_CLIENT_VERSION": MARXAN_CLIENT_VERSION, "SERVER_NAME": SERVER_NAME, "SERVER_DESCRIPTION": SERVER_DESCRIPTION, "DISK_FREE_SPACE": space})
+    global _SERVER_DATA_CACHE
+    path = MARXAN_FOLDER + SERVER_CONFIG_FILENAME
+    mtime = os.stat(path).st_mtime_ns
+    if _SERVER_DATA_CACHE and (_SERVER_DATA_CACHE[0] == mtime):
+        serverData = _SERVER_DATA_CACHE[1]
+    else:
+        # get the data from the server configuration file
+        serverData = _getKeyValuesFromFile(path)
+        # get the number of processors
+        processors = psutil.cpu_count()
+        # get the virtual memory
+        memory = (
+            str("{:.1f}".format(psutil.virtual_memory().total/1000000000)) + " Gb")
+        # set the return values: permitted CORS domains - these are set in this Python module; the server os and hardware; the version of the marxan-server software - none of these change while the process is running so the dict is cached against the server.dat mtime
+        serverData.update({"RAM": memory, "PROCESSOR_COUNT": processors, "DATABASE_VERSION_POSTGIS": DATABASE_VERSION_POSTGIS, "DATABASE_VERSION_POSTGRESQL": DATABASE_VERSION_POSTGRESQL, "SYSTEM": platform.system(), "NODE": platform.node(), "RELEASE": platform.release(
+        ), "VERSION": platform.version(), "MACHINE": platform.machine(), "PROCESSOR": platform.processor(), "MARXAN_SERVER_VERSION": MARXAN_SERVER_VERSION, "MARXAN_CLIENT_VERSION": MARXAN_CLIENT_VERSION, "SERVER_NAME": SERVER_NAME, "SERVER_DESCRIPTION": SERVER_DESCRIPTION})
+        _SERVER_DATA_CACHE = (mtime, serverData)
+    # copy the cached dict so callers can mutate their view, and refresh the free space which does change between requests
+    obj.serverData = dict(serverData)
+    obj.serverData["DISK_FREE_SPACE"] = _get_free_space_mb()
 
 
 def _getUserData(obj, returnPassword=False):
@@ -986,10 +1117,13 @@ def _getCosts(obj):
     Returns:
         None  
     """
-    # get all files that end in .cost
-    costFiles = glob.glob(obj.folder_input + "*.cost")
-    # get the names of the files
-    costNames = [os.path.basename(f)[:-5] for f in costFiles]
+    # get the names of all files that end in .cost - scandir lists the folder in a single getdents call and the name filter needs no per-file stat
+    try:
+        costNames = [e.name[:-5] for e in os.scandir(obj.folder_input)
+                     if e.name.endswith(".cost") and e.is_file(follow_symlinks=False)]
+    except FileNotFoundError:
+        # match glob's behaviour of returning no results for a missing folder
+        costNames = []
     # add the default cost profile
     costNames.append(UNIFORM_COST_NAME)
     costNames.sort()
@@ -1049,6 +1183,33 @@ def _deleteCost(obj, costname):
         os.remove(filename)
 
 
+@functools.lru_cache(maxsize=1)
+def _getUpgradeSuffix():
+    """Gets the text that upgradeProject appends to old input.dat files - everything from 'DESCRIPTION No description' onwards in the empty project template. The template is immutable at runtime so it is read and searched once and the result cached.
+
+    Args:
+        None
+    Returns:
+         string: The template text to append, or None if the marker is not in the template.
+    """
+    new = _readFileUnicode(
+        EMPTY_PROJECT_TEMPLATE_FOLDER + PROJECT_DATA_FILENAME)
+    pos = new.find("DESCRIPTION No description")
+    return new[pos:] if pos > -1 else None
+
+
+async def _getCountries():
+    """Gets the list of countries as a raw JSON string. The aggregation to JSON is done by Postgres with json_agg so the rows are never materialised as Python dicts and re-encoded.
+
+    Args:
+        None
+    Returns:
+         string: The country records as a JSON array.
+    """
+    records = await pg.execute("SELECT json_agg(t)::text FROM (SELECT t.iso3, t.name_iso31, CASE WHEN m.iso3 IS NULL THEN False ELSE True END has_marine FROM marxan.gaul_2015_simplified_1km t LEFT JOIN marxan.eez_simplified_1km m on t.iso3 = m.iso3 WHERE t.iso3 NOT LIKE '%|%' ORDER BY lower(t.name_iso31)) t;", returnFormat="Array")
+    return records[0][0] or "[]"
+
+
 async def _getPlanningUnitGrids():
     """Gets the data for all of the planning grids.
 
@@ -1124,7 +1285,7 @@ async def _preprocessProtectedAreas(obj, planning_grid_name, output_folder):
     #puids for all intersecting protected areas with a dissolved area of >50% of the planning unit 
     # intersectionData = await obj.executeQuery(sql.SQL("SELECT iucn_cat, puid FROM (SELECT iucn_cat, puid, (ST_Area(ST_Transform(ST_Union(ST_Intersection(wdpa.geometry,grid.geometry)), 3410))/ST_Area(ST_Transform(grid.geometry, 3410))) percent_overlap FROM marxan.wdpa, marxan.{} grid WHERE ST_Intersects(wdpa.geometry, grid.geometry) AND wdpaid IN (SELECT wdpaid FROM (SELECT envelope FROM marxan.metadata_planning_units WHERE feature_class_name = %s) AS sub, marxan.wdpa WHERE ST_Intersects(wdpa.geometry, envelope)) GROUP BY 1,2) AS sub2 WHERE percent_overlap >= %s ORDER BY 1,2").format(sql.Identifier(planning_grid_name)), data=[planning_grid_name, threshold], returnFormat="DataFrame")
     #puids for all intersecting protected areas
-    intersectionData = await obj.executeQuery(sql.SQL("SELECT DISTINCT iucn_cat, grid.puid FROM marxan.wdpa, marxan.{} grid WHERE ST_Intersects(wdpa.geometry, grid.geometry) AND wdpaid IN (SELECT wdpaid FROM (SELECT envelope FROM marxan.metadata_planning_units WHERE feature_class_name =  %s) AS sub, marxan.wdpa WHERE ST_Intersects(wdpa.geometry, envelope)) ORDER BY 1,2").format(sql.Identifier(planning_grid_name)), data=[planning_grid_name], returnFormat="DataFrame")
+    intersectionData = await obj.executeQuery(_formatSQL("SELECT DISTINCT iucn_cat, grid.puid FROM marxan.wdpa, marxan.{} grid WHERE ST_Intersects(wdpa.geometry, grid.geometry) AND wdpaid IN (SELECT wdpaid FROM (SELECT envelope FROM marxan.metadata_planning_units WHERE feature_class_name =  %s) AS sub, marxan.wdpa WHERE ST_Intersects(wdpa.geometry, envelope)) ORDER BY 1,2", planning_grid_name), data=[planning_grid_name], returnFormat="DataFrame")
     # write the intersections to file
     intersectionData.to_csv(
         output_folder + PROTECTED_AREA_INTERSECTIONS_FILENAME, index=False)
@@ -1196,8 +1357,54 @@ def _getOutputFilename(filename):
             "The output file '" + filename + "' does not exist")
 
 
+# parsed marxan output files keyed on filename - the values are ((st_mtime_ns, st_size), data) tuples so the files are only re-parsed when a new run overwrites them
+_OUTPUT_DATA_CACHE = {}
+
+
+def _getCachedOutputData(filename, parse):
+    """Gets the parsed data for a marxan output file, re-parsing it only if the file has changed since it was cached. The cached data must not be mutated by callers.
+
+    Args:
+        filename (string): Full path to the output file to get the data for.
+        parse (function): The function that parses the file on a cache miss.
+    Returns:
+        The parsed data from the file.
+    """
+    try:
+        st = os.stat(filename)
+    except OSError:
+        return parse(filename)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _OUTPUT_DATA_CACHE.get(filename)
+    if cached and (cached[0] == stamp):
+        return cached[1]
+    data = parse(filename)
+    # keep the cache bounded
+    if len(_OUTPUT_DATA_CACHE) > 128:
+        _OUTPUT_DATA_CACHE.clear()
+    _OUTPUT_DATA_CACHE[filename] = (stamp, data)
+    return data
+
+
+def _loadCSVWithRecords(filename):
+    """Loads a csv output file with the multithreaded pyarrow reader and returns the Arrow table together with the dataframe and its rows as a list - used so all three forms can be cached together.
+
+    Args:
+        filename (string): Full path to the file that will be loaded.
+    Returns:
+        tuple: The Arrow table, the dataframe and the dataframe values as a list of records.
+    """
+    # detect the separator from the header line as it can be tab or comma in marxan
+    with open(filename) as f:
+        sep = "\t" if ("\t" in f.readline()) else ","
+    table = pyarrow.csv.read_csv(
+        filename, parse_options=pyarrow.csv.ParseOptions(delimiter=sep))
+    df = table.to_pandas()
+    return (table, df, df.values.tolist())
+
+
 def _getBestSolution(obj):
-    """Gets the data from the marxan best solution file. These are set on the passed obj in the bestSolution attribute.
+    """Gets the data from the marxan best solution file. These are set on the passed obj in the bestSolutionTable, bestSolution and bestSolutionData attributes.
 
     Args:
         obj (MarxanRESTHandler): The request handler instance.
@@ -1205,11 +1412,12 @@ def _getBestSolution(obj):
         None  
     """
     filename = _getOutputFilename(obj.folder_output + BEST_SOLUTION_FILENAME)
-    obj.bestSolution = _loadCSV(filename)
+    obj.bestSolutionTable, obj.bestSolution, obj.bestSolutionData = _getCachedOutputData(
+        filename, _loadCSVWithRecords)
 
 
 def _getOutputSummary(obj):
-    """Gets the data from the marxan output summary file. These are set on the passed obj in the outputSummary attribute.
+    """Gets the data from the marxan output summary file. These are set on the passed obj in the outputSummaryTable, outputSummary and outputSummaryData attributes.
 
     Args:
         obj (MarxanRESTHandler): The request handler instance.
@@ -1217,7 +1425,8 @@ def _getOutputSummary(obj):
         None  
     """
     filename = _getOutputFilename(obj.folder_output + OUTPUT_SUMMARY_FILENAME)
-    obj.outputSummary = _loadCSV(filename)
+    obj.outputSummaryTable, obj.outputSummary, obj.outputSummaryData = _getCachedOutputData(
+        filename, _loadCSVWithRecords)
 
 
 def _getSummedSolution(obj):
@@ -1229,8 +1438,8 @@ def _getSummedSolution(obj):
         None  
     """
     filename = _getOutputFilename(obj.folder_output + SUMMED_SOLUTION_FILENAME)
-    df = _loadCSV(filename)
-    obj.summedSolution = _normaliseDataFrame(df, "number", "planning_unit")
+    obj.summedSolution = _getCachedOutputData(
+        filename, lambda f: _normaliseDataFrame(_loadCSV(f), "number", "planning_unit"))
 
 
 def _getSolution(obj, solutionId):
@@ -1263,7 +1472,7 @@ def _getSolution(obj, solutionId):
 
 
 def _getMissingValues(obj, solutionId):
-    """Gets the data on the missing targets. These are set on the passed obj in the missingValues attribute.
+    """Gets the data on the missing targets. These are set on the passed obj in the missingValuesDf and missingValues attributes.
 
     Args:
         obj (MarxanRESTHandler): The request handler instance.
@@ -1273,7 +1482,8 @@ def _getMissingValues(obj, solutionId):
     filename = _getOutputFilename(
         obj.folder_output + MISSING_VALUES_FILE_PREFIX + "%05d" % int(solutionId))
     df = _loadCSV(filename)
-    obj.missingValues = df.to_dict(orient="split")["data"]
+    obj.missingValuesDf = df
+    obj.missingValues = df.values.tolist()
 
 
 async def _updateSpeciesFile(obj, interest_features, target_values, spf_values, create=False):
@@ -1354,7 +1564,7 @@ def _puidsArrayToPuDatFormat(puid_array, pu_status):
     Returns:
          pandas.DataFrame: The data with the columns id and status_new.
     """
-    return pandas.DataFrame([[int(i), pu_status] for i in puid_array], columns=['id', 'status_new']).astype({'id': 'int64', 'status_new': 'int64'})
+    return pandas.DataFrame({'id': numpy.asarray(puid_array, dtype='int64'), 'status_new': pu_status}).astype({'id': 'int64', 'status_new': 'int64'})
 
 
 async def _createPuFile(obj, planning_grid_name):
@@ -1369,7 +1579,7 @@ async def _createPuFile(obj, planning_grid_name):
     # get the path to the pu.dat file
     filename = obj.folder_input + PLANNING_UNITS_FILENAME
     # create the pu.dat file using a postgis query
-    await pg.execute(sql.SQL("SELECT puid as id,1::double precision as cost,0::integer as status FROM marxan.{};").format(sql.Identifier(planning_grid_name)), returnFormat="File", filename=filename)
+    await pg.execute(_formatSQL("SELECT puid as id,1::double precision as cost,0::integer as status FROM marxan.{};", planning_grid_name), returnFormat="File", filename=filename)
     # update the input.dat file
     _updateParameters(obj.folder_project + PROJECT_DATA_FILENAME,
                       {'PUNAME': PLANNING_UNITS_FILENAME})
@@ -1409,18 +1619,70 @@ async def _updatePuFile(obj, status1_ids, status2_ids, status3_ids):
     await _writeCSV(obj, "PUNAME", df)
 
 
-def _loadCSV(filename, errorIfNotExists=False):
+def _dataFrameToRecords(df):
+    """Converts a dataframe to a list of row dicts, i.e. the same shape as DataFrame.to_dict(orient='records'). The conversion goes through pyarrow which builds the rows in C - on the feature and species frames this is several times faster than pandas' per-cell Python loop.
+
+    Args:
+        df (pandas.DataFrame): The dataframe to convert.
+    Returns:
+        dict[]: The dataframe rows as a list of dicts.
+    """
+    try:
+        return pyarrow.Table.from_pandas(df, preserve_index=False).to_pylist()
+    except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+        # mixed-type object columns cannot always be converted - fall back to pandas
+        return df.to_dict(orient="records")
+
+
+def _writeArrowResponse(obj, data):
+    """Writes the dataframe or Arrow table to the response as a zstd-compressed Arrow IPC stream. Only used when the client explicitly asks for ARROW_MIME_TYPE in the Accept header - the binary encoding is several times faster to produce than json and substantially smaller on the wire.
+
+    Args:
+        obj (MarxanRESTHandler): The request handler instance.
+        data (pandas.DataFrame or pyarrow.Table): The data to write.
+    Returns:
+        None
+    """
+    if isinstance(data, pyarrow.Table):
+        table = data
+    else:
+        table = pyarrow.Table.from_pandas(data, preserve_index=False)
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, table.schema, options=pyarrow.ipc.IpcWriteOptions(compression="zstd")) as writer:
+        writer.write_table(table)
+    obj.set_header('Content-Type', ARROW_MIME_TYPE)
+    obj.write(sink.getvalue().to_pybytes())
+
+
+def _loadCSV(filename, errorIfNotExists=False, cacheSidecar=False):
     """Loads a csv file and returns the data as a dataframe or an empty dataframe if the file does not exist. If errorIfNotExists is True then it raises an error.
 
     Args:
-        filename (string): Full path to the file that will be loaded.  
-        errorIfNotExists (bool): Optional. If True, raises and exception if the file does not exist. Defaults to False.  
+        filename (string): Full path to the file that will be loaded.
+        errorIfNotExists (bool): Optional. If True, raises and exception if the file does not exist. Defaults to False.
+        cacheSidecar (bool): Optional. If True, a binary feather copy of the file is maintained alongside it and is read instead of re-parsing the text whenever it is at least as new as the text file. Defaults to False.
     Returns:
          pandas.DataFrame: The data from the file as a dataframe.
     """
     if (os.path.exists(filename)):
-        # sep = None forces the Python parsing engine to detect the separator as it can be tab or comman in marxan
-        df = pandas.read_csv(filename, sep=None, engine='python')
+        feather = filename + ".feather"
+        # serve from the feather sidecar where possible - the columnar read skips the CSV tokenising entirely
+        if cacheSidecar and os.path.exists(feather) and (os.path.getmtime(feather) >= os.path.getmtime(filename)):
+            try:
+                return pandas.read_feather(feather)
+            except Exception:
+                # a corrupt or unreadable sidecar - fall through and re-parse the text file
+                pass
+        # detect the separator from the header line as it can be tab or comma in marxan - this allows the multithreaded pyarrow parser to be used instead of the much slower Python parsing engine sniffing the separator itself
+        with open(filename) as f:
+            sep = "\t" if ("\t" in f.readline()) else ","
+        df = pandas.read_csv(filename, sep=sep, engine='pyarrow')
+        if cacheSidecar:
+            try:
+                df.to_feather(feather)
+            except Exception:
+                # not all frames can be serialised - the next read just parses the text again
+                pass
     else:
         if errorIfNotExists:
             raise MarxanServicesError(
@@ -1668,7 +1930,7 @@ def _getDictValue(_dict, key):
     Raises:
         MarxanServicesError: If the key does not exist.
     """
-    if key not in list(_dict.keys()):
+    if key not in _dict:
         raise MarxanServicesError(
             "The key '" + key + "' does not exist in the dictionary")
     else:
@@ -1738,22 +2000,21 @@ def _normaliseDataFrame(df, columnToNormaliseBy, puidColumnName, classes=None):
     response = []
     # if we are constraining the response to a fixed number of classes, then classify the data into that number of classes
     if (classes):
+        values = df[columnToNormaliseBy].to_numpy()
+        puids = df[puidColumnName].to_numpy().astype(numpy.int64)
         # get the min value
-        minValue = df.min()[columnToNormaliseBy]
+        minValue = values.min()
         # get the max value
-        maxValue = df.max()[columnToNormaliseBy]
+        maxValue = values.max()
         # if all the columnToNormaliseBy data is the same value then there is only one class
         classes = 1 if (minValue == maxValue) else classes
         # get the bin size - add 1 so that the maxValue will be in the n-1 bin
         binSize = ((maxValue + 1) - minValue) / classes
-        # initialise the array of puids
-        bins = [[(binSize * (i + 1)) + minValue, []] for i in range(classes)]
-        # iterate through the dataframe
-        for index, row in df.iterrows():
-            # get the bin
-            bin = int((row[columnToNormaliseBy] - minValue) / binSize)
-            # append the puid
-            bins[bin][1].append(int(row[puidColumnName]))
+        # classify the values into their bins in a single vectorised pass rather than iterating the rows in python
+        binIndexes = ((values - minValue) / binSize).astype(numpy.int64)
+        # build the array of puids per bin
+        bins = [[(binSize * (i + 1)) + minValue,
+                 puids[binIndexes == i].tolist()] for i in range(classes)]
         response = (bins, minValue, maxValue)
     else:
         # get the groups from the data (i.e. the unique values for columnToNormaliseBy in ascending order)
@@ -1853,20 +2114,32 @@ def _txtIntsToList(txtInts):
         return []
 
 
+_MISSING_ARG_ERRORS = {}
+"""Memoised error messages for _validateArguments keyed by the missing argument name."""
+
+
 def _validateArguments(arguments, argumentList):
     """Checks that all of the arguments in argumentList are in the arguments dictionary. 
 
     Args:
         arguments (dict): See https://www.tornadoweb.org/en/stable/httputil.html#tornado.httputil.HTTPServerRequest.arguments  
-        argumentList (string[]): The list of arguments that must be present.   
+        argumentList (frozenset): The set of arguments that must be present - usually the handlers REQUIRED_ARGS class attribute.   
     Returns:
         None  
     Raises:
         MarxanServicesError: If any of the required arguments are not present.
     """
-    for argument in argumentList:
-        if argument not in list(arguments.keys()):
-            raise MarxanServicesError("Missing input argument:" + argument)
+    # the common case - all arguments present - is a single C-level subset test that allocates nothing
+    if argumentList <= arguments.keys():
+        return
+    missing = argumentList - arguments.keys()
+    if missing:
+        name = sorted(missing)[0]
+        # the messages are interned in a module-level dict so clients that repeatedly hit the same validation error do not rebuild the string each time
+        message = _MISSING_ARG_ERRORS.get(name)
+        if message is None:
+            message = _MISSING_ARG_ERRORS[name] = "Missing input argument:" + name
+        raise MarxanServicesError(message)
 
 
 def _getSimpleArguments(obj, omitArgumentList):
@@ -1893,12 +2166,13 @@ def _getIntArrayFromArg(arguments, argName):
         arguments (dict): See https://www.tornadoweb.org/en/stable/httputil.html#tornado.httputil.HTTPServerRequest.arguments  
         argName (string): The argument to split into integers.  
     Returns:
-        int[]: A list of integers from the argument.
+        numpy.ndarray: The integers from the argument.
     """
-    if argName in list(arguments.keys()):
-        return [int(s) for s in arguments[argName][0].decode("utf-8").split(",")]
+    if argName in arguments:
+        # numpy parses the comma-separated values in C - for the status updates the argument can contain hundreds of thousands of ids
+        return numpy.fromstring(arguments[argName][0].decode("utf-8"), dtype=numpy.int64, sep=",")
     else:
-        return []
+        return numpy.empty(0, dtype=numpy.int64)
 
 
 def _createZipfile(folder, feature_class_name):
@@ -1914,9 +2188,11 @@ def _createZipfile(folder, feature_class_name):
     lstFileNames = glob.glob(folder + feature_class_name + '.*')
     # get the zip filename
     zipfilename = folder + feature_class_name + ".zip"
-    with zipfile.ZipFile(zipfilename, 'w') as myzip:
+    # deflate at the fastest level - shapefiles compress well and level 1 roughly halves the download at a fraction of the cpu cost of the default level
+    with zipfile.ZipFile(zipfilename, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as myzip:
         for f in lstFileNames:
             arcname = os.path.split(f)[1]
+            # write() streams the file into the archive in chunks so memory stays bounded however big the .shp/.dbf files are
             myzip.write(f, arcname)
     # delete all of the archive files
     _deleteArchiveFiles(folder, feature_class_name)
@@ -1968,7 +2244,9 @@ def _zipfolder(folder, zipFile):
     Returns:
         None  
     """
-    zipobj = zipfile.ZipFile(zipFile + '.zip', 'w', zipfile.ZIP_DEFLATED)
+    # deflate level 1 - the shapefile/dat data compresses nearly as well as at the default level 6 for a fraction of the CPU time
+    zipobj = zipfile.ZipFile(zipFile + '.zip', 'w',
+                             zipfile.ZIP_DEFLATED, compresslevel=1)
     # get the length of the folder
     folder_length = len(folder) + 1
     for base, dirs, files in os.walk(folder):
@@ -1998,12 +2276,12 @@ def _unzipFile(folder, filename):
     if not os.path.exists(folder + filename):
         raise MarxanServicesError(
             "The zip file '" + filename + "' does not exist")
-    # create an instance of the zip file
-    zip_ref = zipfile.ZipFile(folder + filename, 'r')
-    # extract all the files
-    zip_ref.extractall(folder)
-    # return the members
-    return zip_ref.namelist()
+    # create an instance of the zip file - the members are streamed to disk in chunks so the archive never has to fit in memory
+    with zipfile.ZipFile(folder + filename, 'r') as zip_ref:
+        # extract all the files
+        zip_ref.extractall(folder)
+        # return the members
+        return zip_ref.namelist()
 
 
 def _unzipShapefile(folder, filename, rejectMultipleShapefiles=True, searchTerm=None):
@@ -2022,47 +2300,66 @@ def _unzipShapefile(folder, filename, rejectMultipleShapefiles=True, searchTerm=
     if not os.path.exists(folder + filename):
         raise MarxanServicesError(
             "The zip file '" + filename + "' does not exist")
-    zip_ref = zipfile.ZipFile(folder + filename, 'r')
-    #get the filenames ignoring any duplicates in mac archive files
-    filenames = [f for f in zip_ref.namelist() if f[:8]!='__MACOSX']
-    #check there is only one set of files
-    extensions = [f[-3:] for f in filenames]
-    if (len(extensions) != len(set(extensions))) and rejectMultipleShapefiles:
-        raise MarxanServicesError("The zip file contains multiple shapefiles. See <a href='" +
-                                  ERRORS_PAGE + "#the-zip-file-contains-multiple-shapefiles' target='blank'>here</a>")
-    # if a search term is specified then only get those files with the matching search term
-    if searchTerm:
-        filenames = [f for f in filenames if searchTerm in f]
-        if (len(filenames) == 0):
-            raise MarxanServicesError(
-                "There were no files in the zip file matching the text '" + searchTerm + "'")
-    # do not accept zip files that contain nested files/folders
-    if (filenames[0].find(os.sep) == -1):
-        # get the root filename
-        rootfilename = filenames[0][:-4]
-        # if a search term is specified then only extract files that include the search term
-        try:
-            if searchTerm:
+    # the context manager closes the archive on the error paths as well - the members are streamed to disk in chunks so the archive never has to fit in memory
+    with zipfile.ZipFile(folder + filename, 'r') as zip_ref:
+        #get the filenames ignoring any duplicates in mac archive files
+        filenames = [f for f in zip_ref.namelist() if f[:8]!='__MACOSX']
+        #check there is only one set of files
+        extensions = [f[-3:] for f in filenames]
+        if (len(extensions) != len(set(extensions))) and rejectMultipleShapefiles:
+            raise MarxanServicesError("The zip file contains multiple shapefiles. See <a href='" +
+                                      ERRORS_PAGE + "#the-zip-file-contains-multiple-shapefiles' target='blank'>here</a>")
+        # if a search term is specified then only get those files with the matching search term
+        if searchTerm:
+            filenames = [f for f in filenames if searchTerm in f]
+            if (len(filenames) == 0):
+                raise MarxanServicesError(
+                    "There were no files in the zip file matching the text '" + searchTerm + "'")
+        # do not accept zip files that contain nested files/folders
+        if (filenames[0].find(os.sep) == -1):
+            # get the root filename
+            rootfilename = filenames[0][:-4]
+            # if a search term is specified then only extract files that include the search term
+            try:
+                if searchTerm:
+                    for f in filenames:
+                        zip_ref.extract(f, folder)
+                else:
+                    zip_ref.extractall(folder)
+            except (OSError) as e:
+                # delete the already extracted files
                 for f in filenames:
-                    zip_ref.extract(f, folder)
+                    if os.path.exists(folder + f):
+                        os.remove(folder + f)
+                raise MarxanServicesError(
+                    "No space left on device extracting the file '" + rootfilename + "'")
             else:
-                zip_ref.extractall(folder)
-        except (OSError) as e:
-            # delete the already extracted files
-            for f in filenames:
-                if os.path.exists(folder + f):
-                    os.remove(folder + f)
-            raise MarxanServicesError(
-                "No space left on device extracting the file '" + rootfilename + "'")
-        else:
-            zip_ref.close()
-            return rootfilename
-    else:  # nested files/folders - raise an error
-        raise MarxanServicesError("The zipped file should not contain directories. See <a href='" +
-                                  DOCS_ROOT + "/user.html#importing-existing-marxan-projects' target='blank'>here</a>")
+                return rootfilename
+        else:  # nested files/folders - raise an error
+            raise MarxanServicesError("The zipped file should not contain directories. See <a href='" +
+                                      DOCS_ROOT + "/user.html#importing-existing-marxan-projects' target='blank'>here</a>")
+
 
+_MAPBOX_SESSION = None
+"""The shared aiohttp session used for Mapbox API calls - created lazily by _getMapboxSession."""
 
-def _tilesetExists(tilesetid):
+
+async def _getMapboxSession():
+    """Gets the shared aiohttp session for calls to the Mapbox API, creating it on first use - reusing one session keeps the connections alive so repeated API calls do not each pay for a new TCP + TLS handshake.
+
+    Args:
+        None  
+    Returns:
+        aiohttp.ClientSession: The shared session.
+    """
+    global _MAPBOX_SESSION
+    if (_MAPBOX_SESSION is None) or _MAPBOX_SESSION.closed:
+        _MAPBOX_SESSION = aiohttp.ClientSession(connector=aiohttp.TCPConnector(
+            limit=32, ttl_dns_cache=300), timeout=aiohttp.ClientTimeout(total=30))
+    return _MAPBOX_SESSION
+
+
+async def _tilesetExists(tilesetid):
     """Checks to see if the tileset already exists on mapbox.
 
     Args:
@@ -2073,9 +2370,10 @@ def _tilesetExists(tilesetid):
     url = "https://api.mapbox.com/tilesets/v1/" + \
         MAPBOX_USER + "." + tilesetid + "?access_token=" + MBAT
     # make the request
-    response = requests.get(url)
-    # return true if the tileset already exists
-    return (response.status_code == 200)
+    session = await _getMapboxSession()
+    async with session.get(url) as response:
+        # return true if the tileset already exists
+        return (response.status == 200)
 
 
 async def _uploadTilesetToMapbox(feature_class_name, mapbox_layer_name):
@@ -2087,7 +2385,7 @@ async def _uploadTilesetToMapbox(feature_class_name, mapbox_layer_name):
     Returns:
         string: Returns the uploadid of the job or 0 if the tileset already exists.
     """
-    if (_tilesetExists(feature_class_name)):
+    if (await _tilesetExists(feature_class_name)):
         return "0"
     # create the file to upload to MapBox - now using shapefiles as kml files only import the name and description properties into a mapbox tileset
     zipfilename = await _exportAndZipShapefile(EXPORT_FOLDER, feature_class_name, "EPSG:3857")
@@ -2122,7 +2420,7 @@ def _uploadTileset(filename, _name):
             raise MarxanServicesError("Failed to get an upload ID from Mapbox")
 
 
-def _deleteTileset(tilesetid):
+async def _deleteTileset(tilesetid):
     """Deletes a tileset on Mapbox using the tilesets API.
 
     Args:
@@ -2132,7 +2430,9 @@ def _deleteTileset(tilesetid):
     """
     url = "https://api.mapbox.com/tilesets/v1/" + \
         MAPBOX_USER + "." + tilesetid + "?access_token=" + MBAT
-    response = requests.delete(url)
+    session = await _getMapboxSession()
+    async with session.delete(url):
+        pass
 
 
 async def _deleteFeature(feature_class_name):
@@ -2166,7 +2466,20 @@ async def _deleteFeature(feature_class_name):
     # delete the metadata record
     await pg.execute("DELETE FROM marxan.metadata_interest_features WHERE feature_class_name =%s;", [feature_class_name])
     # delete the Mapbox tileset
-    _deleteTileset(feature_class_name)
+    await _deleteTileset(feature_class_name)
+
+
+@functools.lru_cache(maxsize=512)
+def _formatSQL(template, identifier):
+    """Composes the passed sql template with the passed identifier, caching the result - the composed statements are immutable so repeated calls for the same table reuse a single object instead of re-parsing the template.
+
+    Args:
+        template (string): The sql template with a single {} placeholder for the identifier.
+        identifier (string): The name of the table or column to substitute into the template.
+    Returns:
+        Composed: The composed sql statement.
+    """
+    return sql.SQL(template).format(sql.Identifier(identifier))
 
 
 async def _deleteFeatureClass(feature_class_name):
@@ -2178,7 +2491,7 @@ async def _deleteFeatureClass(feature_class_name):
         None  
     """
     # delete the feature class
-    await pg.execute(sql.SQL("DROP TABLE IF EXISTS marxan.{};").format(sql.Identifier(feature_class_name)))
+    await pg.execute(_formatSQL("DROP TABLE IF EXISTS marxan.{};", feature_class_name))
 
 
 def _getUniqueFeatureclassName(prefix):
@@ -2234,9 +2547,9 @@ async def _finishImportingFeature(feature_class_name, name, description, source,
     # create a primary key
     try:
         # drop any existing id columns (including the automatically created ogc_fid column)
-        await pg.execute(sql.SQL("ALTER TABLE marxan.{} DROP COLUMN IF EXISTS id;").format(sql.Identifier(feature_class_name)))
-        await pg.execute(sql.SQL("ALTER TABLE marxan.{} DROP COLUMN IF EXISTS ogc_fid;").format(sql.Identifier(feature_class_name)))
-        await pg.execute(sql.SQL("ALTER TABLE marxan.{} ADD COLUMN id SERIAL PRIMARY KEY;").format(sql.Identifier(feature_class_name)))
+        await pg.execute(_formatSQL("ALTER TABLE marxan.{} DROP COLUMN IF EXISTS id;", feature_class_name))
+        await pg.execute(_formatSQL("ALTER TABLE marxan.{} DROP COLUMN IF EXISTS ogc_fid;", feature_class_name))
+        await pg.execute(_formatSQL("ALTER TABLE marxan.{} ADD COLUMN id SERIAL PRIMARY KEY;", feature_class_name))
     # primary key already exists
     except psycopg2.errors.InvalidTableDefinition:
         logging.warning("primary key already exists")
@@ -2246,10 +2559,10 @@ async def _finishImportingFeature(feature_class_name, name, description, source,
         geometryType = await pg.getGeometryType(feature_class_name)
         if (geometryType != 'ST_Point'):
             #if the feature class is a polygon then get the total area
-            id = await pg.execute(sql.SQL("INSERT INTO marxan.metadata_interest_features (feature_class_name, alias, description, creation_date, _area, tilesetid, extent, source, created_by) SELECT %s, %s, %s, now(), sub._area, %s, sub.extent, %s, %s FROM (SELECT ST_Area(ST_Transform(geom, 3410)) _area, box2d(geom) extent FROM (SELECT ST_Union(geometry) geom FROM marxan.{}) AS sub2) AS sub RETURNING oid;").format(sql.Identifier(feature_class_name)), data=[feature_class_name, name, description, tilesetId, source, user], returnFormat="Array")
+            id = await pg.execute(_formatSQL("INSERT INTO marxan.metadata_interest_features (feature_class_name, alias, description, creation_date, _area, tilesetid, extent, source, created_by) SELECT %s, %s, %s, now(), sub._area, %s, sub.extent, %s, %s FROM (SELECT ST_Area(ST_Transform(geom, 3410)) _area, box2d(geom) extent FROM (SELECT ST_Union(geometry) geom FROM marxan.{}) AS sub2) AS sub RETURNING oid;", feature_class_name), data=[feature_class_name, name, description, tilesetId, source, user], returnFormat="Array")
         else:
             #if the feature class is a point layer then get the total amount
-            id = await pg.execute(sql.SQL("INSERT INTO marxan.metadata_interest_features (feature_class_name, alias, description, creation_date, _area, tilesetid, extent, source, created_by) SELECT %s, %s, %s, now(), sub._area, %s, sub.extent, %s, %s FROM (SELECT amount _area, box2d(combined) extent FROM (SELECT SUM(value) amount, st_collect(geometry) combined FROM marxan.{}) AS sub2) AS sub RETURNING oid;").format(sql.Identifier(feature_class_name)), data=[feature_class_name, name, description, tilesetId, source, user], returnFormat="Array")
+            id = await pg.execute(_formatSQL("INSERT INTO marxan.metadata_interest_features (feature_class_name, alias, description, creation_date, _area, tilesetid, extent, source, created_by) SELECT %s, %s, %s, now(), sub._area, %s, sub.extent, %s, %s FROM (SELECT amount _area, box2d(combined) extent FROM (SELECT SUM(value) amount, st_collect(geometry) combined FROM marxan.{}) AS sub2) AS sub RETURNING oid;", feature_class_name), data=[feature_class_name, name, description, tilesetId, source, user], returnFormat="Array")
     except (MarxanServicesError) as e:
         await _deleteFeatureClass(feature_class_name)
         if "Database integrity error" in e.args[0]:
@@ -2274,7 +2587,7 @@ async def _importPlanningUnitGrid(filename, name, description, user):
         MarxanServicesError: If the shapefile does not comply with certain rules or if the planning grid already exists.
     """
     # unzip the shapefile and get the name of the shapefile without an extension, e.g. PlanningUnitsData.zip -> planningunits.shp -> planningunits
-    rootfilename = await IOLoop.current().run_in_executor(None, _unzipShapefile, IMPORT_FOLDER, filename)
+    rootfilename = await IOLoop.current().run_in_executor(IMPORT_EXECUTOR, _unzipShapefile, IMPORT_FOLDER, filename)
     # get a unique feature class name for the import
     # this is pu_ followed by a max of 32 numbers.
     feature_class_name = _getUniqueFeatureclassName("pu_")
@@ -2286,16 +2599,14 @@ async def _importPlanningUnitGrid(filename, name, description, user):
         # import the shapefile into PostGIS
         # create a record for this new feature in the metadata_planning_units table
         await pg.execute("INSERT INTO marxan.metadata_planning_units(feature_class_name,alias,description,creation_date, source,created_by,tilesetid) VALUES (%s,%s,%s,now(),'Imported from shapefile',%s,%s);", [feature_class_name, name, description, user, MAPBOX_USER + "." + feature_class_name])
-        # import the shapefile
-        await pg.importShapefile(IMPORT_FOLDER, rootfilename + ".shp", feature_class_name)
-        # check the geometry
-        await pg.isValid(feature_class_name)
+        # import the shapefile and check the geometry in the same table pass
+        await pg.importShapefile(IMPORT_FOLDER, rootfilename + ".shp", feature_class_name, validate=True)
         # make sure the puid column is an integer
-        await pg.execute(sql.SQL("ALTER TABLE marxan.{} ALTER COLUMN puid TYPE integer;").format(sql.Identifier(feature_class_name)))
+        await pg.execute(_formatSQL("ALTER TABLE marxan.{} ALTER COLUMN puid TYPE integer;", feature_class_name))
         # create the envelope for the new planning grid
-        await pg.execute(sql.SQL("UPDATE marxan.metadata_planning_units SET envelope = (SELECT ST_Transform(ST_Envelope(ST_Collect(f.geometry)), 4326) FROM (SELECT ST_Envelope(geometry) AS geometry FROM marxan.{}) AS f) WHERE feature_class_name = %s;").format(sql.Identifier(feature_class_name)), [feature_class_name])
+        await pg.execute(_formatSQL("UPDATE marxan.metadata_planning_units SET envelope = (SELECT ST_Transform(ST_Envelope(ST_Collect(f.geometry)), 4326) FROM (SELECT ST_Envelope(geometry) AS geometry FROM marxan.{}) AS f) WHERE feature_class_name = %s;", feature_class_name), [feature_class_name])
         # set the number of planning units for the new planning grid
-        await pg.execute(sql.SQL("UPDATE marxan.metadata_planning_units SET planning_unit_count = (SELECT count(puid) FROM marxan.{}) WHERE feature_class_name = %s;").format(sql.Identifier(feature_class_name)), [feature_class_name])
+        await pg.execute(_formatSQL("UPDATE marxan.metadata_planning_units SET planning_unit_count = (SELECT count(puid) FROM marxan.{}) WHERE feature_class_name = %s;", feature_class_name), [feature_class_name])
         # start the upload to mapbox
         uploadId = _uploadTileset(IMPORT_FOLDER + filename, feature_class_name)
     except (MarxanServicesError) as e:
@@ -2342,11 +2653,13 @@ async def _deletePlanningUnitGrid(planning_grid):
             "The planning grid cannot be deleted as it is currently being used")
     # Delete the tileset on Mapbox only if the planning grid is an imported one - we dont want to delete standard country tilesets from Mapbox as they may be in use elsewhere
     if (data[0]['source'] != 'planning_grid function'):
-        _deleteTileset(planning_grid)
+        await _deleteTileset(planning_grid)
     # delete the new planning unit record from the metadata_planning_units table
     await pg.execute("DELETE FROM marxan.metadata_planning_units WHERE feature_class_name = %s;", data=[planning_grid])
     # delete the feature class
-    await pg.execute(sql.SQL("DROP TABLE IF EXISTS marxan.{};").format(sql.Identifier(planning_grid)))
+    await pg.execute(_formatSQL("DROP TABLE IF EXISTS marxan.{};", planning_grid))
+    # the cached planning grid metadata is now stale
+    _RESPONSE_CACHE.pop("planning_unit_grids", None)
 
 
 def _getFilesInFolderRecursive(folder, filename):
@@ -2382,34 +2695,80 @@ def _dataFrameContainsValue(df, column_name, value):
         return False
 
 
-def _getProjectsForFeature(featureId):
-    """Gets a list of projects that contain the feature with the passed featureId.
+# inverted indexes mapping feature ids and planning grid names to the projects that use them - rebuilt only when any of the spec.dat/input.dat files in the users folder change
+_PROJECT_INDEX_STAMP = None
+_FEATURE_TO_PROJECTS = {}
+_GRID_TO_PROJECTS = {}
+
+
+def _refreshProjectIndexes():
+    """Rebuilds the feature and planning grid project indexes if any of the spec.dat or input.dat files in the users folder have changed.
 
     Args:
-        featureId (string): The feature oid to search for.
+        None
     Returns:
-         dict[]: A list of projects that the feature is used in - each item has the user and name.
+        None
     """
+    global _PROJECT_INDEX_STAMP, _FEATURE_TO_PROJECTS, _GRID_TO_PROJECTS
     specDatFiles = _getFilesInFolderRecursive(
         MARXAN_USERS_FOLDER, SPEC_FILENAME)
-    projects = []
+    inputDatFiles = _getFilesInFolderRecursive(
+        MARXAN_USERS_FOLDER, "input.dat")
+    # stat all of the files to see if anything has changed since the indexes were last built
+    stamps = []
+    for file in specDatFiles + inputDatFiles:
+        try:
+            st = os.stat(file)
+        except OSError:
+            continue
+        stamps.append((file, st.st_mtime_ns, st.st_size))
+    stamp = tuple(stamps)
+    if stamp == _PROJECT_INDEX_STAMP:
+        return
+    # build the feature index from the spec.dat files
+    featureIndex = {}
     for file in specDatFiles:
         # get the values from the spec.dat file
         df = _loadCSV(file)
-        # search the dataframe for the species id of id
-        if _dataFrameContainsValue(df, 'id', featureId):
-            # get the project paths
+        # get the project paths
+        prjPaths = file[len(MARXAN_USERS_FOLDER):].split(os.sep)
+        # check it is not an imported project
+        prjFolder = file[:len(MARXAN_USERS_FOLDER)] + \
+            prjPaths[0] + os.sep + prjPaths[1] + os.sep
+        # open the input file and get the key values
+        values = _getKeyValuesFromFile(prjFolder + "input.dat")
+        # get the OLDVERSION
+        if 'OLDVERSION' in values.keys():
+            if not values['OLDVERSION']:
+                project = {'user': prjPaths[0], 'name': prjPaths[1]}
+                # index the project against every species id in the spec.dat file
+                for featureId in set(df['id'].tolist()):
+                    featureIndex.setdefault(featureId, []).append(project)
+    # build the planning grid index from the input.dat files
+    gridIndex = {}
+    for file in inputDatFiles:
+        # open the input file and get the key values
+        values = _getKeyValuesFromFile(file)
+        # get the PLANNING_UNIT_NAME
+        if 'PLANNING_UNIT_NAME' in values.keys():
             prjPaths = file[len(MARXAN_USERS_FOLDER):].split(os.sep)
-            # if the featureid is in the projects spec.dat file, check it is not an imported project
-            prjFolder = file[:len(MARXAN_USERS_FOLDER)] + \
-                prjPaths[0] + os.sep + prjPaths[1] + os.sep
-            # open the input file and get the key values
-            values = _getKeyValuesFromFile(prjFolder + "input.dat")
-            # get the OLDVERSION
-            if 'OLDVERSION' in values.keys():
-                if not values['OLDVERSION']:
-                    projects.append({'user': prjPaths[0], 'name': prjPaths[1]})
-    return projects
+            gridIndex.setdefault(values['PLANNING_UNIT_NAME'], []).append(
+                {'user': prjPaths[0], 'name': prjPaths[1]})
+    _FEATURE_TO_PROJECTS = featureIndex
+    _GRID_TO_PROJECTS = gridIndex
+    _PROJECT_INDEX_STAMP = stamp
+
+
+def _getProjectsForFeature(featureId):
+    """Gets a list of projects that contain the feature with the passed featureId.
+
+    Args:
+        featureId (string): The feature oid to search for.
+    Returns:
+         dict[]: A list of projects that the feature is used in - each item has the user and name.
+    """
+    _refreshProjectIndexes()
+    return list(_FEATURE_TO_PROJECTS.get(featureId, []))
 
 
 def _getProjectsForPlanningGrid(feature_class_name):
@@ -2420,18 +2779,8 @@ def _getProjectsForPlanningGrid(feature_class_name):
     Returns:
          dict[]: A list of projects that the feature is used in - each item has the user and name.
     """
-    inputDatFiles = _getFilesInFolderRecursive(
-        MARXAN_USERS_FOLDER, "input.dat")
-    projects = []
-    for file in inputDatFiles:
-        # open the input file and get the key values
-        values = _getKeyValuesFromFile(file)
-        # get the PLANNING_UNIT_NAME
-        if 'PLANNING_UNIT_NAME' in values.keys():
-            if values['PLANNING_UNIT_NAME'] == feature_class_name:
-                prjPaths = file[len(MARXAN_USERS_FOLDER):].split(os.sep)
-                projects.append({'user': prjPaths[0], 'name': prjPaths[1]})
-    return projects
+    _refreshProjectIndexes()
+    return list(_GRID_TO_PROJECTS.get(feature_class_name, []))
 
 
 async def _createFeaturePreprocessingFileFromImport(obj):
@@ -2525,7 +2874,7 @@ def _setCORS(obj):
         MarxanServicesError: If the request is not allowed to make cross-domain requests (based on the settings in the server.dat file).
     """
     # get the referer
-    if "Referer" in list(obj.request.headers.keys()):
+    if "Referer" in obj.request.headers:
         # get the referer url, e.g. https://marxan-client-blishten.c9users.io/ or https://beta.biopama.org/marxan-client/build/
         referer = obj.request.headers.get("Referer")
         # get the origin
@@ -2537,6 +2886,9 @@ def _setCORS(obj):
         if (origin in PERMITTED_DOMAINS) or (referer.find(obj.request.host_name) != -1) or (method in PERMITTED_METHODS):
             obj.set_header("Access-Control-Allow-Origin", origin)
             obj.set_header("Access-Control-Allow-Credentials", "true")
+            # stash the headers so error responses can reapply them without re-evaluating the policy
+            obj._corsHeaders = {"Access-Control-Allow-Origin": origin,
+                                "Access-Control-Allow-Credentials": "true"}
         else:
             # , reason = "The origin '" + referer + "' does not have permission to access the service (CORS error)"
             raise HTTPError(403, "The origin '" + origin +
@@ -2545,8 +2897,124 @@ def _setCORS(obj):
         raise HTTPError(403, NO_REFERER_ERROR)
 
 
+_AUTH_CACHE = {}
+"""Cache of successful authentication/authorisation decisions keyed by (cookies, method, user argument, policy version) - the values are the time the decision was made."""
+_AUTH_CACHE_TTL = 10
+"""How long in seconds a cached authentication/authorisation decision remains valid."""
+_AUTH_POLICY_VERSION = 0
+"""Bumped whenever users or roles change so that all cached auth decisions are invalidated."""
+AUTH_PREWARM_METHODS = frozenset(
+    ["getProjects", "getProject", "getCountries", "getPlanningUnitGrids"])
+"""The read-only methods whose authorisation decisions are precomputed whenever a user makes an authenticated request, so the navigation clicks that typically follow are cache hits."""
+
+
+def _invalidateAuthCache():
+    """Invalidates all of the cached authentication/authorisation decisions - called whenever users or roles change.
+
+    Args:
+        None
+    Returns:
+        None
+    """
+    global _AUTH_POLICY_VERSION
+    _AUTH_POLICY_VERSION += 1
+
+
+_CREDENTIALS_CACHE = {}
+"""Cache of successfully validated login credentials keyed by (user, hashed password) - the values are tuples of (time validated, role). Only a hash of the password is held in memory."""
+_CREDENTIALS_CACHE_TTL = 1800
+"""How long in seconds a validated credential remains cached before the user.dat file is re-read."""
+
+
+def _invalidateCredentialsCache(user):
+    """Removes any cached credentials for the user - called whenever the users user.dat file changes or the user is deleted.
+
+    Args:
+        user (string): The name of the user whose cached credentials will be removed.
+    Returns:
+        None
+    """
+    for key in [k for k in _CREDENTIALS_CACHE if k[0] == user]:
+        del _CREDENTIALS_CACHE[key]
+
+
+_RESPONSE_CACHE = {}
+"""Cache of response data for endpoints whose underlying data changes rarely, e.g. the list of countries - keyed by endpoint name (plus the request arguments and authenticated user for per-user endpoints), the values are tuples of (time generated, data)."""
+COUNTRIES_CACHE_TTL = 300
+"""How long in seconds the cached list of countries remains fresh."""
+PLANNING_GRIDS_CACHE_TTL = 60
+"""How long in seconds the cached planning grid metadata remains fresh."""
+
+
+RESPONSE_CACHE_GRACE = 3600
+"""How long in seconds a stale cached response may still be served while it is refreshed in the background or the database is unavailable."""
+
+
+async def _refreshCachedResponse(key, refresh):
+    """Refreshes the cached response data for the key in the background - failures are logged rather than raised as a stale entry is already being served.
+
+    Args:
+        key (string): The endpoint name the data is cached under.
+        refresh (callable): A callable returning a coroutine that fetches the data.
+    Returns:
+        None
+    """
+    try:
+        _setCachedResponse(key, await refresh())
+    except Exception as e:
+        logging.warning(
+            "Background refresh of the cached response '" + str(key) + "' failed: " + str(e))
+
+
+async def _getCachedResponseOrRefresh(obj, key, ttl, refresh, perUser=False):
+    """Gets the response data for the key from the response cache, refreshing it with the refresh callable as needed. Fresh entries are returned directly; entries older than ttl but within the grace period are returned immediately while a refresh is scheduled in the background; and if the data has to be fetched but the fetch fails and a stale entry exists, the stale entry is returned with an X-Cache-Fallback header set so the UI keeps working during database maintenance windows.
+
+    Args:
+        obj (MarxanRESTHandler): The request handler instance.
+        key (string): The endpoint name the data is cached under.
+        ttl (int): The maximum age in seconds for the cached data to still be fresh.
+        refresh (callable): A callable returning a coroutine that fetches the data.
+        perUser (bool): Optional, default False. Set to True for endpoints that return per-user data - the request arguments and the authenticated user then become part of the cache key so entries can never be served to another user.
+    Returns:
+        The response data for the key.
+    """
+    if perUser:
+        key = (key, tuple(sorted((k, tuple(v)) for k, v in obj.request.arguments.items() if k != 'callback')),
+               obj.get_secure_cookie("user") or b"")
+    entry = _RESPONSE_CACHE.get(key)
+    if entry:
+        age = time.time() - entry[0]
+        if age < ttl:
+            return entry[1]
+        if age < (ttl + RESPONSE_CACHE_GRACE):
+            # serve the stale entry straight away and refresh it in the background
+            IOLoop.current().spawn_callback(_refreshCachedResponse, key, refresh)
+            return entry[1]
+    try:
+        data = await refresh()
+    except Exception:
+        if entry:
+            obj.set_header("X-Cache-Fallback", "1")
+            return entry[1]
+        raise
+    _setCachedResponse(key, data)
+    return data
+
+
+def _setCachedResponse(key, data):
+    """Caches the response data for the key.
+
+    Args:
+        key (string): The endpoint name to cache the data under.
+        data: The response data to cache.
+    Returns:
+        None
+    """
+    _RESPONSE_CACHE[key] = (time.time(), data)
+
+
 def _authenticate(obj):
-    """Test the request to make sure the user is authenticated. 
+    """Test the request to make sure the user is authenticated.
 
     Args:
         obj (MarxanRESTHandler): The request handler instance.
@@ -2579,7 +3047,7 @@ def _authoriseRole(obj, method):
     # get the requested role
     role = obj.get_secure_cookie("role").decode("utf-8")
     # get the list of methods that this role cannot access
-    unauthorised = ROLE_UNAUTHORISED_METHODS[role]
+    unauthorised = _UNAUTH_BY_ROLE[role]
     if method in unauthorised:
         raise HTTPError(403, "The '" + role +
                         "' role does not have permission to access the '" + method + "' service")
@@ -2600,7 +3068,7 @@ def _authoriseUser(obj):
     if DISABLE_SECURITY:
         return
     # if the call includes a user argument
-    if "user" in list(obj.request.arguments.keys()):
+    if "user" in obj.request.arguments:
         # see if the user argument matches the obj.current_user and is not the _clumping project (this is the only exception as it is needed for the clumping)
         if ((obj.get_argument("user") != obj.current_user) and (obj.get_argument("user") != "_clumping") and (obj.current_user != GUEST_USERNAME)):
             # get the requested role
@@ -2635,8 +3103,8 @@ async def _exportAndZipShapefile(folder, feature_class_name, tEpsgCode="EPSG:432
     """
     # export the shapefile
     await pg.exportToShapefile(folder, feature_class_name, tEpsgCode)
-    # zip it up
-    zipfilename = _createZipfile(folder, feature_class_name)
+    # zip it up on the default executor - compressing hundreds of MB of .shp/.dbf would otherwise block the event loop
+    zipfilename = await IOLoop.current().run_in_executor(None, _createZipfile, folder, feature_class_name)
     return zipfilename
 
 
@@ -2666,7 +3134,6 @@ def _getShapefileFieldNames(shapefile):
     Raises:
         MarxanServicesError: If the shapefile does not exist.
     """
-    fieldnames = []
     ogr.UseExceptions()
     try:
         dataSource = ogr.Open(shapefile)
@@ -2678,10 +3145,9 @@ def _getShapefileFieldNames(shapefile):
         raise MarxanServicesError(e.args[1])
     else:
         layerDefinition = daLayer.GetLayerDefn()
-        count = layerDefinition.GetFieldCount()
-        for i in range(count):
-            fieldnames.append(layerDefinition.GetFieldDefn(i).GetName())
-        return fieldnames
+        # bind the method to a local and build the list in a comprehension - no attribute lookup or list append per field
+        getFieldDefn = layerDefinition.GetFieldDefn
+        return [getFieldDefn(i).GetName() for i in range(layerDefinition.GetFieldCount())]
 
 
 def _isProjectRunning(user, project):
@@ -2694,35 +3160,83 @@ def _isProjectRunning(user, project):
         bool: Returns True if the project is already running.
     """
     # get the data from the run log file
-    df = _loadCSV(MARXAN_FOLDER + RUN_LOG_FILENAME)
+    df = _loadRunLog()
     # filter for running projects from the passed user and project
     return not df.loc[(df['status'] == 'Running') & (df["user"] == user) & (df["project"] == project)].empty
 
 
+# the run log dataframe as a ((st_mtime_ns, st_size), df) tuple so repeated polls skip the parse - hits return a copy as the callers mutate the frame
+_RUN_LOG_CACHE = None
+
+
+def _loadRunLog():
+    """Loads the run log as a dataframe indexed by pid. Reads from the binary feather sidecar when it is at least as new as the tsv file, otherwise parses the tsv and refreshes the sidecar - the tsv remains the canonical append-friendly log that logRun writes to.
+
+    Args:
+        None
+    Returns:
+        pandas.DataFrame: The run log data.
+    """
+    global _RUN_LOG_CACHE
+    logfile = MARXAN_FOLDER + RUN_LOG_FILENAME
+    feather = logfile + ".feather"
+    # serve an unchanged run log from memory - updates rewrite the tsv so the stamp changes whenever the contents do
+    try:
+        st = os.stat(logfile)
+        stamp = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        stamp = None
+    if stamp and _RUN_LOG_CACHE and (_RUN_LOG_CACHE[0] == stamp):
+        return _RUN_LOG_CACHE[1].copy()
+    try:
+        if os.path.exists(feather) and (os.path.getmtime(feather) >= os.path.getmtime(logfile)):
+            df = pandas.read_feather(feather)
+            df.set_index('pid', drop=False, inplace=True)
+            if stamp:
+                _RUN_LOG_CACHE = (stamp, df.copy())
+            return df
+    except Exception:
+        # fall through and reparse the tsv if the sidecar is unreadable
+        pass
+    df = _loadCSV(logfile)
+    # index the dataframe by pid so that run log lookups and updates are O(1) at[] accesses rather than boolean-mask scans
+    if 'pid' in df.columns:
+        df.set_index('pid', drop=False, inplace=True)
+        # eagerly split the "X/Y" runs column into two int columns in one vectorized pass - updates are then pure int writes rather than per-row string surgery
+        if len(df):
+            df[['runs_done', 'runs_total']] = df['runs'].str.split(
+                '/', expand=True).astype('Int64')
+        else:
+            df['runs_done'] = pandas.Series(dtype='Int64')
+            df['runs_total'] = pandas.Series(dtype='Int64')
+        # refresh the sidecar so the next load is a binary read with no parsing
+        df.reset_index(drop=True).to_feather(feather)
+        if stamp:
+            _RUN_LOG_CACHE = (stamp, df.copy())
+    return df
+
+
 def _getRunLogs():
     """Gets the data from the run log as a dataframe.
 
     Args:
-        None  
+        None
     Returns:
-        None  
+        None
     """
     # get the data from the run log file
-    df = _loadCSV(MARXAN_FOLDER + RUN_LOG_FILENAME)
+    df = _loadRunLog()
     # for those processes that are running, update the number of runs completed
     runningProjects = df.loc[df['status'] == 'Running']
-    for index, row in runningProjects.iterrows():
-        # get the output folder
-        tmpObj = ExtendableObject()
-        tmpObj.folder_output = MARXAN_USERS_FOLDER + \
-            row['user'] + os.sep + row['project'] + os.sep + "output" + os.sep
-        # get the number of runs completed
-        numRunsCompleted = _getNumberOfRunsCompleted(tmpObj)
-        # get the index for the record that needs to be updated
-        i = df.loc[df['pid'] == row['pid']].index.tolist()[0]
-        # update the number of runs
-        df.loc[i, 'runs'] = str(numRunsCompleted) + \
-            df.loc[i, 'runs'][df.loc[i, 'runs'].find("/"):]
+    for pid, row in runningProjects.iterrows():
+        # count the solution files in the output folder directly - no wrapper object per row
+        df.at[pid, 'runs_done'] = _countRunOutputs(
+            MARXAN_USERS_FOLDER + row['user'] + os.sep + row['project'] + os.sep + "output" + os.sep)
+    # reformat the "X/Y" display column for the running rows in one vectorized pass
+    if not runningProjects.empty:
+        running = df['status'] == 'Running'
+        df.loc[running, 'runs'] = df.loc[running, 'runs_done'].astype(
+            str) + '/' + df.loc[running, 'runs_total'].astype(str)
     return df
 
 
@@ -2739,6 +3253,21 @@ async def _getNumberOfRunsRequired(obj):
     return [int(s['value']) for s in obj.projectData['runParameters'] if s['key'] == 'NUMREPS'][0]
 
 
+def _countRunOutputs(folder_output):
+    """Counts the Marxan solution files in the passed output folder.
+
+    Args:
+        folder_output (string): The full path to the projects output folder.
+    Returns:
+        int: The number of runs that are completed.
+    """
+    try:
+        with os.scandir(folder_output) as files:
+            return sum(1 for file in files if file.name.startswith(SOLUTION_FILE_PREFIX))
+    except FileNotFoundError:
+        return 0
+
+
 def _getNumberOfRunsCompleted(obj):
     """Gets the number of Marxan runs completed from the output files.
 
@@ -2747,8 +3276,7 @@ def _getNumberOfRunsCompleted(obj):
     Returns:
         int: The number of runs that are completed.
     """
-    files = glob.glob(obj.folder_output + "output_r*")
-    return len(files)
+    return _countRunOutputs(obj.folder_output)
 
 
 def _updateRunLog(pid, startTime, numRunsCompleted, numRunsRequired, status):
@@ -2766,29 +3294,36 @@ def _updateRunLog(pid, startTime, numRunsCompleted, numRunsRequired, status):
         MarxanServicesError: If unable to update the log file.
     """
     try:
-        # load the run log
+        # load the run log - this is indexed by pid
         df = _getRunLogs()
-        # get the index for the record that needs to be updated
-        i = df.loc[df['pid'] == pid].index.tolist()[0]
+        # check the record that needs to be updated exists
+        if pid not in df.index:
+            raise KeyError(pid)
     except:
         # probably the user cleared the run log so the pid was not found
         raise MarxanServicesError(
             "Unable to update run log for pid " + str(pid) + " with status " + status)
     else:
-        # update the dataframe in place
+        # update the dataframe in place - at[] skips the axis alignment of loc[]
         if startTime:
-            df.loc[i, 'endtime'] = datetime.datetime.now().strftime(
+            df.at[pid, 'endtime'] = datetime.datetime.now().strftime(
                 "%d/%m/%y %H:%M:%S")
-            df.loc[i, 'runtime'] = str(
+            df.at[pid, 'runtime'] = str(
                 (datetime.datetime.now() - startTime).seconds) + "s"
         if numRunsCompleted:
-            df.loc[i, 'runs'] = str(numRunsCompleted) + \
-                "/" + str(numRunsRequired)
-        if (df.loc[i, 'status'] == 'Running'):  # only update the status if it isnt already set
-            df.loc[i, 'status'] = status
-        # write the dataframe back to the run log
-        df.to_csv(MARXAN_FOLDER + RUN_LOG_FILENAME, index=False, sep='\t')
-        return df.loc[i, 'status']
+            df.at[pid, 'runs_done'] = numRunsCompleted
+            df.at[pid, 'runs_total'] = numRunsRequired
+        if (df.at[pid, 'status'] == 'Running'):  # only update the status if it isnt already set
+            df.at[pid, 'status'] = status
+        # reconstitute the "X/Y" display column from the int columns in one vectorized pass and write the run log without the working columns
+        df['runs'] = df['runs_done'].astype(str) + \
+            "/" + df['runs_total'].astype(str)
+        df.drop(columns=['runs_done', 'runs_total']).to_csv(
+            MARXAN_FOLDER + RUN_LOG_FILENAME, index=False, sep='\t')
+        # write the feather sidecar last so it is at least as new as the tsv and the next load skips the parse
+        df.reset_index(drop=True).to_feather(
+            MARXAN_FOLDER + RUN_LOG_FILENAME + ".feather")
+        return df.at[pid, 'status']
 
 
 def _debugSQLStatement(sql, connection):
@@ -2815,21 +3350,33 @@ def _checkZippedShapefile(shapefile):
     Returns:
         None  
     """
+    # collect the extensions of the sibling files in a single folder scan rather than a glob plus an os.path.exists pair per required file
+    prefix = os.path.basename(shapefile)[:-4]
+    exts = set()
+    try:
+        with os.scandir(os.path.dirname(shapefile)) as entries:
+            for entry in entries:
+                if entry.name[:-4] == prefix:
+                    exts.add(entry.name[-3:].lower())
+    except FileNotFoundError:
+        pass
     # check there are any files present
-    files = glob.glob(shapefile[:-4] + "*")
-    if (len(files) == 0):
+    if (len(exts) == 0):
         raise MarxanServicesError(
             "The shapefile '" + shapefile + "' was not found")
-    # check all the required files are present .shp, .shx and .dbf
-    if not os.path.exists(shapefile):
-        raise MarxanServicesError("The *.shp file is missing in the zipfile. See <a href='" +
-                                  ERRORS_PAGE + "#the-extension-file-is-missing-in-the-zipfile' target='blank'>here</a>")
-    if (not os.path.exists(shapefile[:-3] + "shx")) and (not os.path.exists(shapefile[:-3] + "SHX")):
-        raise MarxanServicesError("The *.shx file is missing in the zipfile. See <a href='" +
-                                  ERRORS_PAGE + "#the-extension-file-is-missing-in-the-zipfile' target='blank'>here</a>")
-    if (not os.path.exists(shapefile[:-3] + "dbf")) and (not os.path.exists(shapefile[:-3] + "DBF")):
-        raise MarxanServicesError("The *.dbf file is missing in the zipfile. See <a href='" +
-                                  ERRORS_PAGE + "#the-extension-file-is-missing-in-the-zipfile' target='blank'>here</a>")
+    # check all the required files are present .shp, .shx and .dbf - computed as a 3 bit mask so the fully-valid case is a single comparison
+    mask = (('shp' in exts) << 2) | (('shx' in exts) << 1) | ('dbf' in exts)
+    if mask == 0b111:
+        return
+    # map the mask to the first missing extension
+    if not (mask & 0b100):
+        ext = "shp"
+    elif not (mask & 0b010):
+        ext = "shx"
+    else:
+        ext = "dbf"
+    raise MarxanServicesError("The *." + ext + " file is missing in the zipfile. See <a href='" +
+                              ERRORS_PAGE + "#the-extension-file-is-missing-in-the-zipfile' target='blank'>here</a>")
 
 
 def _getMBAT():
@@ -2853,14 +3400,70 @@ def _getMBAT():
             raise MarxanServicesError("MBAT not found in Marxan Registry")
 
 
+def _initialiseImportWorker():
+    """Initialises a GDAL import worker process by registering all of the GDAL drivers - the registration cost is then paid once per worker rather than once per import.
+
+    Args:
+        None
+    Returns:
+        None
+    """
+    gdal.UseExceptions()
+    gdal.AllRegister()
+
+
+def _gdalImportFile(path, feature_class_name, sEpsgCode, tEpsgCode, pgDsn, sourceFeatureClass=''):
+    """Imports a file into PostGIS in-process using the GDAL Python API - the equivalent of shelling out to ogr2ogr but without forking a new process, reopening the PG driver and renegotiating the database authentication for every import.
+
+    Args:
+        path (string): The full path to the file to import.
+        feature_class_name (string): The name of the destination feature class which will be created.
+        sEpsgCode (string): The source EPSG code.
+        tEpsgCode (string): The target EPSG code.
+        pgDsn (string): The GDAL PostgreSQL connection string - passed in rather than read from the module global as the worker processes do not run the server startup and so do not have it on spawn-start platforms.
+        sourceFeatureClass (string): Optional. The name of the source feature class within the file geodatabase to import. Default value is an empty string. File geodatabase imports only.
+    Returns:
+        None
+    Raises:
+        RuntimeError: If the import fails.
+    """
+    gdal.UseExceptions()
+    # rename the geometry field from the default (wkb_geometry) to geometry
+    options = gdal.VectorTranslateOptions(format='PostgreSQL', layerName=feature_class_name, srcSRS=sEpsgCode, dstSRS=tEpsgCode, geometryType='GEOMETRY', layers=[
+                                          sourceFeatureClass] if sourceFeatureClass else None, layerCreationOptions=['SCHEMA=marxan', 'GEOMETRY_NAME=geometry', 'precision=NO'])
+    ds = gdal.VectorTranslate(pgDsn, path, options=options)
+    if ds is None:
+        raise RuntimeError("Import failed for '" + path + "'")
+    # dereference to flush and close the datasource
+    ds = None
+
+
+def _copyQueryToFile(query, filename):
+    """Streams the results of a select statement directly to a csv file using the native COPY protocol - this is not part of the PostGIS class as COPY is not supported on the asynchronous aiopg connections - and it is not asynchronous.
+
+    Args:
+        query (string): The select statement whose results will be written.
+        filename (string): The full path to the csv file that will be created.
+    Returns:
+        None
+    """
+    conn = psycopg2.connect(CONNECTION_STRING)
+    try:
+        with conn.cursor() as cur, open(filename, 'wb') as f:
+            cur.copy_expert("COPY (" + query.rstrip().rstrip(";") +
+                            ") TO STDOUT WITH CSV HEADER", f)
+    finally:
+        conn.close()
+
+
 def _importDataFrame(df, table_name):
     """Imports a dataframe into a table - this is not part of the PostGIS class as it uses a different connection string - and it is not asynchronous.
 
     Args:
-        df (pandas.DataFrame): The dataframe to import into a table.  
-        table_name (string): The name of the table to create.  
+        df (pandas.DataFrame): The dataframe to import into a table.
+        table_name (string): The name of the table to create.
     Returns:
-        None  
+        None
     """
     engine_text = 'postgresql://' + DATABASE_USER + ':' + \
         DATABASE_PASSWORD + '@' + DATABASE_HOST + '/' + DATABASE_NAME
@@ -2870,7 +3473,6 @@ def _importDataFrame(df, table_name):
     output = io.StringIO()
     df.to_csv(output, sep='\t', header=False, index=False)
     output.seek(0)
-    contents = output.getvalue()
     cur.copy_from(output, 'marxan.' + table_name,
                   null="")  # null values become ''
     conn.commit()
@@ -2903,71 +3505,111 @@ def _deleteShutdownFile():
         os.remove(MARXAN_FOLDER + SHUTDOWN_FILENAME)
 
 
+# the contents of the shutdown file as an (st_mtime_ns, content) tuple so the frequently polled getServerData endpoint only re-reads the file when it changes
+_SHUTDOWN_TIME_CACHE = None
+
+
+def _getShutdownTime():
+    """Gets the scheduled shutdown time from the shutdown file with a single stat, only re-reading the file when it has changed.
+
+    Args:
+        None
+    Returns:
+        string: The shutdown time from the shutdown file, or None if no shutdown is scheduled.
+    """
+    global _SHUTDOWN_TIME_CACHE
+    try:
+        st = os.stat(MARXAN_FOLDER + SHUTDOWN_FILENAME)
+    except OSError:
+        _SHUTDOWN_TIME_CACHE = None
+        return None
+    if _SHUTDOWN_TIME_CACHE and (_SHUTDOWN_TIME_CACHE[0] == st.st_mtime_ns):
+        return _SHUTDOWN_TIME_CACHE[1]
+    content = _readFile(MARXAN_FOLDER + SHUTDOWN_FILENAME)
+    _SHUTDOWN_TIME_CACHE = (st.st_mtime_ns, content)
+    return content
+
+
 @gen.coroutine
 def _runCmd(cmd, suppressOutput=False):
     """Runs a command in a separate process. This is a utility method for running synchronous code in Tornado in a separate process (and thereby running it asynchronously).
 
     Args:
-        cmd (string): The command to run.  
-        suppressOutput (bool): Optional. If True, suppresses the output to stdout. Default value is False.  
+        cmd (string or list): The command to run - a pre-built argv list skips the shlex parsing.
+        suppressOutput (bool): Optional. If True, suppresses the output to stdout. Default value is False.
     Returns:
         int: Returns 0 if successful otherwise 1.
     """
     if platform.system() != "Windows":
+        # a pre-built argv list is passed straight through without shlex parsing
+        argv = cmd if isinstance(cmd, list) else shlex.split(cmd)
         try:
             # run the import as an asyncronous subprocess
             if suppressOutput:
-                process = Subprocess([*shlex.split(cmd)],
-                                     stdout=subprocess.DEVNULL)
+                process = Subprocess(argv, stdout=subprocess.DEVNULL)
             else:
-                process = Subprocess([*shlex.split(cmd)])
+                process = Subprocess(argv)
             result = yield process.wait_for_exit()
         except CalledProcessError as e:
             raise MarxanServicesError(
-                "Error running command: " + cmd + "\n" + e.args[0])
+                "Error running command: " + " ".join(argv) + "\n" + e.args[0])
     else:
         # run the command using the python subprocess module
         resultBytes = subprocess.check_output(
-            cmd, shell=True, stderr=subprocess.STDOUT)
+            cmd, shell=isinstance(cmd, str), stderr=subprocess.STDOUT)
         result = 0 if (resultBytes.decode("utf-8") == '') else -1
     return result
 
 
+def _deleteProjectIfEmpty(project):
+    """Deletes the project folder if it contains no files.
+
+    Args:
+        project (string): The full path to the project folder.
+    Returns:
+        None
+    """
+    # peek at the folder contents - an exhausted iterator means the project has no files
+    with os.scandir(project) as contents:
+        if next(contents, None) is None:
+            # remove any that have no files
+            shutil.rmtree(project)
+
+
 async def _cleanup():
     """Runs a set of maintenance tasks to remove orphaned tables, tmp tables and clumping projects that may remain on the server.
 
     Args:
-        None  
+        None
     Returns:
-        None  
+        None
     """
     # database cleanup
     await pg.execute("SELECT marxan.deletedissolvedwdpafeatureclasses()")
     await pg.execute("SELECT marxan.deleteorphanedfeatures()")
     await pg.execute("SELECT marxan.deletescratchfeatureclasses()")
-    # file cleanup
-    files = glob.glob(CLUMP_FOLDER + "*")
-    for file in files:
-        # get the file date
-        fileDate = datetime.datetime.fromtimestamp(os.path.getmtime(file))
-        # get the timedelta from now
-        td = datetime.datetime.now() - fileDate
-        if td.days > 1:
+    # file cleanup - a single scandir pass reuses the stat information cached on each dirent rather than making a separate getmtime call per file
+    now = time.time()
+    with os.scandir(CLUMP_FOLDER) as files:
+        for file in files:
             # if the file is older than 1 day, then delete it
-            os.remove(file)
+            if (now - file.stat().st_mtime) > 86400:
+                os.remove(file.path)
     #folder cleanup - orphaned projects
     #get the list of users
-    users = _getUsers() 
-    #iterate through the users
+    users = _getUsers()
+    #collect all of the project folders first - each check is then independent and a single syscall
+    projects = []
     for user in users:
-        #get the users projects
-        projects = glob.glob(MARXAN_USERS_FOLDER + user + os.sep + "*/")
-        #iterate through the projects
-        for project in projects:
-            if len(glob.glob(project + "*")) == 0:
-                #remove any that have no files
-                shutil.rmtree(project)        
-    
+        with os.scandir(MARXAN_USERS_FOLDER + user) as entries:
+            projects.extend([entry.path for entry in entries if entry.is_dir()])
+    #sweep the projects across a thread pool in a worker thread so the stat calls dont block the event loop
+    def sweep():
+        with ThreadPoolExecutor(32) as executor:
+            list(executor.map(_deleteProjectIfEmpty, projects))
+    if projects:
+        await asyncio.to_thread(sweep)
+
 ####################################################################################################################################################################################################################################################################
 # generic classes
 ####################################################################################################################################################################################################################################################################
@@ -3001,7 +3643,38 @@ class PostGIS():
         """On initialise, creates an attribute that points to the database pool that is managing all of the connections to PostGIS
         """
         # the minsize/maxsize parameters are critical otherwise you get aiopg errors (unclosed connections, GeneratorExit exceptions) - these values may not be ideal in all cases
-        self.pool = await aiopg.create_pool(CONNECTION_STRING, timeout=None, minsize=50, maxsize=250)
+        # minsize is kept low so the server does not pay for 50 TCP handshakes at startup - the pool grows lazily up to maxsize under load
+        self.pool = await aiopg.create_pool(CONNECTION_STRING, timeout=None, minsize=10, maxsize=250)
+        # registry of the server-side prepared statement names that exist on each pooled connection, keyed by the id of the raw connection
+        self.preparedStatements = {}
+
+    async def _prepareStatement(self, cur, sql, data):
+        """Ensures a server-side prepared statement exists for the sql on the cursors connection and returns an EXECUTE statement for it with the data bound. The PREPARE parses and plans the query once per pooled connection - subsequent executions of the same query on that connection skip straight to execution.
+
+        Args:
+            cur (aiopg.Cursor): The cursor the query will run on.
+            sql (string): The sql string with %s placeholders.
+            data (list): The parameters that will be bound into the EXECUTE statement.
+        Returns:
+            bytes: The mogrified EXECUTE statement.
+        """
+        name = "marxan_" + hashlib.md5(sql.encode("utf-8")).hexdigest()[:16]
+        # dont let the registry grow unbounded if there is a lot of connection churn
+        if len(self.preparedStatements) > 512:
+            self.preparedStatements.clear()
+        prepared = self.preparedStatements.setdefault(
+            id(cur.connection.raw), set())
+        if name not in prepared:
+            # replace the psycopg2 placeholders with the numbered parameters that PREPARE requires
+            parts = sql.split("%s")
+            preparedSql = parts[0] + "".join("$" + str(i) + part
+                                             for i, part in enumerate(parts[1:], start=1))
+            try:
+                await cur.execute("PREPARE " + name + " AS " + preparedSql)
+            except psycopg2.errors.DuplicatePreparedStatement:
+                pass
+            prepared.add(name)
+        return cur.mogrify("EXECUTE " + name + " (" + ",".join(["%s"] * len(data)) + ")", data)
 
     async def execute(self, sql, data=None, returnFormat=None, filename=None, socketHandler=None):
         """Executes a query and optionally returns the records or writes them to file. 
@@ -3028,10 +3701,21 @@ class PostGIS():
             raise MarxanServicesError(e.args[0])
         else:
             async with conn.cursor() as cur:
-                # do any argument binding
-                sql = cur.mogrify(sql, data) if data is not None else sql
+                # do any argument binding - parameterised SELECTs are promoted to server-side prepared statements so the parse/plan cost is paid once per pooled connection
+                originalSql = sql
+                if data is not None:
+                    if isinstance(sql, str) and sql.lstrip()[:6].upper() == "SELECT":
+                        sql = await self._prepareStatement(cur, sql, data)
+                    else:
+                        sql = cur.mogrify(sql, data)
                 # debug the SQL if in DEBUG mode
                 _debugSQLStatement(sql, cur.connection.raw)
+                # if the results are to be written to file, let the server stream them straight to disk as csv - no rows are fetched into Python and no DataFrame is materialised
+                if returnFormat == "File":
+                    query = sql.decode("utf-8") if isinstance(sql, bytes) else (
+                        sql if isinstance(sql, str) else sql.as_string(cur.connection.raw))
+                    await asyncio.to_thread(_copyQueryToFile, query, filename)
+                    return
                 # if a socketHandler is passed the query is being run from a MarxanWebSocketHandler class
                 if socketHandler:
                     # send a websocket message with the pid if the socketHandler is specified - this is so the query can be stopped - and prefix it with a 'q'
@@ -3041,6 +3725,11 @@ class PostGIS():
                 # run the query
                 try:
                     await cur.execute(sql)
+                except psycopg2.errors.InvalidSqlStatementName:
+                    # the pooled connection was recycled and its id reused so the statement no longer exists - re-prepare and retry
+                    self.preparedStatements.pop(id(cur.connection.raw), None)
+                    sql = await self._prepareStatement(cur, originalSql, data)
+                    await cur.execute(sql)
                 except psycopg2.errors.UniqueViolation as e:
                     raise MarxanServicesError("That item already exists")
                 except psycopg2.errors.InternalError as e:
@@ -3063,89 +3752,116 @@ class PostGIS():
                         return df
                     # convert to a dictionary
                     elif returnFormat == "Dict":
-                        return df.to_dict(orient="records")
-                    # output the results to a file
-                    elif returnFormat == "File":
-                        df.to_csv(filename, index=False)
+                        return _dataFrameToRecords(df)
         finally:
             await self.pool.release(conn)
 
-    async def importFile(self, folder, filename, feature_class_name, sEpsgCode, tEpsgCode, splitAtDateline=True, sourceFeatureClass=''):
-        """Imports a file or file geodatabase feature class into PostGIS using ogr2ogr. 
+    async def _bulk(self, statements):
+        """Executes a batch of statements on a single connection in a single transaction with synchronous_commit disabled. This avoids a connection acquire/release and a full WAL flush per statement on bulk import paths where durability between the individual statements is not required.
 
         Args:
-            folder (string): The full path to where the file is located.  
-            filename (string): The name of the file to import.  
-            feature_class_name (string): The name of the destination feature class which will be created.  
-            sEpsgCode (string): The source EPSG code.  
-            tEpsgCode (string): The target EPSG code.  
-            splitAtDateline (bool): Optional. Set to True to split any features at the dateline. Default value is True.  
-            sourceFeatureClass (string): Optional. The name of the source feature class within the file geodatabase to import. Default value is an empty string. File geodatabase imports only.  
+            statements (list): The sql statements to execute - these can be strings or psycopg2 sql.SQL objects.
         Returns:
-            None  
+            None
         Raises:
-            MarxanServicesError: If the ogr2ogr import fails.
+            MarxanServicesError: Under certain conditions, e.g. database integrity exceptions.
         """
+        conn = await self.pool.acquire()
         try:
-            # drop the feature class if it already exists
-            await self.execute(sql.SQL("DROP TABLE IF EXISTS marxan.{};").format(sql.Identifier(feature_class_name)))
-            # using ogr2ogr - rename the geometry field from the default (wkb_geometry) to geometry
-            cmd = '"' + OGR2OGR_EXECUTABLE + '" -f "PostgreSQL" PG:"host=' + DATABASE_HOST + ' user=' + DATABASE_USER + ' dbname=' + DATABASE_NAME + ' password=' + DATABASE_PASSWORD + '" "' + folder + filename + \
-                '" -nlt GEOMETRY -lco SCHEMA=marxan -lco GEOMETRY_NAME=geometry ' + sourceFeatureClass + ' -nln ' + \
-                feature_class_name + ' -s_srs ' + sEpsgCode + \
-                ' -t_srs ' + tEpsgCode + ' -lco precision=NO'
-            logging.debug(cmd)
-            # run the command
-            result = await _runCmd(cmd)
-            if result == 0:
-                # split the feature class at the dateline
-                if (splitAtDateline):
-                    await self.execute(sql.SQL("UPDATE marxan.{} SET geometry = marxan.ST_SplitAtDateLine(geometry);").format(sql.Identifier(feature_class_name)))
-            else:
-                raise MarxanServicesError(
-                    "Import failed with returncode " + str(result))
+            async with conn.cursor() as cur:
+                # mogrify each statement so the whole batch can be sent to the server in a single round trip
+                script = b";".join([cur.mogrify(statement)
+                                    for statement in statements])
+                # debug the SQL if in DEBUG mode
+                _debugSQLStatement(script, cur.connection.raw)
+                # the commit returns without waiting for the WAL to be flushed to disk
+                await cur.execute(b"BEGIN;SET LOCAL synchronous_commit = OFF;" + script + b";COMMIT;")
+        except psycopg2.errors.UniqueViolation as e:
+            raise MarxanServicesError("That item already exists")
+        except psycopg2.errors.InternalError as e:
+            raise MarxanServicesError("Query stopped: " + e.args[0])
+        finally:
+            await self.pool.release(conn)
+
+    async def importFile(self, folder, filename, feature_class_name, sEpsgCode, tEpsgCode, splitAtDateline=True, sourceFeatureClass='', validate=False):
+        """Imports a file or file geodatabase feature class into PostGIS using the GDAL VectorTranslate API.
+
+        Args:
+            folder (string): The full path to where the file is located.
+            filename (string): The name of the file to import.
+            feature_class_name (string): The name of the destination feature class which will be created.
+            sEpsgCode (string): The source EPSG code.
+            tEpsgCode (string): The target EPSG code.
+            splitAtDateline (bool): Optional. Set to True to split any features at the dateline. Default value is True.
+            sourceFeatureClass (string): Optional. The name of the source feature class within the file geodatabase to import. Default value is an empty string. File geodatabase imports only.
+            validate (bool): Optional. Set to True to check the geometries are valid after the import - fused with the dateline split into a single table pass where possible. Default value is False.
+        Returns:
+            None
+        Raises:
+            MarxanServicesError: If the ogr2ogr import fails or the geometries are invalid.
+        """
+        try:
+            # drop the feature class if it already exists - through the bulk path as the drop does not need to be flushed to disk before the import starts
+            await self._bulk([_formatSQL("DROP TABLE IF EXISTS marxan.{}", feature_class_name)])
+            # import the file with the GDAL Python API in one of the warm worker processes - Tornado stays responsive and the driver registration is amortised across all imports
+            await IOLoop.current().run_in_executor(IMPORT_EXECUTOR, _gdalImportFile, folder + filename, feature_class_name, sEpsgCode, tEpsgCode, OGR2OGR_PG_DSN, sourceFeatureClass)
+            if splitAtDateline and validate:
+                # fused split + validity check - one scan and rewrite of the table instead of an update pass followed by a separate validity scan
+                _isValid = await self.execute(_formatSQL("WITH u AS (UPDATE marxan.{} SET geometry = marxan.ST_SplitAtDateLine(geometry) RETURNING ST_IsValid(geometry) AS valid) SELECT coalesce(bool_and(valid), TRUE) FROM u;", feature_class_name), returnFormat="Array")
+                if not _isValid[0][0]:
+                    # delete the feature class
+                    await self.execute(_formatSQL("DROP TABLE IF EXISTS marxan.{};", feature_class_name))
+                    raise MarxanServicesError("The input shapefile has invalid geometries. See <a href='" +
+                                              ERRORS_PAGE + "#the-input-shapefile-has-invalid geometries' target='blank'>here</a>")
+            # split the feature class at the dateline - the full-table update does not require durability so it goes through the bulk path
+            elif splitAtDateline:
+                await self._bulk([_formatSQL("UPDATE marxan.{} SET geometry = marxan.ST_SplitAtDateLine(geometry)", feature_class_name)])
+            elif validate:
+                await self.isValid(feature_class_name)
         except (MarxanServicesError) as e:
             raise
-        except CalledProcessError as e:  # ogr2ogr error
+        except RuntimeError as e:  # gdal error
             raise MarxanServicesError(e.args[0])
 
-    async def importShapefile(self, folder, shapefile, feature_class_name, sEpsgCode="EPSG:4326", tEpsgCode="EPSG:4326", splitAtDateline=True):
-        """Imports a shapefile into PostGIS using ogr2ogr. 
+    async def importShapefile(self, folder, shapefile, feature_class_name, sEpsgCode="EPSG:4326", tEpsgCode="EPSG:4326", splitAtDateline=True, validate=False):
+        """Imports a shapefile into PostGIS using ogr2ogr.
 
         Args:
-            folder (string): The full path to where the shapefile is located.  
-            shapefile (string): The name of the shapefile to import.  
-            feature_class_name (string): The name of the destination feature class which will be created.  
-            sEpsgCode (string): Optional. The source EPSG code. Default value is 'EPSG:4326' (WGS84).  
-            tEpsgCode (string): Optional. The target EPSG code. Default value is 'EPSG:4326' (WGS84).  
-            splitAtDateline (bool): Optional. Set to True to split any features at the dateline. Default value is True.  
+            folder (string): The full path to where the shapefile is located.
+            shapefile (string): The name of the shapefile to import.
+            feature_class_name (string): The name of the destination feature class which will be created.
+            sEpsgCode (string): Optional. The source EPSG code. Default value is 'EPSG:4326' (WGS84).
+            tEpsgCode (string): Optional. The target EPSG code. Default value is 'EPSG:4326' (WGS84).
+            splitAtDateline (bool): Optional. Set to True to split any features at the dateline. Default value is True.
+            validate (bool): Optional. Set to True to check the geometries are valid after the import. Default value is False.
         Returns:
-            None  
+            None
         Raises:
             MarxanServicesError: If the ogr2ogr import fails.
         """
         # check that all the required files are present for the shapefile
         _checkZippedShapefile(folder + shapefile)
         # import the file
-        await self.importFile(folder, shapefile, feature_class_name, sEpsgCode, tEpsgCode, splitAtDateline)
+        await self.importFile(folder, shapefile, feature_class_name, sEpsgCode, tEpsgCode, splitAtDateline, validate=validate)
 
-    async def importGml(self, folder, gmlfilename, feature_class_name, sEpsgCode="EPSG:4326", tEpsgCode="EPSG:4326", splitAtDateline=True):
-        """Imports a gml file into PostGIS using ogr2ogr. 
+    async def importGml(self, folder, gmlfilename, feature_class_name, sEpsgCode="EPSG:4326", tEpsgCode="EPSG:4326", splitAtDateline=True, validate=False):
+        """Imports a gml file into PostGIS using ogr2ogr.
 
         Args:
-            folder (string): The full path to where the gml file is located.  
-            gmlfilename (string): The name of the gml file to import.  
-            feature_class_name (string): The name of the destination feature class which will be created.  
-            sEpsgCode (string): Optional. The source EPSG code. Default value is 'EPSG:4326' (WGS84).  
-            tEpsgCode (string): Optional. The target EPSG code. Default value is 'EPSG:4326' (WGS84).  
-            splitAtDateline (bool): Optional. Set to True to split any features at the dateline. Default value is True.  
+            folder (string): The full path to where the gml file is located.
+            gmlfilename (string): The name of the gml file to import.
+            feature_class_name (string): The name of the destination feature class which will be created.
+            sEpsgCode (string): Optional. The source EPSG code. Default value is 'EPSG:4326' (WGS84).
+            tEpsgCode (string): Optional. The target EPSG code. Default value is 'EPSG:4326' (WGS84).
+            splitAtDateline (bool): Optional. Set to True to split any features at the dateline. Default value is True.
+            validate (bool): Optional. Set to True to check the geometries are valid after the import. Default value is False.
         Returns:
-            None  
+            None
         Raises:
             MarxanServicesError: If the ogr2ogr import fails.
         """
         # import the file
-        await self.importFile(folder, gmlfilename, feature_class_name, sEpsgCode, tEpsgCode, splitAtDateline)
+        await self.importFile(folder, gmlfilename, feature_class_name, sEpsgCode, tEpsgCode, splitAtDateline, validate=validate)
 
     async def importFileGDBFeatureClass(self, folder, fileGDB, sourceFeatureClass, destFeatureClass, sEpsgCode="EPSG:4326", tEpsgCode="EPSG:4326", splitAtDateline=True):
         """Imports a feature class in a file geodatabase into PostGIS using ogr2ogr. 
@@ -3178,13 +3894,14 @@ class PostGIS():
         Raises:
             MarxanServicesError: If the ogr2ogr import fails.
         """
-        # get the command to execute
-        cmd = '"' + OGR2OGR_EXECUTABLE + '" -f "ESRI Shapefile" "' + exportFolder + '" PG:"host=' + DATABASE_HOST + ' user=' + DATABASE_USER + ' dbname=' + DATABASE_NAME + \
-            ' password=' + DATABASE_PASSWORD + ' ACTIVE_SCHEMA=marxan" -sql "SELECT * FROM ' + \
-            feature_class_sname + ';" -nln ' + feature_class_sname + ' -t_srs ' + tEpsgCode
+        # get the argv to execute from the pre-compiled base - no shell quoting or shlex parsing per call
+        argv = OGR2OGR_EXPORT_ARGV_BASE.copy()
+        argv[3] = exportFolder
+        argv += ['-sql', 'SELECT * FROM ' + feature_class_sname + ';',
+                 '-nln', feature_class_sname, '-t_srs', tEpsgCode]
         # run the command
         try:
-            results = await _runCmd(cmd)
+            results = await _runCmd(argv)
         # catch any unforeseen circumstances
         except CalledProcessError as e:
             raise MarxanServicesError(
@@ -3201,10 +3918,10 @@ class PostGIS():
         Raises:
             MarxanServicesError: If the feature class is not valid.
         """
-        _isValid = await self.execute(sql.SQL("SELECT DISTINCT ST_IsValid(geometry) FROM marxan.{} LIMIT 1;").format(sql.Identifier(feature_class_name)), returnFormat="Array")  # will return [false],[false,true] or [true] - so the first row will be [false] or [false,true]
+        _isValid = await self.execute(_formatSQL("SELECT DISTINCT ST_IsValid(geometry) FROM marxan.{} LIMIT 1;", feature_class_name), returnFormat="Array")  # will return [false],[false,true] or [true] - so the first row will be [false] or [false,true]
         if not _isValid[0][0]:
             # delete the feature class
-            await self.execute(sql.SQL("DROP TABLE IF EXISTS marxan.{};").format(sql.Identifier(feature_class_name)))
+            await self.execute(_formatSQL("DROP TABLE IF EXISTS marxan.{};", feature_class_name))
             raise MarxanServicesError("The input shapefile has invalid geometries. See <a href='" +
                                       ERRORS_PAGE + "#the-input-shapefile-has-invalid geometries' target='blank'>here</a>")
 
@@ -3245,32 +3962,18 @@ class MarxanSubprocess(Popen):
     """
 
     def set_exit_callback_windows(self, callback, *args, **kwargs):
-        """Registers a callback function on Windows by creating another thread and polling the process to see when it is finished
-
-        Args:
-            callback (function): The function that will be called when the process completes.
-        Returns:
-            None  
-        """
-        # set a reference to the thread so we can free it when the process ends
-        self._thread = Thread(target=self._poll_completion,
-                              args=(callback, args, kwargs)).start()
-
-    def _poll_completion(self, callback, args, kwargs):
-        """Polls the subprocess to see when it has finished.
+        """Registers a callback function on Windows by awaiting the process exit on the IOLoop.
 
         Args:
             callback (function): The function that will be called when the process completes.
         Returns:
-            None  
+            None
         """
-        # poll the process to see when it ends
-        while self.poll() is None:
-            time.sleep(1)
-        # call the callback function with the process return code
-        callback(self.returncode)
-        # free the thread memory
-        self._thread = None
+        async def _waitForExit():
+            # Popen.wait blocks on the OS process handle in a pooled worker thread - the process exit is signalled immediately rather than being detected by a poll/sleep loop with 1 second granularity
+            returncode = await IOLoop.current().run_in_executor(None, self.wait)
+            callback(returncode, *args, **kwargs)
+        IOLoop.current().add_callback(_waitForExit)
 
 ####################################################################################################################################################################################################################################################################
 # baseclass for handling REST requests
@@ -3306,21 +4009,69 @@ class MarxanRESTHandler(tornado.web.RequestHandler):
         if self.get_secure_cookie("user"):
             return self.get_secure_cookie("user").decode("utf-8")
 
+    def get_secure_cookie(self, name, *args, **kwargs):
+        """Overridden to memoise the signature verification per request - the user and role cookies are read several times in the authentication chain and each read re-runs the HMAC check on the signed value.
+        """
+        if args or kwargs:
+            return super().get_secure_cookie(name, *args, **kwargs)
+        cache = getattr(self, "_secureCookies", None)
+        if cache is None:
+            cache = self._secureCookies = {}
+        if name not in cache:
+            cache[name] = super().get_secure_cookie(name)
+        return cache[name]
+
+    def decode_argument(self, value, name=None):
+        """Overridden to memoise the decode per raw value so repeated get_argument calls for the same argument do not re-decode the bytes each time.
+        """
+        cache = getattr(self, "_decodedArguments", None)
+        if cache is None:
+            cache = self._decodedArguments = {}
+        decoded = cache.get(value)
+        if decoded is None:
+            decoded = super().decode_argument(value, name)
+            cache[value] = decoded
+        return decoded
+
     def prepare(self):
         """Called before the request is processed - does the neccessary authentication/authorisation.
         """
-        # get the requested method
+        # get the requested method - the lookup is cached on the request path
         method = _getRESTMethod(self.request.path)
+        # hoist the request arguments into a local
+        arguments = self.request.arguments
         # allow access to some methods without authentication/authorisation, e.g. to create new users or validate a user
         if method not in PERMITTED_METHODS:
             # check the referer can call the REST end point from their domain
             _checkCORS(self)
-            # check the request is authenticated
-            _authenticate(self)
-            # check the users role has access to the requested service
-            _authoriseRole(self, method)
-            # check the user has access to the specific resource, i.e. the 'User' role cannot access projects from other users
-            _authoriseUser(self)
+            # repeated requests with the same cookies, method and user skip the authentication/authorisation chain for a short period, e.g. when the client polls run status - the raw signed cookies are the key so the secure cookie is only decoded on a cache miss
+            key = (self.get_cookie("user"), self.get_cookie("role"),
+                   method, arguments.get("user", [b""])[0], _AUTH_POLICY_VERSION)
+            decisionTime = _AUTH_CACHE.get(key)
+            if (decisionTime is None) or ((time.time() - decisionTime) > _AUTH_CACHE_TTL):
+                # check the request is authenticated
+                _authenticate(self)
+                # check the users role has access to the requested service
+                _authoriseRole(self, method)
+                # check the user has access to the specific resource, i.e. the 'User' role cannot access projects from other users
+                _authoriseUser(self)
+                # dont let the cache grow without bound
+                if len(_AUTH_CACHE) > 1000:
+                    _AUTH_CACHE.clear()
+                now = time.time()
+                _AUTH_CACHE[key] = now
+                # prewarm the decisions for the common read-only endpoints the UI hits next so the first navigation clicks are also cache hits
+                if not DISABLE_SECURITY:
+                    unauthorised = _UNAUTH_BY_ROLE[self.get_secure_cookie(
+                        "role").decode("utf-8")]
+                    userArg = (self.current_user or "").encode("utf-8")
+                    for warmMethod in AUTH_PREWARM_METHODS:
+                        if warmMethod not in unauthorised:
+                            # the UI passes the users own name for the per-user endpoints and no user argument for the global ones - both pass the full authorisation chain
+                            _AUTH_CACHE[(key[0], key[1], warmMethod,
+                                         userArg, _AUTH_POLICY_VERSION)] = now
+                            _AUTH_CACHE[(key[0], key[1], warmMethod,
+                                         b"", _AUTH_POLICY_VERSION)] = now
             # instantiate the response dictionary
             self.response = {}
         else:
@@ -3328,33 +4079,72 @@ class MarxanRESTHandler(tornado.web.RequestHandler):
                 # a permitted method so set the CORS headers
                 _setCORS(self)
         # set the folder paths for the user and optionally project
-        _setFolderPaths(self, self.request.arguments)
+        _setFolderPaths(self, arguments)
         # self.send_response({"error": repr(e)})
 
-    def send_response(self, response):
-        """Used by all descendent classes to write the response data and send it.
+    def _encodeResponse(self, response):
+        """Encodes the response dict as json bytes.
 
         Args:
-            response (dict): The response data to write as a dict.
+            response (dict): The response data to encode as a dict.
         Returns:
-            None  
+            bytes: The encoded response.
         """
         try:
-            # set the return header as json
-            self.set_header('Content-Type', 'application/json')
-            # convert the response dictionary to json
-            content = json.dumps(response)
+            # convert the response dictionary to json - orjson encodes straight to bytes and is several times faster than the stdlib on large record arrays; the options let numpy scalars/arrays and int dict keys encode natively instead of falling back
+            try:
+                return orjson.dumps(response, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+            except TypeError:
+                # fall back to the stdlib for any types that orjson cannot encode
+                return json.dumps(response).encode("utf-8")
         # sometimes the Marxan log causes json encoding issues
         except (UnicodeDecodeError) as e:
-            if 'log' in list(response.keys()):
+            if 'log' in response:
                 response.update({"log": "Server warning: Unable to encode the Marxan log. <br/>" +
                                  repr(e), "warning": "Unable to encode the Marxan log"})
-                content = json.dumps(response)
-        finally:
-            if "callback" in list(self.request.arguments.keys()):
-                self.write(self.get_argument("callback") + "(" + content + ")")
-            else:
-                self.write(content)
+                return orjson.dumps(response)
+            raise
+
+    def send_response(self, response):
+        """Used by all descendent classes to write the response data and send it.
+
+        Args:
+            response (dict): The response data to write as a dict.
+        Returns:
+            None  
+        """
+        # set the return header as json
+        self.set_header('Content-Type', 'application/json')
+        content = self._encodeResponse(response)
+        if "callback" in self.request.arguments:
+            self.write(self.get_argument("callback").encode(
+                "utf-8") + b"(" + content + b")")
+        else:
+            self.write(content)
+
+    async def send_large_response(self, response, chunkSize=65536):
+        """Writes a large response in chunks with backpressure so the first bytes reach the client immediately and the whole payload is never held in tornado's write buffer on top of the encoded json.
+
+        Args:
+            response (dict): The response data to write as a dict.
+            chunkSize (int): Optional. The number of bytes to write per chunk. Defaults to 65536.
+        Returns:
+            None
+        """
+        # set the return header as json
+        self.set_header('Content-Type', 'application/json')
+        content = self._encodeResponse(response)
+        if "callback" in self.request.arguments:
+            content = self.get_argument("callback").encode(
+                "utf-8") + b"(" + content + b")"
+        for i in range(0, len(content), chunkSize):
+            self.write(content[i:i + chunkSize])
+            try:
+                # flush applies backpressure - the next chunk is not produced until the socket has accepted this one
+                await self.flush()
+            except StreamClosedError:
+                # the client has gone away
+                return
 
     def write_error(self, status_code, **kwargs):
         """Called on uncaught exceptions in the descendent classes. Gets the stack trace and writes it back to the client.
@@ -3365,19 +4155,16 @@ class MarxanRESTHandler(tornado.web.RequestHandler):
             None  
         """
         if "exc_info" in kwargs:
-            trace = ""
-            for line in traceback.format_exception(*kwargs["exc_info"]):
-                trace = trace + line
-            lastLine = traceback.format_exception(
-                *kwargs["exc_info"])[len(traceback.format_exception(*kwargs["exc_info"]))-1]
+            # format the exception once and reuse the lines - each call re-walks the traceback frames
+            lines = traceback.format_exception(*kwargs["exc_info"])
+            trace = "".join(lines)
+            lastLine = lines[-1]
             # remove the exception class from the lastline
             lastLine = lastLine[lastLine.find(":")+2:]
-            # when an error is encountered, the headers are reset causing CORS errors - so set them again here
+            # when an error is encountered, the headers are reset causing CORS errors - so reapply the headers that were computed in prepare() without re-evaluating the policy
             if not DISABLE_SECURITY:
-                try:
-                    _checkCORS(self)  # may throw a 403
-                except:  # so handle the exception
-                    pass
+                for header, value in getattr(self, "_corsHeaders", {}).items():
+                    self.set_header(header, value)
             # self.set_status(status_code) #this will return an HTTP server error rather than a 200 status code
             # returning an http status code of 200 can be caught by jsonp
             self.set_status(200)
@@ -3389,6 +4176,34 @@ class MarxanRESTHandler(tornado.web.RequestHandler):
 ####################################################################################################################################################################################################################################################################
 
 
+class exportFileHandler(StaticFileHandler):
+    """Static file handler for the export zip files. Reads the file in 1 MiB chunks rather than StaticFileHandler's 64 KiB default - the export zips run to tens or hundreds of MB and the larger chunks cut the read syscalls and event loop round-trips per download by 16x.
+    """
+
+    @classmethod
+    def get_content(cls, abspath, start=None, end=None):
+        with open(abspath, "rb") as file:
+            if start is not None:
+                file.seek(start)
+            if end is not None:
+                remaining = end - (start or 0)
+            else:
+                remaining = None
+            while True:
+                chunk_size = 1024 * 1024
+                if remaining is not None and remaining < chunk_size:
+                    chunk_size = remaining
+                chunk = file.read(chunk_size)
+                if chunk:
+                    if remaining is not None:
+                        remaining -= len(chunk)
+                    yield chunk
+                else:
+                    if remaining is not None:
+                        assert remaining == 0
+                    return
+
+
 class methodNotFound(MarxanRESTHandler):
     """REST HTTP handler. Called when the REST service method does not match any of the handlers defined.
 
@@ -3420,7 +4235,7 @@ class toggleEnableGuestUser(MarxanRESTHandler):
         None  
     """
 
-    def get(self):
+    async def get(self):
         try:
             _getServerData(self)
             # get the current state
@@ -3429,8 +4244,11 @@ class toggleEnableGuestUser(MarxanRESTHandler):
                 enabledString = "False"
             else:
                 enabledString = "True"
-            _updateParameters(MARXAN_FOLDER + SERVER_CONFIG_FILENAME,
-                              {"ENABLE_GUEST_USER": enabledString})
+            # update the file on the default executor so a slow disk does not block the event loop
+            await IOLoop.current().run_in_executor(None, _updateParameters, MARXAN_FOLDER + SERVER_CONFIG_FILENAME,
+                                                   {"ENABLE_GUEST_USER": enabledString})
+            # the guest user access has changed so any cached authentication decisions are now stale
+            _invalidateAuthCache()
             # set the response
             self.send_response({'enabled': not enabled})
         except MarxanServicesError as e:
@@ -3452,24 +4270,26 @@ class createUser(MarxanRESTHandler):
             "info": Informational message  
         }  
     """
+    REQUIRED_ARGS = frozenset(['user', 'password', 'fullname', 'email'])
 
-    def post(self):
+    async def post(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, [
-                               "user", "password", "fullname", "email"])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            # get the arguments once rather than parsing them from the request repeatedly
+            user = self.get_argument('user')
             # create the user
-            _createUser(self, self.get_argument('user'), self.get_argument(
+            _createUser(self, user, self.get_argument(
                 'fullname'), self.get_argument('email'), self.get_argument('password'))
-            # copy each case study into the users folder
-            folders = glob.glob(CASE_STUDIES_FOLDER + "*/")
-            # iterate through the case studies
-            for folder in folders:
-                _cloneProject(folder, MARXAN_USERS_FOLDER +
-                              self.get_argument('user') + os.sep)
+            # copy each case study into the users folder - scandir avoids the per-entry stat calls that glob makes
+            folders = [e.path + os.sep for e in os.scandir(CASE_STUDIES_FOLDER) if e.is_dir()]
+            # clone the case studies concurrently - the copies are i/o bound so running them in parallel overlaps the disk latency
+            loop = IOLoop.current()
+            await gen.multi([loop.run_in_executor(None, _cloneProject, folder, MARXAN_USERS_FOLDER +
+                             user + os.sep) for folder in folders])
             # set the response
             self.send_response(
-                {'info': "User '" + self.get_argument('user') + "' created"})
+                {'info': "User '" + user + "' created"})
         except MarxanServicesError as e:
             _raiseError(self, e.args[0])
 
@@ -3494,23 +4314,26 @@ class createProject(MarxanRESTHandler):
             "user": The name of the user  
         }  
     """
+    REQUIRED_ARGS = frozenset(['user', 'project', 'description', 'planning_grid_name', 'interest_features', 'target_values', 'spf_values'])
     async def post(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, [
-                               'user', 'project', 'description', 'planning_grid_name', 'interest_features', 'target_values', 'spf_values'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            # get the arguments once rather than parsing them from the request repeatedly
+            project = self.get_argument('project')
+            planning_grid_name = self.get_argument('planning_grid_name')
             # create the empty project folder
-            _createProject(self, self.get_argument('project'))
+            _createProject(self, project)
             # update the projects parameters
             _updateParameters(self.folder_project + PROJECT_DATA_FILENAME, {'DESCRIPTION': self.get_argument(
-                'description'), 'CREATEDATE': datetime.datetime.now().strftime("%d/%m/%y %H:%M:%S"), 'PLANNING_UNIT_NAME': self.get_argument('planning_grid_name')})
+                'description'), 'CREATEDATE': datetime.datetime.now().strftime("%d/%m/%y %H:%M:%S"), 'PLANNING_UNIT_NAME': planning_grid_name})
             # create the spec.dat file
             await _updateSpeciesFile(self, self.get_argument("interest_features"), self.get_argument("target_values"), self.get_argument("spf_values"), True)
             # create the pu.dat file
-            await _createPuFile(self, self.get_argument('planning_grid_name'))
+            await _createPuFile(self, planning_grid_name)
             # set the response
-            self.send_response({'info': "Project '" + self.get_argument('project') + "' created",
-                                'name': self.get_argument('project'), 'user': self.get_argument('user')})
+            self.send_response({'info': "Project '" + project + "' created",
+                                'name': project, 'user': self.get_argument('user')})
         except MarxanServicesError as e:
             _raiseError(self, e.args[0])
 
@@ -3529,16 +4352,19 @@ class createImportProject(MarxanRESTHandler):
             "name": The name of the project created  
         }  
     """
+    REQUIRED_ARGS = frozenset(['user', 'project'])
 
     def post(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['user', 'project'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            # get the argument once rather than parsing it from the request repeatedly
+            project = self.get_argument('project')
             # create the empty project folder
-            _createProject(self, self.get_argument('project'))
+            _createProject(self, project)
             # set the response
-            self.send_response({'info': "Project '" + self.get_argument(
-                'project') + "' created", 'name': self.get_argument('project')})
+            self.send_response(
+                {'info': "Project '" + project + "' created", 'name': project})
         except MarxanServicesError as e:
             _raiseError(self, e.args[0])
 
@@ -3559,32 +4385,30 @@ class upgradeProject(MarxanRESTHandler):
             "project": The name of the project updated  
         }  
     """
+    REQUIRED_ARGS = frozenset(['user', 'project'])
     async def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['user', 'project'])
-            # get the projects existing data from the input.dat file
-            old = _readFileUnicode(self.folder_project + PROJECT_DATA_FILENAME)
-            # get an empty projects data
-            new = _readFileUnicode(
-                EMPTY_PROJECT_TEMPLATE_FOLDER + PROJECT_DATA_FILENAME)
-            # everything from the 'DESCRIPTION No description' needs to be added
-            pos = new.find("DESCRIPTION No description")
-            if pos > -1:
-                newText = new[pos:]
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            loop = IOLoop.current()
+            # get the projects existing data from the input.dat file - read off the event loop
+            old = await loop.run_in_executor(None, _readFileUnicode, self.folder_project + PROJECT_DATA_FILENAME)
+            # everything from the 'DESCRIPTION No description' in the template needs to be added - the suffix is cached so the template is only read once
+            newText = _getUpgradeSuffix()
+            if newText is not None:
                 old = old + "\n" + newText
-                _writeFileUnicode(self.folder_project +
-                                  PROJECT_DATA_FILENAME, old)
+                await loop.run_in_executor(None, _writeFileUnicode, self.folder_project + PROJECT_DATA_FILENAME, old)
             else:
                 raise MarxanServicesError(
                     "Unable to update the old version of Marxan to the new one")
             # populate the feature_preprocessing.dat file using data in the puvspr.dat file
             await _createFeaturePreprocessingFileFromImport(self)
             # delete the contents of the output folder
-            _deleteAllFiles(self.folder_output)
+            await loop.run_in_executor(None, _deleteAllFiles, self.folder_output)
             # set the response
-            self.send_response({'info': "Project '" + self.get_argument("project") +
-                                "' updated", 'project': self.get_argument("project")})
+            project = self.get_argument("project")
+            self.send_response(
+                {'info': "Project '" + project + "' updated", 'project': project})
         except MarxanServicesError as e:
             _raiseError(self, e.args[0])
 
@@ -3607,18 +4431,20 @@ class deleteProject(MarxanRESTHandler):
     Raises:
         MarxanServicesError: If it is the users last project.
     """
+    REQUIRED_ARGS = frozenset(['user', 'project'])
     async def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['user', 'project'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # get the existing projects
             await _getProjects(self)
             if len(self.projects) == 1:
                 raise MarxanServicesError("You cannot delete all projects")
             _deleteProject(self)
             # set the response
-            self.send_response({'info': "Project '" + self.get_argument("project") +
-                                "' deleted", 'project': self.get_argument("project")})
+            project = self.get_argument("project")
+            self.send_response(
+                {'info': "Project '" + project + "' deleted", 'project': project})
         except MarxanServicesError as e:
             _raiseError(self, e.args[0])
 
@@ -3639,11 +4465,12 @@ class cloneProject(MarxanRESTHandler):
             "name": The name of the new cloned project  
         }  
     """
+    REQUIRED_ARGS = frozenset(['user', 'project'])
 
     def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['user', 'project'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # clone the folder recursively
             clonedName = _cloneProject(self.folder_project, self.folder_user)
             # set the response
@@ -3671,30 +4498,35 @@ class createProjectGroup(MarxanRESTHandler):
             "data": dict[]: The data for the created projects. Each dict contains the keys: project name, clump number  
         }  
     """
+    REQUIRED_ARGS = frozenset(['user', 'project', 'copies', 'blmValues'])
 
-    def get(self):
+    async def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, [
-                               'user', 'project', 'copies', 'blmValues'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # get the BLM values as a list
             blmValuesList = self.get_argument("blmValues").split(",")
+            loop = IOLoop.current()
+            # prepare a stripped template once - a clone of the project with an empty output folder - so each copy only has to hardlink the template and rewrite its input.dat
+            template = CLUMP_FOLDER + "_tmpl_" + uuid.uuid4().hex
+            await loop.run_in_executor(None, _fastCloneProject, self.folder_project, template)
+            await loop.run_in_executor(None, _deleteAllFiles, template + os.sep + "output" + os.sep)
             # initialise the project name array
-            projects = []
-            # clone the users project folder n times
-            for i in range(int(self.get_argument("copies"))):
-                # get the project name
-                projectName = uuid.uuid4().hex
-                # add the project name to the array
-                projects.append({'projectName': projectName, 'clump': i})
-                shutil.copytree(self.folder_project,
-                                CLUMP_FOLDER + projectName)
-                # delete the contents of the output folder in that cloned project
-                _deleteAllFiles(CLUMP_FOLDER + projectName +
-                                os.sep + "output" + os.sep)
+            projects = [{'projectName': uuid.uuid4().hex, 'clump': i}
+                        for i in range(int(self.get_argument("copies")))]
+
+            def _createClump(projectName, blmValue):
+                _fastCloneProject(template, CLUMP_FOLDER + projectName)
                 # update the BLM and NUMREP values in the project
                 _updateParameters(CLUMP_FOLDER + projectName + os.sep +
-                                  PROJECT_DATA_FILENAME, {'BLM': blmValuesList[i], 'NUMREPS': '1'})
+                                  PROJECT_DATA_FILENAME, {'BLM': blmValue, 'NUMREPS': '1'})
+            try:
+                # create the clones concurrently - each one is independent and i/o bound
+                await gen.multi([loop.run_in_executor(None, _createClump, p['projectName'], blmValuesList[p['clump']])
+                                 for p in projects])
+            finally:
+                # the template is no longer needed
+                await loop.run_in_executor(None, functools.partial(shutil.rmtree, template, ignore_errors=True))
             # set the response
             self.send_response(
                 {'info': "Project group created", 'data': projects})
@@ -3716,17 +4548,18 @@ class deleteProjects(MarxanRESTHandler):
             "info": Informational message  
         }
     """
+    REQUIRED_ARGS = frozenset(['projectNames'])
 
-    def get(self):
+    async def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['projectNames'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # get the project names
             projectNames = self.get_argument("projectNames").split(",")
-            # delete the folders
-            for projectName in projectNames:
-                if os.path.exists(CLUMP_FOLDER + projectName):
-                    shutil.rmtree(CLUMP_FOLDER + projectName)
+            # delete the folders concurrently on the default executor so the deletes overlap and the event loop is not blocked by the directory walks
+            loop = IOLoop.current()
+            await gen.multi([loop.run_in_executor(None, functools.partial(shutil.rmtree, CLUMP_FOLDER + projectName, ignore_errors=True))
+                             for projectName in projectNames if os.path.exists(CLUMP_FOLDER + projectName)])
             # set the response
             self.send_response({'info': "Projects deleted"})
         except MarxanServicesError as e:
@@ -3750,21 +4583,24 @@ class renameProject(MarxanRESTHandler):
             "project": The name of the project that was renamed  
         }  
     """
+    REQUIRED_ARGS = frozenset(['user', 'project', 'newName'])
 
-    def get(self):
+    async def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, [
-                               'user', 'project', 'newName'])
-            # rename the folder
-            os.rename(self.folder_project, self.folder_user +
-                      self.get_argument("newName"))
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            # get the arguments once rather than parsing them from the request repeatedly
+            newName = self.get_argument("newName")
+            loop = IOLoop.current()
+            # rename the folder off the event loop
+            await loop.run_in_executor(None, os.rename, self.folder_project,
+                                       self.folder_user + newName)
             # set the new name as the users last project so it will load on login
-            _updateParameters(self.folder_user + USER_DATA_FILENAME,
-                              {'LASTPROJECT': self.get_argument("newName")})
+            await loop.run_in_executor(None, _updateParameters, self.folder_user + USER_DATA_FILENAME,
+                                       {'LASTPROJECT': newName})
             # set the response
-            self.send_response({"info": "Project renamed to '" + self.get_argument(
-                "newName") + "'", 'project': self.get_argument("project")})
+            self.send_response({"info": "Project renamed to '" + newName +
+                                "'", 'project': self.get_argument("project")})
         except MarxanServicesError as e:
             _raiseError(self, e.args[0])
 
@@ -3785,8 +4621,16 @@ class getCountries(MarxanRESTHandler):
     """
     async def get(self):
         try:
-            content = await pg.execute("SELECT t.iso3, t.name_iso31, CASE WHEN m.iso3 IS NULL THEN False ELSE True END has_marine FROM marxan.gaul_2015_simplified_1km t LEFT JOIN marxan.eez_simplified_1km m on t.iso3 = m.iso3 WHERE t.iso3 NOT LIKE '%|%' ORDER BY lower(t.name_iso31);", returnFormat="Dict")
-            self.send_response({'records': content})
+            # the list of countries changes very rarely so serve it from the response cache where possible - the cached value is the JSON array exactly as Postgres aggregated it
+            countriesJson = await _getCachedResponseOrRefresh(self, "countries", COUNTRIES_CACHE_TTL, _getCountries)
+            # write the response directly - the records are already encoded so re-serialising them through send_response would just undo the json_agg saving
+            self.set_header('Content-Type', 'application/json')
+            content = b'{"records":' + countriesJson.encode("utf-8") + b'}'
+            if "callback" in self.request.arguments:
+                self.write(self.get_argument("callback").encode(
+                    "utf-8") + b"(" + content + b")")
+            else:
+                self.write(content)
         except MarxanServicesError as e:
             _raiseError(self, e.args[0])
 
@@ -3808,7 +4652,9 @@ class getPlanningUnitGrids(MarxanRESTHandler):
     """
     async def get(self):
         try:
-            planningUnitGrids = await _getPlanningUnitGrids()
+            # the planning grid metadata is hit on every page load so serve it from the response cache where possible
+            planningUnitGrids = await _getCachedResponseOrRefresh(
+                self, "planning_unit_grids", PLANNING_GRIDS_CACHE_TTL, _getPlanningUnitGrids)
             self.send_response(
                 {'info': 'Planning unit grids retrieved', 'planning_unit_grids': planningUnitGrids})
         except MarxanServicesError as e:
@@ -3834,16 +4680,20 @@ class importPlanningUnitGrid(MarxanRESTHandler):
             "alias": The alias for the feature class imported  
         }  
     """
+    REQUIRED_ARGS = frozenset(['filename', 'name', 'description'])
     async def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, [
-                               'filename', 'name', 'description'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            # get the argument once rather than parsing it from the request repeatedly
+            name = self.get_argument('name')
             # import the shapefile
-            data = await _importPlanningUnitGrid(self.get_argument('filename'), self.get_argument('name'), self.get_argument('description'), self.get_current_user())
+            data = await _importPlanningUnitGrid(self.get_argument('filename'), name, self.get_argument('description'), self.get_current_user())
+            # the cached planning grid metadata is now stale
+            _RESPONSE_CACHE.pop("planning_unit_grids", None)
             # set the response
             self.send_response({
-                'info': "Planning grid '" + self.get_argument('name') + "' imported",
+                'info': "Planning grid '" + name + "' imported",
                 'feature_class_name': data['feature_class_name'],
                 'uploadId': data['uploadId'],
                 'alias': data['alias']
@@ -3867,15 +4717,17 @@ class exportPlanningUnitGrid(MarxanRESTHandler):
             "filename": The name of the zip file created  
         }  
     """
+    REQUIRED_ARGS = frozenset(['name'])
     async def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['name'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            name = self.get_argument("name")
             # export the shapefile
-            zipfilename = await _exportAndZipShapefile(EXPORT_FOLDER, self.get_argument('name'))
+            zipfilename = await _exportAndZipShapefile(EXPORT_FOLDER, name)
             # set the response
-            self.send_response({'info': "Planning grid '" + self.get_argument(
-                'name') + "' exported", 'filename': self.get_argument('name') + ".zip"})
+            self.send_response({'info': "Planning grid '" + name +
+                                "' exported", 'filename': name + ".zip"})
         except MarxanServicesError as e:
             _raiseError(self, e.args[0])
 
@@ -3896,10 +4748,11 @@ class deletePlanningUnitGrid(MarxanRESTHandler):
     Raises:
         MarxanServicesError: If the planning grid is system supplied or is in use by one or more projects. 
     """
+    REQUIRED_ARGS = frozenset(['planning_grid_name'])
     async def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['planning_grid_name'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # call the internal function
             await _deletePlanningUnitGrid(self.get_argument('planning_grid_name'))
             # set the response
@@ -3925,30 +4778,44 @@ class validateUser(MarxanRESTHandler):
     Raises:
         MarxanServicesError: If the user is not found or the credentials are incorrect. 
     """
+    REQUIRED_ARGS = frozenset(['user', 'password'])
 
     def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['user', 'password'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            user = self.get_argument("user")
+            password = self.get_argument("password")
             # see if the guest user is enabled
-            if ((not _guestUserEnabled(self)) and (self.get_argument("user") == GUEST_USERNAME)):
+            if ((not _guestUserEnabled(self)) and (user == GUEST_USERNAME)):
                 raise MarxanServicesError(
                     "The guest user is not enabled on this server")
-            # get the user data from the user.dat file
-            _getUserData(self, True)
-            # compare the passed password to the one in the user.dat file
-            if self.get_argument("password") == self.userData["PASSWORD"]:
-                #if the request is secure, then set the secure response header for the cookie
-                secure = True if (self.request.protocol == 'https' or self.request.host == '61c92e42cb1042699911c485c38d52ae.vfs.cloud9.eu-west-1.amazonaws.com:8081') else False
-                #set a response cookie for the authenticated user
-                self.set_secure_cookie("user", self.get_argument("user"), httponly = True, samesite = None, secure = secure) 
-                #set a response cookie for the authenticated users role
-                self.set_secure_cookie("role", self.userData["ROLE"], httponly = True, samesite = None, secure = secure)
-                #set the response
-                self.send_response({'info': "User " + self.user + " validated"})
+            # check the credentials cache first - a hit skips the user.dat read and password comparison
+            key = (user, hashlib.blake2b(
+                password.encode("utf-8"), digest_size=16).digest())
+            entry = _CREDENTIALS_CACHE.get(key)
+            if entry and ((time.time() - entry[0]) < _CREDENTIALS_CACHE_TTL):
+                role = entry[1]
             else:
-                # invalid login
-                raise MarxanServicesError("Invalid user/password")
+                # get the user data from the user.dat file
+                _getUserData(self, True)
+                # compare the passed password to the one in the user.dat file in constant time so the comparison does not leak how much of the password matched
+                if not hmac.compare_digest(password.encode("utf-8"), str(self.userData["PASSWORD"]).encode("utf-8")):
+                    # invalid login
+                    raise MarxanServicesError("Invalid user/password")
+                role = self.userData["ROLE"]
+                # dont let the cache grow without bound
+                if len(_CREDENTIALS_CACHE) > 4096:
+                    _CREDENTIALS_CACHE.clear()
+                _CREDENTIALS_CACHE[key] = (time.time(), role)
+            #if the request is secure, then set the secure response header for the cookie
+            secure = True if (self.request.protocol == 'https' or self.request.host == '61c92e42cb1042699911c485c38d52ae.vfs.cloud9.eu-west-1.amazonaws.com:8081') else False
+            #set a response cookie for the authenticated user
+            self.set_secure_cookie("user", user, httponly = True, samesite = None, secure = secure)
+            #set a response cookie for the authenticated users role
+            self.set_secure_cookie("role", role, httponly = True, samesite = None, secure = secure)
+            #set the response
+            self.send_response({'info': "User " + self.user + " validated"})
         except MarxanServicesError as e:
             _raiseError(self, "Login failed: " + e.args[0])
 
@@ -4011,18 +4878,19 @@ class getUser(MarxanRESTHandler):
             "userData": dict: The users data. The dict contains the keys: LASTPROJECT,SHOWPOPUP,NAME,EMAIL,BASEMAP,ROLE,CREATEDATE,USEFEATURECOLORS,SHOWWELCOMESCREEN,REPORTUNITS,unauthorisedMethods,dismissedNotifications  
         }  
     """
+    REQUIRED_ARGS = frozenset(['user'])
 
     def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['user'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # get the user data from the user.dat file
             _getUserData(self)
             # get the notifications data from the notifications.dat file
             ids = _getNotificationsData(self)
             # get the permissions for the users role
             role = self.userData["ROLE"]
-            unauthorised = ROLE_UNAUTHORISED_METHODS[role]
+            unauthorised = _UNAUTH_BY_ROLE[role]
             # set the response
             self.send_response({'info': "User data received", "userData": self.userData,
                                 "unauthorisedMethods": unauthorised, 'dismissedNotifications': ids})
@@ -4046,12 +4914,12 @@ class getUsers(MarxanRESTHandler):
         }  
     """
 
-    def get(self):
+    async def get(self):
         try:
             # get the users
             users = _getUsers()
-            # get all the data for those users
-            usersData = _getUsersData(users)
+            # get all the data for those users - the reads happen concurrently off the event loop
+            usersData = await _getUsersData(users)
             # set the response
             self.send_response(
                 {'info': 'Users data received', 'users': usersData})
@@ -4073,12 +4941,17 @@ class deleteUser(MarxanRESTHandler):
             "info": Informational message  
         }
     """
+    REQUIRED_ARGS = frozenset(['user'])
 
-    def get(self):
+    async def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['user'])
-            shutil.rmtree(self.folder_user)
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            # delete the users folder on the default executor - walking and unlinking thousands of project files would otherwise stall the event loop
+            await IOLoop.current().run_in_executor(None, shutil.rmtree, self.folder_user)
+            # the user no longer exists so any cached authentication decisions and credentials are now stale
+            _invalidateAuthCache()
+            _invalidateCredentialsCache(self.get_argument('user'))
             # set the response
             self.send_response({'info': 'User deleted'})
         except MarxanServicesError as e:
@@ -4111,46 +4984,54 @@ class getProject(MarxanRESTHandler):
             "costnames": string[]: A list of the costname profiles for the project. These are the .cost files in the input folder  
         } 
     """
+    REQUIRED_ARGS = frozenset(['user', 'project'])
     async def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['user', 'project'])
-            if (self.get_argument("user") == GUEST_USERNAME):
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            user = self.get_argument("user")
+            # guest users cannot load projects - reject them before doing any filesystem work
+            if (user == GUEST_USERNAME):
                 self.send_response(
                     {'error': "Logged on as read-only guest user"})
-            else:
-                # see if the project exists
-                if not os.path.exists(self.folder_project):
-                    raise MarxanServicesError(
-                        "The project '" + self.get_argument("project") + "' does not exist")
-                # if the project name is an empty string, then get the first project for the user
-                if (self.get_argument("project") == ""):
-                    self.projects = await _getProjectsForUser(self.get_argument("user"))
-                    project = self.projects[0]['name']
-                    # set the project argument
-                    self.request.arguments['project'] = [
-                        project.encode("utf-8")]
-                    # and set the paths to this project
-                    _setFolderPaths(self, self.request.arguments)
-                # get the project data from the input.dat file
-                await _getProjectData(self)
-                # get the species data from the spec.dat file and the PostGIS database
-                await _getSpeciesData(self)
-                # get the species preprocessing from the feature_preprocessing.dat file
-                _getSpeciesPreProcessingData(self)
-                # get the planning units information
-                await _getPlanningUnitsData(self)
-                # get the protected area intersections
-                _getProtectedAreaIntersectionsData(self)
-                # get the costs data
-                _getCosts(self)
-                # set the project as the users last project so it will load on login - but only if the current user is loading one of their own projects
-                if (self.current_user == self.get_argument("user")):
-                    _updateParameters(self.folder_user + USER_DATA_FILENAME,
-                                      {'LASTPROJECT': self.get_argument("project")})
-                # set the response
-                self.send_response({'user': self.get_argument("user"), 'project': self.projectData["project"], 'metadata': self.projectData["metadata"], 'files': self.projectData["files"], 'runParameters': self.projectData["runParameters"], 'renderer': self.projectData["renderer"], 'features': self.speciesData.to_dict(
-                    orient="records"), 'feature_preprocessing': self.speciesPreProcessingData.to_dict(orient="split")["data"], 'planning_units': self.planningUnitsData, 'protected_area_intersections': self.protectedAreaIntersectionsData, 'costnames': self.costNames})
+                return
+            project = self.get_argument("project")
+            # see if the project exists
+            if not os.path.exists(self.folder_project):
+                raise MarxanServicesError(
+                    "The project '" + project + "' does not exist")
+            # if the project name is an empty string, then get the first project for the user
+            if (project == ""):
+                self.projects = await _getProjectsForUser(user)
+                project = self.projects[0]['name']
+                # set the project argument
+                self.request.arguments['project'] = [
+                    project.encode("utf-8")]
+                # and set the paths to this project
+                _setFolderPaths(self, self.request.arguments)
+            # get the project data from the input.dat file
+            await _getProjectData(self)
+            # the remaining fetches are independent of each other once the project data is loaded and each sets its own attribute, so run the PostGIS round-trips and the file reads concurrently - the latency is that of the slowest fetch rather than the sum
+            loop = IOLoop.current()
+            await gen.multi([
+                # the species data from the spec.dat file and the PostGIS database
+                _getSpeciesData(self),
+                # the planning units information
+                _getPlanningUnitsData(self),
+                # the species preprocessing from the feature_preprocessing.dat file
+                loop.run_in_executor(
+                    None, _getSpeciesPreProcessingData, self),
+                # the protected area intersections
+                loop.run_in_executor(
+                    None, _getProtectedAreaIntersectionsData, self),
+                # the costs data
+                loop.run_in_executor(None, _getCosts, self)])
+            # set the project as the users last project so it will load on login - but only if the current user is loading one of their own projects
+            if (self.current_user == user):
+                _updateParameters(self.folder_user + USER_DATA_FILENAME,
+                                  {'LASTPROJECT': project})
+            # set the response
+            self.send_response({'user': user, 'project': self.projectData["project"], 'metadata': self.projectData["metadata"], 'files': self.projectData["files"], 'runParameters': self.projectData["runParameters"], 'renderer': self.projectData["renderer"], 'features': _dataFrameToRecords(self.speciesData), 'feature_preprocessing': self.speciesPreProcessingData.to_dict(orient="split")["data"], 'planning_units': self.planningUnitsData, 'protected_area_intersections': self.protectedAreaIntersectionsData, 'costnames': self.costNames})
         except MarxanServicesError as e:
             _raiseError(self, e.args[0])
 
@@ -4169,14 +5050,15 @@ class getFeature(MarxanRESTHandler):
             "data": dict containing the keys: id,feature_class_name,alias,description,area,extent,creation_date,tilesetid,source,created_by  
         }  
     """
+    REQUIRED_ARGS = frozenset(['oid'])
     async def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['oid'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # get the data
             await _getFeature(self, self.get_argument("oid"))
             # set the response
-            self.send_response({"data": self.data.to_dict(orient="records")})
+            self.send_response({"data": _dataFrameToRecords(self.data)})
         except MarxanServicesError as e:
             _raiseError(self, e.args[0])
 
@@ -4196,15 +5078,17 @@ class exportFeature(MarxanRESTHandler):
             "filename": The name of the zip file created  
         }  
     """
+    REQUIRED_ARGS = frozenset(['name'])
     async def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['name'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            name = self.get_argument("name")
             # export the shapefile
-            zipfilename = await _exportAndZipShapefile(EXPORT_FOLDER, self.get_argument('name'))
+            zipfilename = await _exportAndZipShapefile(EXPORT_FOLDER, name)
             # set the response
             self.send_response(
-                {'info': "Feature '" + self.get_argument('name') + "' exported", 'filename': zipfilename})
+                {'info': "Feature '" + name + "' exported", 'filename': zipfilename})
         except MarxanServicesError as e:
             _raiseError(self, e.args[0])
 
@@ -4225,16 +5109,16 @@ class getFeaturePlanningUnits(MarxanRESTHandler):
             "data": int[]: A list of the planning unit puids where the feature occurs  
         }  
     """
+    REQUIRED_ARGS = frozenset(['user', 'project', 'oid'])
     async def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, [
-                               'user', 'project', 'oid'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # get the data from the puvspr.dat file as a dataframe
             df = await _getProjectInputData(self, "PUVSPRNAME")
-            # get the planning unit ids as a list
-            puids = df.loc[df['species'] == int(
-                self.get_argument("oid"))]['pu'].unique().tolist()
+            # get the planning unit ids as a list - the mask and take run as single numpy passes over the contiguous columns rather than materialising a filtered DataFrame
+            mask = df['species'].to_numpy() == int(self.get_argument("oid"))
+            puids = pandas.unique(df['pu'].to_numpy()[mask]).tolist()
             # set the response
             self.send_response({"data": puids})
         except MarxanServicesError as e:
@@ -4256,15 +5140,16 @@ class getSpeciesData(MarxanRESTHandler):
             "data": dict[]: For old versions of Marxan each dict contains: alias,feature_class_name,description,creation_date,area,tilesetid,prop,spf,oid,created_by. For Marxan Web projects each dict contains: oid,alias,feature_class_name,description,creation_date,area,tilesetid,extent,created_by  
         }  
     """
+    REQUIRED_ARGS = frozenset(['user', 'project'])
     async def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['user', 'project'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # get the species data from the spec.dat file and PostGIS
             await _getSpeciesData(self)
             # set the response
             self.send_response(
-                {"data": self.speciesData.to_dict(orient="records")})
+                {"data": _dataFrameToRecords(self.speciesData)})
         except MarxanServicesError as e:
             _raiseError(self, e.args[0])
 
@@ -4288,9 +5173,9 @@ class getAllSpeciesData(MarxanRESTHandler):
         try:
             # get all the species data
             await _getAllSpeciesData(self)
-            # set the response
-            self.send_response({"info": "All species data received",
-                                "data": self.allSpeciesData.to_dict(orient="records")})
+            # set the response - streamed in chunks as the full set of features can run to many MB
+            await self.send_large_response({"info": "All species data received",
+                                            "data": _dataFrameToRecords(self.allSpeciesData)})
         except MarxanServicesError as e:
             _raiseError(self, e.args[0])
 
@@ -4310,11 +5195,12 @@ class getSpeciesPreProcessingData(MarxanRESTHandler):
             "data": A list of the preprocessing data  
         }  
     """
+    REQUIRED_ARGS = frozenset(['user', 'project'])
 
     def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['user', 'project'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # get the species preprocessing data
             _getSpeciesPreProcessingData(self)
             # set the response
@@ -4339,10 +5225,11 @@ class getPlanningUnitsData(MarxanRESTHandler):
             "data":list[]: The planning units data normalised by status. e.g. [[1,[245,3586]],[2,[45,297,5908,5909]]]  
         }   
     """
+    REQUIRED_ARGS = frozenset(['user', 'project'])
     async def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['user', 'project'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # get the planning units information
             await _getPlanningUnitsData(self)
             # set the response
@@ -4368,10 +5255,11 @@ class getPlanningUnitsCostData(MarxanRESTHandler):
             "max": The maximum cost value  
         }  
     """
+    REQUIRED_ARGS = frozenset(['user', 'project'])
     async def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['user', 'project'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # get the planning units cost information
             data = await _getPlanningUnitsCostData(self)
             # set the response
@@ -4396,11 +5284,12 @@ class getCosts(MarxanRESTHandler):
             "data": string[]: A list of the cost profiles  
         }  
     """
+    REQUIRED_ARGS = frozenset(['user', 'project'])
 
     def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['user', 'project'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # get the list of cost files for the project
             _getCosts(self)
             # set the response
@@ -4425,11 +5314,11 @@ class updateCosts(MarxanRESTHandler):
             "info": Informational message  
         }
     """
+    REQUIRED_ARGS = frozenset(['user', 'project', 'costname'])
     async def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, [
-                               'user', 'project', 'costname'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # update the costs
             await _updateCosts(self, self.get_argument("costname"))
             # set the response
@@ -4454,12 +5343,12 @@ class deleteCost(MarxanRESTHandler):
             "info": Informational message  
         }
     """
+    REQUIRED_ARGS = frozenset(['user', 'project', 'costname'])
 
     def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, [
-                               'user', 'project', 'costname'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # delete the cost
             _deleteCost(self, self.get_argument("costname"))
             # set the response
@@ -4483,11 +5372,12 @@ class getProtectedAreaIntersectionsData(MarxanRESTHandler):
             "data": list[]: Data from the protected_area_intersections.dat file that contains the intersection data between the planning units and the protected areas normalised by IUCN category. e.g. [['II',[245,3586]],['III',[45,297,5908,5909]]]  
         }  
     """
+    REQUIRED_ARGS = frozenset(['user', 'project'])
 
     def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['user', 'project'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # get the protected area intersections
             _getProtectedAreaIntersectionsData(self)
             # set the response
@@ -4511,11 +5401,12 @@ class getMarxanLog(MarxanRESTHandler):
             "log": The contents of the Marxan log  
         }  
     """
+    REQUIRED_ARGS = frozenset(['user', 'project'])
 
     def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['user', 'project'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # get the log
             _getMarxanLog(self)
             # set the response
@@ -4539,16 +5430,20 @@ class getBestSolution(MarxanRESTHandler):
             "data": list[]: A list of records from the Marxan output_mvbest file  
         }  
     """
+    REQUIRED_ARGS = frozenset(['user', 'project'])
 
     def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['user', 'project'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # get the best solution
             _getBestSolution(self)
-            # set the response
-            self.send_response(
-                {"data": self.bestSolution.to_dict(orient="split")["data"]})
+            # set the response - clients that accept Arrow get the table as a compressed IPC stream which skips the json row encoding entirely
+            if (self.request.headers.get("Accept") == ARROW_MIME_TYPE):
+                _writeArrowResponse(self, self.bestSolutionTable)
+            else:
+                self.send_response(
+                    {"data": self.bestSolutionData})
         except MarxanServicesError as e:
             _raiseError(self, e.args[0])
 
@@ -4568,16 +5463,20 @@ class getOutputSummary(MarxanRESTHandler):
             "data": list[]: A list of records from the Marxan output_sum file  
         }  
     """
+    REQUIRED_ARGS = frozenset(['user', 'project'])
 
     def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['user', 'project'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # get the output sum
             _getOutputSummary(self)
-            # set the response
-            self.send_response(
-                {"data": self.outputSummary.to_dict(orient="split")["data"]})
+            # set the response - clients that accept Arrow get the table as a compressed IPC stream which skips the json row encoding entirely
+            if (self.request.headers.get("Accept") == ARROW_MIME_TYPE):
+                _writeArrowResponse(self, self.outputSummaryTable)
+            else:
+                self.send_response(
+                    {"data": self.outputSummaryData})
         except MarxanServicesError as e:
             _raiseError(self, e.args[0])
 
@@ -4597,11 +5496,12 @@ class getSummedSolution(MarxanRESTHandler):
             "data": list[]: A list of records from the Marxan output_ssoln file  
         }  
     """
+    REQUIRED_ARGS = frozenset(['user', 'project'])
 
     def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['user', 'project'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # get the summed solution
             _getSummedSolution(self)
             # set the response
@@ -4629,23 +5529,26 @@ class getSolution(MarxanRESTHandler):
             "solution": The solution retrieved  
         }  
     """
+    REQUIRED_ARGS = frozenset(['user', 'project', 'solution'])
 
     def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, [
-                               'user', 'project', 'solution'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            project = self.get_argument("project")
+            solution = self.get_argument("solution")
+            user = self.get_argument("user")
             # get the solution
-            _getSolution(self, self.get_argument("solution"))
+            _getSolution(self, solution)
             # get the corresponding missing values file, e.g. output_mv00031.txt - not for clumping projects
-            if (self.get_argument("user") != '_clumping'):
-                _getMissingValues(self, self.get_argument("solution"))
+            if (user != '_clumping'):
+                _getMissingValues(self, solution)
                 # set the response
-                self.send_response({'solution': self.solution, 'mv': self.missingValues, 'user': self.get_argument(
-                    "user"), 'project': self.get_argument("project")})
+                self.send_response(
+                    {'solution': self.solution, 'mv': self.missingValues, 'user': user, 'project': project})
             else:
-                self.send_response({'solution': self.solution, 'user': self.get_argument(
-                    "user"), 'project': self.get_argument("project")})
+                self.send_response(
+                    {'solution': self.solution, 'user': user, 'project': project})
         except MarxanServicesError as e:
             _raiseError(self, e.args[0])
 
@@ -4666,16 +5569,19 @@ class getMissingValues(MarxanRESTHandler):
             "missingValues": list[]: The data from the Marxan missing values file for the solution (output_mv*)  
         }  
     """
+    REQUIRED_ARGS = frozenset(['user', 'project', 'solution'])
 
     def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, [
-                               'user', 'project', 'solution'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # get the missing values file, e.g. output_mv00031.txt
             _getMissingValues(self, self.get_argument("solution"))
-            # set the response
-            self.send_response({'missingValues': self.missingValues})
+            # set the response - clients that accept Arrow get the table as a compressed IPC stream which skips the json row encoding entirely
+            if (self.request.headers.get("Accept") == ARROW_MIME_TYPE):
+                _writeArrowResponse(self, self.missingValuesDf)
+            else:
+                self.send_response({'missingValues': self.missingValues})
         except MarxanServicesError as e:
             _raiseError(self, e.args[0])
 
@@ -4699,22 +5605,35 @@ class getResults(MarxanRESTHandler):
             "ssoln": list[]: A list of records from the Marxan output_ssoln file  
         }  
     """
+    REQUIRED_ARGS = frozenset(['user', 'project'])
 
-    def get(self):
+    async def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['user', 'project'])
-            # get the log
-            _getMarxanLog(self)
-            # get the best solution
-            _getBestSolution(self)
-            # get the output sum
-            _getOutputSummary(self)
-            # get the summed solution
-            _getSummedSolution(self)
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            # check the output files exist with a single directory listing before fanning out the reads - the client polls this endpoint while a run is in progress and the not-ready case should not pay for four file loads and an exception
+            try:
+                names = [e.name for e in os.scandir(self.folder_output)]
+            except FileNotFoundError:
+                names = []
+            for prefix in (BEST_SOLUTION_FILENAME, OUTPUT_SUMMARY_FILENAME, SUMMED_SOLUTION_FILENAME):
+                if not any(name.startswith(prefix) for name in names):
+                    self.send_response({'info': 'No results available'})
+                    return
+            # the four helpers read disjoint output files and each sets its own attribute, so load them concurrently - the latency is that of the slowest file rather than the sum
+            loop = IOLoop.current()
+            await gen.multi([
+                # the log
+                loop.run_in_executor(None, _getMarxanLog, self),
+                # the best solution
+                loop.run_in_executor(None, _getBestSolution, self),
+                # the output sum
+                loop.run_in_executor(None, _getOutputSummary, self),
+                # the summed solution
+                loop.run_in_executor(None, _getSummedSolution, self)])
             # set the response
-            self.send_response({'info': 'Results loaded', 'log': self.marxanLog, 'mvbest': self.bestSolution.to_dict(orient="split")[
-                               "data"], 'summary': self.outputSummary.to_dict(orient="split")["data"], 'ssoln': self.summedSolution})
+            self.send_response({'info': 'Results loaded', 'log': self.marxanLog, 'mvbest': self.bestSolutionData,
+                                'summary': self.outputSummaryData, 'ssoln': self.summedSolution})
         except (MarxanServicesError):
             self.send_response({'info': 'No results available'})
 
@@ -4740,8 +5659,7 @@ class getServerData(MarxanRESTHandler):
             # get the data from the server.dat file
             _getServerData(self)
             # get any shutdown timeouts if they have been set
-            shutdownTime = _readFile(MARXAN_FOLDER + SHUTDOWN_FILENAME) if (
-                os.path.exists(MARXAN_FOLDER + SHUTDOWN_FILENAME)) else None
+            shutdownTime = _getShutdownTime()
             if shutdownTime:
                 self.serverData.update({'SHUTDOWNTIME': shutdownTime})
             # delete sensitive information from the server config data
@@ -4771,10 +5689,11 @@ class getProjects(MarxanRESTHandler):
             "projects": dict[]: A list of projects. Each dict contains the keys: createdate, description, name, oldversion, private, user  
         } 
     """
+    REQUIRED_ARGS = frozenset(['user'])
     async def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['user'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # get the projects
             await _getProjects(self)
             # set the response
@@ -4785,6 +5704,10 @@ class getProjects(MarxanRESTHandler):
 # https://61c92e42cb1042699911c485c38d52ae.vfs.cloud9.eu-west-1.amazonaws.com:8081/marxan-server/getProjectsWithGrids?&callback=__jp2
 
 
+_INPUT_DAT_CACHE = {}
+"""Cache of parsed input.dat key/values for getProjectsWithGrids keyed by file path, each value a (st_mtime_ns, dict) tuple."""
+
+
 class getProjectsWithGrids(MarxanRESTHandler):
     """REST HTTP handler. Gets all projects and their planning unit grids. The required arguments in the request.arguments parameter are:  
 
@@ -4800,39 +5723,59 @@ class getProjectsWithGrids(MarxanRESTHandler):
     """
     async def get(self):
         try:
-            matches = []
-            for root, dirnames, filenames in os.walk(MARXAN_USERS_FOLDER):
-                for filename in fnmatch.filter(filenames, 'input.dat'):
-                    matches.append(os.path.join(root, filename))
-            projects = []
-            for match in matches:
-                # get the user from the matching filename
-                user = match[len(MARXAN_USERS_FOLDER):match[len(MARXAN_USERS_FOLDER):].find(
-                    os.sep) + len(MARXAN_USERS_FOLDER)]
-                # get the project from the matching filename
-                project = match[match.find(
-                    user) + len(user) + 1:match.rfind(os.sep)]
-                # open the input file and get the key values
-                values = _getKeyValuesFromFile(match)
-                projects.append({'user': user, 'project': project, 'feature_class_name':
-                                 values['PLANNING_UNIT_NAME'], 'description': values['DESCRIPTION']})
-            # make the projects dict into a dataframe so we can join it to the data from the planning grids table
-            df = pandas.DataFrame(projects)
-            # set an index on the dataframe
-            df = df.set_index("feature_class_name")
+            def _scanProjects():
+                matches = []
+                for root, dirnames, filenames in os.walk(MARXAN_USERS_FOLDER):
+                    for filename in fnmatch.filter(filenames, 'input.dat'):
+                        matches.append(os.path.join(root, filename))
+                # stat everything first so unchanged projects can be served from the cache
+                mtimes = {match: os.stat(match).st_mtime_ns
+                          for match in matches}
+                # get the files that are not in the cache or have changed since they were cached
+                misses = [match for match in matches if not (_INPUT_DAT_CACHE.get(
+                    match) and (_INPUT_DAT_CACHE[match][0] == mtimes[match]))]
+                if misses:
+                    # parse the changed files concurrently - the GIL is released while each thread waits on the disk
+                    with ThreadPoolExecutor(16) as executor:
+                        for match, values in zip(misses, executor.map(_getKeyValuesFromFile, misses)):
+                            if len(_INPUT_DAT_CACHE) > 10000:
+                                _INPUT_DAT_CACHE.clear()
+                            _INPUT_DAT_CACHE[match] = (
+                                mtimes[match], values)
+                projects = []
+                for match in matches:
+                    # get the user from the matching filename
+                    user = match[len(MARXAN_USERS_FOLDER):match[len(MARXAN_USERS_FOLDER):].find(
+                        os.sep) + len(MARXAN_USERS_FOLDER)]
+                    # get the project from the matching filename
+                    project = match[match.find(
+                        user) + len(user) + 1:match.rfind(os.sep)]
+                    values = _INPUT_DAT_CACHE[match][1]
+                    projects.append({'user': user, 'project': project, 'feature_class_name':
+                                     values['PLANNING_UNIT_NAME'], 'description': values['DESCRIPTION']})
+                return projects
+            # run the walk and parsing in a worker thread so the scan does not block the event loop
+            projects = await IOLoop.current().run_in_executor(None, _scanProjects)
             # get the planning unit grids
             grids = await _getPlanningUnitGrids()
-            # make a dataframe of the planning grids records
-            df2 = pandas.DataFrame(grids)
-            # remove the duplicate description column
-            df2 = df2.drop(
-                columns=['description', 'aoi_id', 'country_id', 'source'])
-            # set an index on the dataframe
-            df2 = df2.set_index("feature_class_name")
-            # join the projects to the planning grids and replace NaNs (in number fields) with None - otherwise the output json is '_area': NaN which causes some json parses to raise an error - it will be replaced with '_area': null
-            df = df.join(df2).replace({pandas.np.nan: None})
+            # index the grids by feature_class_name, dropping the columns that duplicate or are not needed in the project records - a plain dict lookup replaces the previous dataframe construction and join which dominated the call for a few hundred projects
+            dropKeys = ('feature_class_name', 'description',
+                        'aoi_id', 'country_id', 'source')
+            gridsByFcn = {grid['feature_class_name']: {
+                k: v for k, v in grid.items() if k not in dropKeys} for grid in grids}
+            # projects whose planning grid is missing get None for every grid column, as the left outer join did
+            missingGrid = dict.fromkeys(
+                next(iter(gridsByFcn.values())), None) if gridsByFcn else {}
+            # merge the grid data into the project records
+            records = []
+            for p in projects:
+                record = {'user': p['user'], 'project': p['project'],
+                          'description': p['description']}
+                record.update(gridsByFcn.get(
+                    p['feature_class_name'], missingGrid))
+                records.append(record)
             self.send_response(
-                {'info': "Projects data returned", 'data': df.to_dict(orient="records")})
+                {'info': "Projects data returned", 'data': records})
         except MarxanServicesError as e:
             _raiseError(self, e.args[0])
 
@@ -4853,11 +5796,11 @@ class updateSpecFile(MarxanRESTHandler):
             "info": Informational message  
         }
     """
+    REQUIRED_ARGS = frozenset(['user', 'project', 'interest_features', 'spf_values', 'target_values'])
     async def post(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, [
-                               'user', 'project', 'interest_features', 'spf_values', 'target_values'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # update the spec.dat file and other related files
             await _updateSpeciesFile(self, self.get_argument("interest_features"), self.get_argument("target_values"), self.get_argument("spf_values"))
             # set the response
@@ -4882,10 +5825,11 @@ class updatePUFile(MarxanRESTHandler):
             "info": Informational message  
         }
     """
+    REQUIRED_ARGS = frozenset(['user', 'project'])
     async def post(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['user', 'project'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # get the ids for the different statuses
             status1_ids = _getIntArrayFromArg(
                 self.request.arguments, "status1")
@@ -4918,24 +5862,35 @@ class getPUData(MarxanRESTHandler):
             "data": dict containing the keys: features (the features within the planning unit), pu_data (the planning unit data)  
         }  
     """
+    REQUIRED_ARGS = frozenset(['user', 'project', 'puid'])
     async def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, [
-                               'user', 'project', 'puid'])
-            # get the planning unit data
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            puid = int(self.get_argument("puid"))
+            # get the planning unit data - the id lookup goes through the cached row index rather than a boolean mask scan
             pu_df = await _getProjectInputData(self, "PUNAME")
-            pu_data = pu_df.loc[pu_df['id'] == int(
-                self.get_argument('puid'))].iloc[0]
-            # get a set of feature IDs from the puvspr file
-            df = await _getProjectInputData(self, "PUVSPRNAME")
+            idIndexes = await _getProjectInputRowIndexes(self, "PUNAME", "id", pu_df)
+            pu_data = pu_df.iloc[idIndexes.get(puid, [])].iloc[0]
+            # get a set of feature IDs from the puvspr file - also via the cached row index as the file can run to millions of rows
+            puvsprFilename = self.folder_input + os.sep + await _getProjectInputFilename(self, "PUVSPRNAME")
+            try:
+                puvsprSize = os.stat(puvsprFilename).st_size
+            except OSError:
+                puvsprSize = 0
+            # a missing or zero-byte puvspr file cannot hold any records so skip the parse entirely
+            if puvsprSize > 0:
+                df = await _getProjectInputData(self, "PUVSPRNAME")
+            else:
+                df = pandas.DataFrame()
             if not df.empty:
-                features = df.loc[df['pu'] == int(self.get_argument('puid'))]
+                puIndexes = await _getProjectInputRowIndexes(self, "PUVSPRNAME", "pu", df)
+                features = df.iloc[puIndexes.get(puid, [])].to_dict(orient="records")
             else:
-                features = pandas.DataFrame()
+                features = []
             # set the response
             self.send_response({"info": 'Planning unit data returned', 'data': {
-                               'features': features.to_dict(orient="records"), 'pu_data': pu_data.to_dict()}})
+                               'features': features, 'pu_data': pu_data.to_dict()}})
         except MarxanServicesError as e:
             _raiseError(self, e.args[0])
 
@@ -4956,10 +5911,11 @@ class createFeaturePreprocessingFileFromImport(MarxanRESTHandler):
             "info": Informational message  
         }
     """
+    REQUIRED_ARGS = frozenset(['user', 'project'])
     async def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['user', 'project'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # run the internal routine
             await _createFeaturePreprocessingFileFromImport(self)
             # set the response
@@ -4982,12 +5938,12 @@ class addParameter(MarxanRESTHandler):
 
         {"info": Informational message}
     """
+    REQUIRED_ARGS = frozenset(['type', 'key', 'value'])
 
     def get(self):
         try:
             # validate the input arguments - the type parameter is one of {'user','project'}
-            _validateArguments(self.request.arguments, [
-                               'type', 'key', 'value'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # add the parameter
             results = _addParameter(self.get_argument(
                 'type'), self.get_argument('key'), self.get_argument('value'))
@@ -5009,15 +5965,22 @@ class updateUserParameters(MarxanRESTHandler):
             "info": Informational message  
         }
     """
+    REQUIRED_ARGS = frozenset(['user'])
 
     def post(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['user'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # get the parameters to update as a simple dict
             params = _getSimpleArguments(self, ['user', 'callback'])
             # update the parameters
             _updateParameters(self.folder_user + USER_DATA_FILENAME, params)
+            # the users role may have changed so any cached authorisation decisions are now stale
+            if "ROLE" in params:
+                _invalidateAuthCache()
+            # the users password or role may have changed so any cached credentials are now stale
+            if ("PASSWORD" in params) or ("ROLE" in params):
+                _invalidateCredentialsCache(self.get_argument('user'))
             # set the response
             self.send_response(
                 {'info': ",".join(list(params.keys())) + " parameters updated"})
@@ -5038,11 +6001,12 @@ class updateProjectParameters(MarxanRESTHandler):
             "info": Informational message  
         }
     """
+    REQUIRED_ARGS = frozenset(['user', 'project'])
 
     def post(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['user', 'project'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # get the parameters to update as a simple dict
             params = _getSimpleArguments(self, ['user', 'project', 'callback'])
             # update the parameters
@@ -5070,11 +6034,12 @@ class listProjectsForFeature(MarxanRESTHandler):
             "projects": dict[]: A list of the projects that the feature is in. Each dict contains the keys: user, name  
         }  
     """
+    REQUIRED_ARGS = frozenset(['feature_class_id'])
 
     def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['feature_class_id'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # get the projects which contain the feature
             projects = _getProjectsForFeature(
                 int(self.get_argument('feature_class_id')))
@@ -5100,11 +6065,12 @@ class listProjectsForPlanningGrid(MarxanRESTHandler):
             "projects": dict[]: A list of the projects that the feature is in. Each dict contains the keys: user, name  
         }  
     """
+    REQUIRED_ARGS = frozenset(['feature_class_name'])
 
     def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['feature_class_name'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # get the projects which contain the planning grid
             projects = _getProjectsForPlanningGrid(
                 self.get_argument('feature_class_name'))
@@ -5131,19 +6097,179 @@ class uploadTilesetToMapBox(MarxanRESTHandler):
             "uploadid": The Mapbox tileset upload id  
         }  
     """
+    REQUIRED_ARGS = frozenset(['feature_class_name', 'mapbox_layer_name'])
     async def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, [
-                               'feature_class_name', 'mapbox_layer_name'])
-            uploadId = await _uploadTilesetToMapbox(self.get_argument('feature_class_name'), self.get_argument('mapbox_layer_name'))
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            feature_class_name = self.get_argument("feature_class_name")
+            uploadId = await _uploadTilesetToMapbox(feature_class_name, self.get_argument('mapbox_layer_name'))
             # set the response for uploading to mapbox
-            self.send_response({'info': "Tileset '" + self.get_argument(
-                'feature_class_name') + "' uploading", 'uploadid': uploadId})
+            self.send_response({'info': "Tileset '" + feature_class_name +
+                                "' uploading", 'uploadid': uploadId})
         except MarxanServicesError as e:
             _raiseError(self, e.args[0])
 
 
+class _MultipartStreamParser:
+    """Incremental parser for a multipart/form-data request body. File parts are written to a temporary file in the Marxan root folder as the chunks arrive so the body never has to fit in memory, and ordinary form fields are collected so they can be merged into the request arguments.
+
+    Args:
+        contentType (string): The Content-Type header of the request including the boundary parameter.
+    Raises:
+        MarxanServicesError: If the content type is not multipart/form-data with a boundary.
+    """
+
+    def __init__(self, contentType):
+        boundary = None
+        if contentType.startswith("multipart/form-data"):
+            for field in contentType.split(";"):
+                field = field.strip()
+                if field.startswith("boundary="):
+                    boundary = field[len("boundary="):]
+        if not boundary:
+            raise MarxanServicesError(
+                "The content type is not multipart/form-data")
+        if boundary.startswith('"') and boundary.endswith('"'):
+            boundary = boundary[1:-1]
+        self._delimiter = b"--" + boundary.encode("utf-8")
+        self._buffer = b""
+        self._state = "delimiter"
+        self._partName = None
+        self._partValue = None
+        self._file = None
+        self.tmpFilename = None
+        self.uploadFilename = None
+        self.arguments = {}
+
+    def dataReceived(self, chunk):
+        """Feeds the next chunk of the request body to the parser.
+
+        Args:
+            chunk (bytes): The body chunk that has arrived.
+        Returns:
+            None
+        """
+        self._buffer += chunk
+        while True:
+            if self._state == "delimiter":
+                # find the opening delimiter line
+                i = self._buffer.find(self._delimiter)
+                if i == -1:
+                    # keep enough of the tail to match a delimiter split across chunks
+                    self._buffer = self._buffer[-(len(self._delimiter) + 4):]
+                    return
+                self._buffer = self._buffer[i + len(self._delimiter):]
+                self._state = "headers"
+            elif self._state == "headers":
+                # the final delimiter line ends with -- instead of starting another part
+                if self._buffer.startswith(b"--"):
+                    self._state = "end"
+                    return
+                i = self._buffer.find(b"\r\n\r\n")
+                if i == -1:
+                    return
+                self._startPart(self._buffer[:i].decode("utf-8", "replace"))
+                self._buffer = self._buffer[i + 4:]
+                self._state = "body"
+            elif self._state == "body":
+                i = self._buffer.find(b"\r\n" + self._delimiter)
+                if i == -1:
+                    # no delimiter yet - flush all but a tail long enough to hold a split delimiter
+                    keep = len(self._delimiter) + 4
+                    if len(self._buffer) > keep:
+                        self._writePart(self._buffer[:-keep])
+                        self._buffer = self._buffer[-keep:]
+                    return
+                self._writePart(self._buffer[:i])
+                self._endPart()
+                self._buffer = self._buffer[i + 2 + len(self._delimiter):]
+                self._state = "headers"
+            else:
+                return
+
+    def _startPart(self, headers):
+        """Starts a new part from its header block - file parts are streamed to a temporary file and ordinary fields are buffered.
+        """
+        name = re.search('name="([^"]*)"', headers)
+        self._partName = name.group(1) if name else None
+        filename = re.search('filename="([^"]*)"', headers)
+        if filename:
+            # a second file part replaces any earlier one
+            self.cleanup()
+            self.uploadFilename = filename.group(1)
+            self.tmpFilename = MARXAN_FOLDER + "_upload_" + uuid.uuid4().hex
+            self._file = open(self.tmpFilename, 'wb')
+            self._partValue = None
+        else:
+            self._file = None
+            self._partValue = bytearray()
+
+    def _writePart(self, data):
+        """Writes body data to the current part.
+        """
+        if self._file:
+            self._file.write(data)
+        elif self._partValue is not None:
+            self._partValue.extend(data)
+
+    def _endPart(self):
+        """Closes the current part.
+        """
+        if self._file:
+            self._file.close()
+            self._file = None
+        elif self._partName:
+            self.arguments.setdefault(
+                self._partName, []).append(bytes(self._partValue))
+        self._partName = None
+        self._partValue = None
+
+    def finish(self, requestArguments):
+        """Finalises the parse and merges the form fields into the passed request arguments - query string arguments take precedence.
+
+        Args:
+            requestArguments (dict): The request.arguments dict to merge the form fields into.
+        Returns:
+            None
+        """
+        if self._file:
+            # the body ended without a final delimiter - keep what arrived
+            self._file.close()
+            self._file = None
+        for key, values in self.arguments.items():
+            requestArguments.setdefault(key, values)
+
+    def moveTo(self, destination):
+        """Moves the streamed file part to its final destination with an atomic rename.
+
+        Args:
+            destination (string): The full path to move the uploaded file to.
+        Returns:
+            None
+        Raises:
+            MarxanServicesError: If the request did not include a file part.
+        """
+        if not self.tmpFilename:
+            raise MarxanServicesError("No file was uploaded")
+        os.replace(self.tmpFilename, destination)
+        self.tmpFilename = None
+
+    def cleanup(self):
+        """Removes the temporary file if the upload did not complete.
+        """
+        if self._file:
+            self._file.close()
+            self._file = None
+        if self.tmpFilename:
+            try:
+                os.remove(self.tmpFilename)
+            except OSError:
+                pass
+            self.tmpFilename = None
+
+
+@tornado.web.stream_request_body
 class uploadFileToFolder(MarxanRESTHandler):
     """REST HTTP handler. Uploads a file to a specific folder within the Marxan root folder. The required arguments in the request.arguments parameter are:  
 
@@ -5159,22 +6285,39 @@ class uploadFileToFolder(MarxanRESTHandler):
             "file": The name of the file that was uploaded  
         }  
     """
+    REQUIRED_ARGS = frozenset(['filename', 'destFolder'])
+
+    def prepare(self):
+        super().prepare()
+        # the body is streamed to disk so it can be bigger than tornados default in-memory limit
+        self.request.connection.set_max_body_size(MAX_UPLOAD_BODY_SIZE)
+        self.uploadParser = _MultipartStreamParser(
+            self.request.headers.get("Content-Type", ""))
+
+    def data_received(self, chunk):
+        self.uploadParser.dataReceived(chunk)
 
     def post(self):
         try:
+            # merge the streamed form fields into the request arguments and redo the argument-dependent checks that prepare ran before the body had arrived
+            self.uploadParser.finish(self.request.arguments)
+            _authoriseUser(self)
+            _setFolderPaths(self, self.request.arguments)
             # validate the input arguments
-            _validateArguments(self.request.arguments, [
-                               'filename', 'destFolder'])
-            # write the file to the server
-            _writeFile(MARXAN_FOLDER + self.get_argument('destFolder') + os.sep +
-                       self.get_argument('filename'), self.request.files['value'][0].body)
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            filename = self.get_argument("filename")
+            # the file part was already streamed to disk as it arrived - move it into place
+            self.uploadParser.moveTo(
+                MARXAN_FOLDER + self.get_argument('destFolder') + os.sep + filename)
             # set the response
-            self.send_response({'info': "File '" + self.get_argument('filename') +
-                                "' uploaded", 'file': self.get_argument('filename')})
+            self.send_response({'info': "File '" + filename +
+                                "' uploaded", 'file': filename})
         except MarxanServicesError as e:
+            self.uploadParser.cleanup()
             _raiseError(self, e.args[0])
 
 
+@tornado.web.stream_request_body
 class uploadFile(MarxanRESTHandler):
     """REST HTTP handler. Uploads a file to the Marxan users project folder. The required arguments in the request.arguments parameter are:  
 
@@ -5190,19 +6333,34 @@ class uploadFile(MarxanRESTHandler):
             "info": Informational message  
         }
     """
+    REQUIRED_ARGS = frozenset(['user', 'project', 'filename'])
+
+    def prepare(self):
+        super().prepare()
+        # the body is streamed to disk so it can be bigger than tornados default in-memory limit
+        self.request.connection.set_max_body_size(MAX_UPLOAD_BODY_SIZE)
+        self.uploadParser = _MultipartStreamParser(
+            self.request.headers.get("Content-Type", ""))
+
+    def data_received(self, chunk):
+        self.uploadParser.dataReceived(chunk)
 
     def post(self):
         try:
+            # merge the streamed form fields into the request arguments and redo the argument-dependent checks that prepare ran before the body had arrived
+            self.uploadParser.finish(self.request.arguments)
+            _authoriseUser(self)
+            _setFolderPaths(self, self.request.arguments)
             # validate the input arguments
-            _validateArguments(self.request.arguments, [
-                               'user', 'project', 'filename'])
-            # write the file to the server
-            _writeFile(self.folder_project + self.get_argument('filename'),
-                       self.request.files['value'][0].body)
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            filename = self.get_argument("filename")
+            # the file part was already streamed to disk as it arrived - move it into place
+            self.uploadParser.moveTo(self.folder_project + filename)
             # set the response
-            self.send_response({'info': "File '" + self.get_argument('filename') +
-                                "' uploaded", 'file': self.get_argument('filename')})
+            self.send_response({'info': "File '" + filename +
+                                "' uploaded", 'file': filename})
         except MarxanServicesError as e:
+            self.uploadParser.cleanup()
             _raiseError(self, e.args[0])
 
 # https://61c92e42cb1042699911c485c38d52ae.vfs.cloud9.eu-west-1.amazonaws.com:8081/marxan-server/unzipShapefile?filename=test&callback=__jp5
@@ -5221,15 +6379,17 @@ class unzipShapefile(MarxanRESTHandler):
             "rootfilename": The name of the shapefile unzipped (minus the .shp extension)  
         }  
     """
+    REQUIRED_ARGS = frozenset(['filename'])
     async def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['filename'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            filename = self.get_argument("filename")
             # write the file to the server
-            rootfilename = await IOLoop.current().run_in_executor(None, _unzipShapefile, IMPORT_FOLDER, self.get_argument('filename'))
+            rootfilename = await IOLoop.current().run_in_executor(IMPORT_EXECUTOR, _unzipShapefile, IMPORT_FOLDER, filename)
             # set the response
-            self.send_response({'info': "File '" + self.get_argument(
-                'filename') + "' unzipped", 'rootfilename': rootfilename})
+            self.send_response({'info': "File '" + filename +
+                                "' unzipped", 'rootfilename': rootfilename})
         except MarxanServicesError as e:
             _raiseError(self, e.args[0])
 
@@ -5249,11 +6409,12 @@ class getShapefileFieldnames(MarxanRESTHandler):
             "fieldnames": string[]: A list of the field names  
         }  
     """
+    REQUIRED_ARGS = frozenset(['filename'])
 
     def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['filename'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # get the field list
             fields = _getShapefileFieldNames(
                 IMPORT_FOLDER + self.get_argument('filename'))
@@ -5280,16 +6441,68 @@ class deleteFeature(MarxanRESTHandler):
     Raises:
         MarxanServicesError: If the feature cannot be deleted because it is system supplied or currently in use in one or more projects. 
     """
+    REQUIRED_ARGS = frozenset(['feature_name'])
     async def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['feature_name'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             await _deleteFeature(self.get_argument('feature_name'))
             # set the response
             self.send_response({'info': "Feature deleted"})
         except MarxanServicesError as e:
             _raiseError(self, e.args[0])
 
+# https://61c92e42cb1042699911c485c38d52ae.vfs.cloud9.eu-west-1.amazonaws.com:8081/marxan-server/deleteFeatures?feature_names=test_feature1,test_feature2&callback=__jp5
+
+
+class deleteFeatures(MarxanRESTHandler):
+    """REST HTTP handler. Deletes a set of feature classes and their associated metadata records from PostGIS and the tilesets on Mapbox in a single batch. The required arguments in the request.arguments parameter are:  
+
+    Args:
+        feature_names (string): A comma-separated list of the names of the features to delete.
+    Returns:
+        A dict with the following structure (if the class raises an exception, the error message is included in an 'error' key/value pair):  
+
+        {  
+            "info": Informational message  
+        }
+    Raises:
+        MarxanServicesError: If any of the features cannot be deleted because they are system supplied or currently in use in one or more projects. 
+    """
+    REQUIRED_ARGS = frozenset(['feature_names'])
+    async def get(self):
+        try:
+            # validate the input arguments
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            featureNames = [f for f in self.get_argument(
+                'feature_names').split(",") if f != ""]
+            # get the metadata for all of the features in one query
+            data = await pg.execute("SELECT feature_class_name, oid, created_by FROM marxan.metadata_interest_features WHERE feature_class_name = ANY(%s);", data=[featureNames], returnFormat="Dict")
+            # validate all of the features before deleting any of them
+            for record in data:
+                if "created_by" in record.keys():
+                    if record['created_by'] == 'global admin':
+                        raise MarxanServicesError("The feature cannot be deleted as it is a system supplied item. See <a href='" + DOCS_ROOT +
+                                                  "user.html#the-planning-grid-cannot-be-deleted-as-it-is-a-system-supplied-item' target='blank'>here</a>")
+                if len(_getProjectsForFeature(int(record['oid']))) > 0:
+                    raise MarxanServicesError(
+                        "The feature cannot be deleted as it is currently being used")
+            featureClassNames = [record['feature_class_name']
+                                 for record in data]
+            if featureClassNames:
+                # drop all of the feature classes and delete all of the metadata records in a single round trip rather than two per feature
+                statements = [_formatSQL(
+                    "DROP TABLE IF EXISTS marxan.{};", f) for f in featureClassNames]
+                statements.append(sql.SQL("DELETE FROM marxan.metadata_interest_features WHERE feature_class_name = ANY({});").format(
+                    sql.Literal(featureClassNames)))
+                await pg.execute(sql.SQL(" ").join(statements))
+                # delete the Mapbox tilesets concurrently
+                await gen.multi([_deleteTileset(f) for f in featureClassNames])
+            # set the response
+            self.send_response({'info': "Features deleted"})
+        except MarxanServicesError as e:
+            _raiseError(self, e.args[0])
+
 # https://61c92e42cb1042699911c485c38d52ae.vfs.cloud9.eu-west-1.amazonaws.com:8081/marxan-server/deleteShapefile?zipfile=test.zip&shapefile=wibble.shp&callback=__jp5
 
 
@@ -5306,12 +6519,12 @@ class deleteShapefile(MarxanRESTHandler):
             "info": Informational message  
         }
     """
+    REQUIRED_ARGS = frozenset(['zipfile', 'shapefile'])
 
     def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, [
-                               'zipfile', 'shapefile'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             _deleteZippedShapefile(IMPORT_FOLDER, self.get_argument(
                 'zipfile'), self.get_argument('shapefile')[:-4])
             # set the response
@@ -5337,20 +6550,21 @@ class createFeatureFromLinestring(MarxanRESTHandler):
             "uploadId": The Mapbox tileset upload id  
         }  
     """
+    REQUIRED_ARGS = frozenset(['name', 'description', 'linestring'])
     async def post(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, [
-                               'name', 'description', 'linestring'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            name = self.get_argument("name")
             # create the undissolved feature class
             # get a unique feature class name for the import
             feature_class_name = _getUniqueFeatureclassName("f_")
             # create the table and split the feature at the dateline
-            await pg.execute(sql.SQL("CREATE TABLE marxan.{} AS SELECT marxan.ST_SplitAtDateLine(ST_SetSRID(ST_MakePolygon(%s)::geometry, 4326)) AS geometry;").format(sql.Identifier(feature_class_name)), [self.get_argument('linestring')])
+            await pg.execute(_formatSQL("CREATE TABLE marxan.{} AS SELECT marxan.ST_SplitAtDateLine(ST_SetSRID(ST_MakePolygon(%s)::geometry, 4326)) AS geometry;", feature_class_name), [self.get_argument('linestring')])
             # add an index and a record in the metadata_interest_features table and start the upload to mapbox
-            id, uploadId = await _finishCreatingFeature(feature_class_name, self.get_argument('name'), self.get_argument('description'), "Drawn on screen", self.get_current_user())
+            id, uploadId = await _finishCreatingFeature(feature_class_name, name, self.get_argument('description'), "Drawn on screen", self.get_current_user())
             # set the response
-            self.send_response({'info': "Feature '" + self.get_argument('name') + "' created",
+            self.send_response({'info': "Feature '" + name + "' created",
                                 'id': id, 'feature_class_name': feature_class_name, 'uploadId': uploadId})
         except MarxanServicesError as e:
             _raiseError(self, e.args[0])
@@ -5372,21 +6586,23 @@ class stopProcess(MarxanRESTHandler):
     Raises:
         MarxanServicesError: If the process does not exist.
     """
+    REQUIRED_ARGS = frozenset(['pid'])
     async def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['pid'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # get the pid from the pid request parameter - this will be an identifier (m=marxan run, q=query) followed by the pid, e.g. m1234 is a marxan run process with a pid of 1234
-            pid = self.get_argument('pid')[1:]
+            pidArg = self.get_argument('pid')
+            pid = pidArg[1:]
             try:
                 # if the process is a marxan run, then update the run log
-                if (self.get_argument('pid')[:1] == 'm'):
-                    # to distinguish between a process killed by the user and by the OS, we need to update the runlog.dat file to set this process as stopped and not killed
-                    _updateRunLog(int(pid), None, None, None, 'Stopped')
+                if (pidArg[:1] == 'm'):
+                    # to distinguish between a process killed by the user and by the OS, we need to update the runlog.dat file to set this process as stopped and not killed - in the executor so the file rewrite does not block the event loop, but awaited so the status is on disk before the kill
+                    await IOLoop.current().run_in_executor(None, _updateRunLog, int(pid), None, None, None, 'Stopped')
                     # now kill the process
                     os.kill(int(pid), signal.SIGKILL)
                 else:
-                    # cancel the query
+                    # cancel the query - as a parameterised SELECT this is promoted to a server-side prepared statement by pg.execute so repeated cancels skip the parse/plan step
                     await pg.execute("SELECT pg_cancel_backend(%s);", [pid])
             except OSError:
                 raise MarxanServicesError("The pid does not exist")
@@ -5400,6 +6616,9 @@ class stopProcess(MarxanRESTHandler):
 
 # https://61c92e42cb1042699911c485c38d52ae.vfs.cloud9.eu-west-1.amazonaws.com:8081/marxan-server/getRunLogs?
 
+# the run log records as a ((st_mtime_ns, st_size), records) tuple - only populated while no run is in progress
+_RUN_LOG_RECORDS_CACHE = None
+
 
 class getRunLogs(MarxanRESTHandler):
     """REST HTTP handler. Gets the run log. The required arguments in the request.arguments parameter are:  
@@ -5416,10 +6635,28 @@ class getRunLogs(MarxanRESTHandler):
     """
 
     def get(self):
+        global _RUN_LOG_RECORDS_CACHE
         try:
+            # serve the records straight from memory while the run log file is unchanged
+            try:
+                st = os.stat(MARXAN_FOLDER + RUN_LOG_FILENAME)
+                stamp = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                stamp = None
+            if stamp and _RUN_LOG_RECORDS_CACHE and (_RUN_LOG_RECORDS_CACHE[0] == stamp):
+                self.send_response({'info': "Run log returned",
+                                    'data': _RUN_LOG_RECORDS_CACHE[1]})
+                return
             runlog = _getRunLogs()
-            self.send_response({'info': "Run log returned",
-                                'data': runlog.to_dict(orient="records")})
+            # the runs_done/runs_total working columns are internal - the response keeps the "X/Y" runs column
+            records = runlog.drop(
+                columns=['runs_done', 'runs_total']).to_dict(orient="records")
+            # the runs column of running rows advances without the file being rewritten, so only reuse the records while nothing is running
+            if stamp and ('status' in runlog.columns) and not (runlog['status'] == 'Running').any():
+                _RUN_LOG_RECORDS_CACHE = (stamp, records)
+            else:
+                _RUN_LOG_RECORDS_CACHE = None
+            self.send_response({'info': "Run log returned", 'data': records})
         except MarxanServicesError as e:
             _raiseError(self, e.args[0])
 
@@ -5442,8 +6679,8 @@ class clearRunLogs(MarxanRESTHandler):
     def get(self):
         try:
             runlog = _getRunLogs()
-            runlog.loc[runlog['pid'] == -
-                       1].to_csv(MARXAN_FOLDER + RUN_LOG_FILENAME, index=False, sep='\t')
+            runlog.loc[runlog['pid'] == -1].drop(columns=['runs_done', 'runs_total']).to_csv(
+                MARXAN_FOLDER + RUN_LOG_FILENAME, index=False, sep='\t')
             self.send_response({'info': "Run log cleared"})
         except MarxanServicesError as e:
             _raiseError(self, e.args[0])
@@ -5463,11 +6700,12 @@ class dismissNotification(MarxanRESTHandler):
             "info": Informational message  
         }
     """
+    REQUIRED_ARGS = frozenset(['notificationid'])
 
     def get(self):
         try:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['notificationid'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # dismiss the notification
             _dismissNotification(self, self.get_argument('notificationid'))
             self.send_response({'info': "Notification dismissed"})
@@ -5514,14 +6752,15 @@ class deleteGapAnalysis(MarxanRESTHandler):
             "info": Informational message  
         }
     """
+    REQUIRED_ARGS = frozenset(['user', 'project'])
     async def get(self):
         try:
-            _validateArguments(self.request.arguments, ['user', 'project'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # delete the gap analysis
             project_name = _getSafeProjectName(self.get_argument("project"))
             table_name = "gap_" + \
                 self.get_argument("user") + "_" + project_name
-            await pg.execute(sql.SQL("DROP TABLE IF EXISTS marxan.{};").format(sql.Identifier(table_name.lower())))
+            await pg.execute(_formatSQL("DROP TABLE IF EXISTS marxan.{};", table_name.lower()))
             self.send_response({'info': "Gap analysis deleted"})
         except MarxanServicesError as e:
             _raiseError(self, e.args[0])
@@ -5558,20 +6797,22 @@ class runSQLFile(MarxanRESTHandler):
             "info": Informational message  
         }
     """
+    REQUIRED_ARGS = frozenset(['filename'])
     async def get(self):
         try:
-            _validateArguments(self.request.arguments, ['filename'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            filename = self.get_argument("filename")
             # check the SQL file exists
-            if not os.path.exists(MARXAN_FOLDER + self.get_argument("filename")):
+            if not os.path.exists(MARXAN_FOLDER + filename):
                 raise MarxanServicesError(
-                    "File '" + self.get_argument("filename") + "' does not exist")
+                    "File '" + filename + "' does not exist")
             # see if suppressOutput is set
             suppressOutput = True if 'suppressOutput' in self.request.arguments else False
-            # set the command
-            cmd = 'sudo -u postgres psql -f ' + MARXAN_FOLDER + self.get_argument(
-                "filename") + ' postgresql://' + DATABASE_USER + ':' + DATABASE_PASSWORD + '@localhost:5432/marxanserver'
-            # run the command
-            result = await _runCmd(cmd, suppressOutput)
+            # read the file in the executor so a large script does not block the event loop
+            sqlText = await IOLoop.current().run_in_executor(None, _readFileUnicode, MARXAN_FOLDER + filename)
+            # run the script in-process on the pooled connection rather than shelling out to psql - this avoids a process spawn and a second authentication handshake per call; psycopg2 accepts multi-statement scripts in a single execute
+            await pg.execute(sqlText)
+            result = "" if suppressOutput else "File '" + filename + "' executed"
             self.send_response({'info': result})
         except MarxanServicesError as e:
             _raiseError(self, e.args[0])
@@ -5609,10 +6850,11 @@ class shutdown(MarxanRESTHandler):
     Returns:
         None
     """
+    REQUIRED_ARGS = frozenset(['delay'])
     async def get(self):
         try:
             if platform.system() != "Windows":
-                _validateArguments(self.request.arguments, ['delay'])
+                _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
                 minutes = int(self.get_argument("delay"))
                 # this wont be sent until the await returns
                 self.send_response({'info': "Shutting down"})
@@ -5626,9 +6868,9 @@ class shutdown(MarxanRESTHandler):
                 logging.warning("marxan-server stopping due to shutdown event")
                 # delete the shutdown file
                 _deleteShutdownFile()
-                # shutdown the os
+                # shutdown the os - invoke the command directly rather than forking a shell to parse it
                 logging.warning("marxan-server stopped")
-                os.system('sudo shutdown now')
+                subprocess.run(['sudo', 'shutdown', 'now'], check=False)
         except MarxanServicesError as e:
             _raiseError(self, e.args[0])
 
@@ -5645,10 +6887,11 @@ class block(MarxanRESTHandler):
             "info": Informational message  
         }
     """
+    REQUIRED_ARGS = frozenset(['seconds'])
 
     def get(self):
         try:
-            _validateArguments(self.request.arguments, ['seconds'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             time.sleep(int(self.get_argument("seconds")))
             self.send_response({'info': "Blocking finished"})
         except MarxanServicesError as e:
@@ -5691,11 +6934,20 @@ class MarxanWebSocketHandler(tornado.websocket.WebSocketHandler):
         Returns:
             string: The name of the currently authenticated user.
         """
-        if self.get_secure_cookie("user"):
-            returnVal = self.get_secure_cookie("user").decode("utf-8")
-        else:
-            returnVal = None
-        return returnVal
+        cookie = self.get_secure_cookie("user")
+        return cookie.decode("utf-8") if cookie else None
+
+    def get_secure_cookie(self, name, *args, **kwargs):
+        """Overridden to memoise the signature verification per connection - the user and role cookies are read several times in the authentication chain when the websocket is opened and each read re-runs the HMAC check on the signed value.
+        """
+        if args or kwargs:
+            return super().get_secure_cookie(name, *args, **kwargs)
+        cache = getattr(self, "_secureCookies", None)
+        if cache is None:
+            cache = self._secureCookies = {}
+        if name not in cache:
+            cache[name] = super().get_secure_cookie(name)
+        return cache[name]
 
     def check_origin(self, origin):
         """Checks CORS access for the websocket. 
@@ -5709,10 +6961,12 @@ class MarxanWebSocketHandler(tornado.websocket.WebSocketHandler):
         """
         if DISABLE_SECURITY:
             return True
-        # the request is valid for CORS if the origin is in the list of permitted domains, or the origin is the same as the host, i.e. same machine
-        # we need to get the host_name from the origin so parse it with urlparse
+        # the request is valid for CORS if the origin is in the set of permitted domains - the common case, checked first so no url parsing is needed
+        if origin in PERMITTED_DOMAINS:
+            return True
+        # or if the origin is the same as the host, i.e. same machine - we need to get the host_name from the origin so parse it with urlparse
         parsed = urlparse(origin)
-        if (origin in PERMITTED_DOMAINS) or (parsed.netloc.find(self.request.host_name) != -1):
+        if parsed.netloc.find(self.request.host_name) != -1:
             return True
         else:
             raise HTTPError(403, "The origin '" + origin +
@@ -5729,8 +6983,12 @@ class MarxanWebSocketHandler(tornado.websocket.WebSocketHandler):
             MarxanServicesError: If the request is not authenticated or authorised.  
         """
         try:
-            # set the start time of the websocket
+            # set the start time of the websocket - startTime is kept for the run log; the monotonic clock is used for the per-message elapsed time as it is cheaper to read and immune to wall clock adjustments
             self.startTime = datetime.datetime.now()
+            self.startMonotonic = time.monotonic()
+            # cache the user name once rather than decoding it from the request arguments on every message - progress updates and pings can be sent many times a second
+            self.userName = self.request.arguments["user"][0].decode(
+                "utf-8") if "user" in self.request.arguments.keys() else None
             # set the start message
             startMessage.update({'status': 'Started'})
             self.send_response(startMessage)
@@ -5780,19 +7038,26 @@ class MarxanWebSocketHandler(tornado.websocket.WebSocketHandler):
         """
         # add in the start time
         elapsedtime = str(
-            (datetime.datetime.now() - self.startTime).seconds) + "s"
+            int(time.monotonic() - self.startMonotonic)) + "s"
         message.update({'elapsedtime': elapsedtime})
-        # add a user if passed
-        if "user" in self.request.arguments.keys():
-            message.update(
-                {'user': self.request.arguments["user"][0].decode("utf-8")})
+        # add a user if passed - decoded once in open()
+        if getattr(self, 'userName', None) is not None:
+            message.update({'user': self.userName})
         # add in messages from descendent classes
         if hasattr(self, 'pid'):
             message.update({'pid': self.pid})
         if hasattr(self, 'marxanProcess'):
             message.update({'pid': 'm' + str(self.marxanProcess.pid)})
+        # serialize here rather than letting Tornado use the stdlib json module - orjson encodes straight to utf8 bytes and is several times faster on the streaming progress updates
+        try:
+            payload = orjson.dumps(
+                message, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # fall back to the stdlib for any types that orjson cannot encode
+            payload = json.dumps(message).encode("utf-8")
         try:
-            self.write_message(message)
+            # bytes with binary=False are sent as a utf8 text frame with no re-encoding
+            self.write_message(payload)
         except WebSocketClosedError:
             self.close(clean=False)
 
@@ -5860,7 +7125,9 @@ class runMarxan(MarxanWebSocketHandler):
             pass
         else:
             # see if the project is already running - if it is then return an error
-            if _isProjectRunning(self.get_argument("user"), self.get_argument("project")):
+            project = self.get_argument("project")
+            user = self.get_argument("user")
+            if _isProjectRunning(user, project):
                 self.close({'error': "The project is already running. See <a href='" + ERRORS_PAGE +
                             "#the-project-is-already-running' target='blank'>here</a>", 'info': ''})
             else:
@@ -5907,8 +7174,8 @@ class runMarxan(MarxanWebSocketHandler):
                         # callback on the next I/O loop
                         IOLoop.current().spawn_callback(self.stream_marxan_output)
                 else:  # project does not exist
-                    self.close({'error': "Project '" + self.get_argument("project") + "' does not exist",
-                                'project': self.get_argument("project"), 'user': self.get_argument("user")})
+                    self.close({'error': "Project '" + project + "' does not exist",
+                                'project': project, 'user': user})
 
     async def stream_marxan_output(self):
         """Called on the first IOLoop callback and then streams the marxan output back to the client through WebSocket messages. Not currently supported on Windows.
@@ -6015,6 +7282,7 @@ class importFeatures(MarxanWebSocketHandler):
             "uploadIds": string[]: The Mapbox tileset upload ids (for multiple feature)  
         }  
     """
+    REQUIRED_ARGS = frozenset(['shapefile'])
     async def open(self):
         try:
             await super().open({'info': "Importing features.."})
@@ -6022,25 +7290,23 @@ class importFeatures(MarxanWebSocketHandler):
             pass
         else:
             # validate the input arguments
-            _validateArguments(self.request.arguments, ['shapefile'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # initiate the mapbox upload ids array
             uploadIds = []
             # get the name of the shapefile that has already been unzipped on the server
             shapefile = self.get_argument('shapefile')
             # if a name is passed then this is a single feature class
-            if "name" in list(self.request.arguments.keys()):
+            if "name" in self.request.arguments:
                 name = self.get_argument('name')
             else:
                 name = None
             try:
                 # get a scratch name for the import
                 scratch_name = _getUniqueFeatureclassName("scratch_")
-                # first, import the shapefile into a PostGIS feature class in EPSG:4326
-                await pg.importShapefile(IMPORT_FOLDER, shapefile, scratch_name)
-                # check the geometry
+                # first, import the shapefile into a PostGIS feature class in EPSG:4326 - the geometry is checked in the same table pass as the dateline split
                 self.send_response(
                     {'status': 'Preprocessing', 'info': "Checking the geometry.."})
-                await pg.isValid(scratch_name)
+                await pg.importShapefile(IMPORT_FOLDER, shapefile, scratch_name, validate=True)
                 # get the feature names
                 if name:  # single feature name
                     feature_names = [name]
@@ -6082,7 +7348,7 @@ class importFeatures(MarxanWebSocketHandler):
                         {'error': e.args[0], 'info': 'Failed to import features'})
             finally:
                 # delete the scratch feature class
-                await pg.execute(sql.SQL("DROP TABLE IF EXISTS marxan.{}").format(sql.Identifier(scratch_name)))
+                await pg.execute(_formatSQL("DROP TABLE IF EXISTS marxan.{}", scratch_name))
 
 # imports an item from GBIF
 
@@ -6105,6 +7371,7 @@ class importGBIFData(MarxanWebSocketHandler):
             "uploadId": The Mapbox tileset upload id  
         }  
     """
+    REQUIRED_ARGS = frozenset(['taxonKey', 'scientificName'])
     async def open(self):
         """Manages the GBIF import from downloading the data to importing into PostGIS.
         """
@@ -6114,8 +7381,8 @@ class importGBIFData(MarxanWebSocketHandler):
             pass
         else:
             # validate the input arguments
-            _validateArguments(self.request.arguments, [
-                               'taxonKey', 'scientificName'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            scientificName = self.get_argument("scientificName")
             try:
                 taxonKey = self.get_argument('taxonKey')
                 # get the occurrences using asynchronous parallel requests
@@ -6124,14 +7391,14 @@ class importGBIFData(MarxanWebSocketHandler):
                     # get the feature class name
                     feature_class_name = "gbif_" + str(taxonKey)
                     # create the table if it doesnt already exists
-                    await pg.execute(sql.SQL("DROP TABLE IF EXISTS marxan.{}").format(sql.Identifier(feature_class_name)))
-                    await pg.execute(sql.SQL("CREATE TABLE marxan.{} (eventdate date, gbifid bigint, lng double precision, lat double precision, geometry geometry)").format(sql.Identifier(feature_class_name)))
+                    await pg.execute(_formatSQL("DROP TABLE IF EXISTS marxan.{}", feature_class_name))
+                    await pg.execute(_formatSQL("CREATE TABLE marxan.{} (eventdate date, gbifid bigint, lng double precision, lat double precision, geometry geometry)", feature_class_name))
                     # insert the records - this calls _importDataFrame which is blocking
                     await IOLoop.current().run_in_executor(None, _importDataFrame, df, feature_class_name)
                     # update the geometry field
-                    await pg.execute(sql.SQL("UPDATE marxan.{} SET geometry=marxan.ST_SplitAtDateline(ST_Transform(ST_Buffer(ST_Transform(ST_SetSRID(ST_Point(lng, lat),4326),3410),%s),4326))").format(sql.Identifier(feature_class_name)), [GBIF_POINT_BUFFER_RADIUS])
+                    await pg.execute(_formatSQL("UPDATE marxan.{} SET geometry=marxan.ST_SplitAtDateline(ST_Transform(ST_Buffer(ST_Transform(ST_SetSRID(ST_Point(lng, lat),4326),3410),%s),4326))", feature_class_name), [GBIF_POINT_BUFFER_RADIUS])
                     # get the gbif vernacular name
-                    feature_name = self.get_argument('scientificName')
+                    feature_name = scientificName
                     vernacularNames = self.getVernacularNames(taxonKey)
                     description = self.getCommonName(vernacularNames)
                     # add an index and a record in the metadata_interest_features table and start the upload to mapbox
@@ -6143,7 +7410,7 @@ class importGBIFData(MarxanWebSocketHandler):
                         {'info': "Features imported", 'uploadId': uploadId})
                 else:
                     raise MarxanServicesError(
-                        "No records for " + self.get_argument('scientificName'))
+                        "No records for " + scientificName)
 
             except (MarxanServicesError) as e:
                 if "already exists" in e.args[0]:
@@ -6295,6 +7562,7 @@ class createFeaturesFromWFS(MarxanWebSocketHandler):
             "uploadId": The Mapbox tileset upload id  
         }  
     """
+    REQUIRED_ARGS = frozenset(['srs', 'endpoint', 'name', 'description', 'featuretype'])
     async def open(self):
         try:
             await super().open({'info': "Importing features.."})
@@ -6302,8 +7570,8 @@ class createFeaturesFromWFS(MarxanWebSocketHandler):
             pass
         else:
             # validate the input arguments
-            _validateArguments(self.request.arguments, [
-                               'srs', 'endpoint', 'name', 'description', 'featuretype'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            name = self.get_argument("name")
             try:
                 # get a unique feature class name for the import
                 feature_class_name = _getUniqueFeatureclassName("f_")
@@ -6312,21 +7580,19 @@ class createFeaturesFromWFS(MarxanWebSocketHandler):
                 # write it to file
                 _writeFileUnicode(
                     IMPORT_FOLDER + feature_class_name + ".gml", gml)
-                # import the GML into a PostGIS feature class in EPSG:4326
-                await pg.importGml(IMPORT_FOLDER, feature_class_name + ".gml", feature_class_name, sEpsgCode=self.get_argument('srs'))
-                # check the geometry
+                # import the GML into a PostGIS feature class in EPSG:4326 - the geometry is checked in the same table pass as the dateline split
                 self.send_response(
                     {'status': 'Preprocessing', 'info': "Checking the geometry.."})
-                await pg.isValid(feature_class_name)
+                await pg.importGml(IMPORT_FOLDER, feature_class_name + ".gml", feature_class_name, sEpsgCode=self.get_argument('srs'), validate=True)
                 # add an index and a record in the metadata_interest_features table and start the upload to mapbox
-                id, uploadId = await _finishCreatingFeature(feature_class_name, self.get_argument('name'), self.get_argument('description'), "Imported from web service", self.get_current_user())
+                id, uploadId = await _finishCreatingFeature(feature_class_name, name, self.get_argument('description'), "Imported from web service", self.get_current_user())
                 self.send_response({'id': id, 'feature_class_name': feature_class_name, 'uploadId': uploadId,
-                                    'info': "Feature '" + self.get_argument('name') + "' imported", 'status': 'FeatureCreated'})
+                                    'info': "Feature '" + name + "' imported", 'status': 'FeatureCreated'})
                 # complete
                 self.close({'info': "Features imported", 'uploadId': uploadId})
             except (MarxanServicesError) as e:
                 if "already exists" in e.args[0]:
-                    self.close({'error': "The feature '" + self.get_argument('name') +
+                    self.close({'error': "The feature '" + name +
                                 "' already exists", 'info': 'Failed to import features'})
                 else:
                     self.close(
@@ -6358,18 +7624,21 @@ class exportProject(MarxanWebSocketHandler):
             "uploadId": The Mapbox tileset upload id  
         }  
     """
+    REQUIRED_ARGS = frozenset(['user', 'project'])
     async def open(self):
         try:
             await super().open({'info': "Exporting project.."})
         except MarxanServicesError:  # authentication/authorisation error
             pass
         else:
-            _validateArguments(self.request.arguments, ['user', 'project'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            project = self.get_argument("project")
+            user = self.get_argument("user")
             self.send_response(
                 {'status': 'Preprocessing', 'info': "Copying project folder.."})
             # create a folder in the export folder to hold all the files
             exportFolder = EXPORT_FOLDER + \
-                self.get_argument('user') + "_" + self.get_argument('project')
+                user + "_" + project
             # remote the folder if it already exists
             if os.path.exists(exportFolder):
                 shutil.rmtree(exportFolder)
@@ -6420,8 +7689,8 @@ class exportProject(MarxanWebSocketHandler):
             # delete the folder
             shutil.rmtree(exportFolder)
             # return the results
-            self.close({'info': "Export project complete", 'filename': self.get_argument(
-                'user') + "_" + self.get_argument('project') + ".mxw"})
+            self.close({'info': "Export project complete",
+                        'filename': user + "_" + project + ".mxw"})
 
 
 class importProject(MarxanWebSocketHandler):
@@ -6441,10 +7710,11 @@ class importProject(MarxanWebSocketHandler):
             "status": One of Preprocessing or Finished  
         }  
     """
+    REQUIRED_ARGS = frozenset(['user', 'project', 'filename', 'description'])
     async def open(self):
         try:
-            _validateArguments(self.request.arguments, [
-                               'user', 'project', 'filename', 'description'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            filename = self.get_argument("filename")
             user = self.get_argument('user')
             project = self.get_argument('project').strip()
             projectFolder = MARXAN_USERS_FOLDER + user + os.sep + project + os.sep
@@ -6454,7 +7724,7 @@ class importProject(MarxanWebSocketHandler):
             os.mkdir(projectFolder)
             # unzip the files to the project folder
             zip_ref = zipfile.ZipFile(
-                IMPORT_FOLDER + self.get_argument('filename'), 'r')
+                IMPORT_FOLDER + filename, 'r')
             zip_ref.extractall(projectFolder)
             await super().open({'info': "Importing project.."})
         except MarxanServicesError:  # authentication/authorisation error
@@ -6550,7 +7820,7 @@ class importProject(MarxanWebSocketHandler):
             os.remove(projectFolder + EXPORT_F_METADATA)
             os.remove(projectFolder + EXPORT_PU_METADATA)
             #remove the zip file
-            os.remove(IMPORT_FOLDER + self.get_argument('filename'))
+            os.remove(IMPORT_FOLDER + filename)
             # return the results
             self.close({'info': "Import project complete"})
 
@@ -6605,24 +7875,27 @@ class preprocessFeature(QueryWebSocketHandler):
             "pu_count": The total number of planning grids that intersect the feature  
         }  
     """
+    REQUIRED_ARGS = frozenset(['user', 'project', 'id', 'feature_class_name', 'alias', 'planning_grid_name'])
     async def open(self):
         try:
             await super().open({'info': "Preprocessing '" + self.get_argument('alias') + "'.."})
         except MarxanServicesError:  # authentication/authorisation error
             pass
         else:
-            _validateArguments(self.request.arguments, [
-                               'user', 'project', 'id', 'feature_class_name', 'alias', 'planning_grid_name'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            alias = self.get_argument("alias")
+            feature_class_name = self.get_argument("feature_class_name")
+            planning_grid_name = self.get_argument("planning_grid_name")
             # run the query asynchronously and wait for the results
             try:
                 #see what geometry type the feature class has
-                geometryType = await pg.getGeometryType(self.get_argument('feature_class_name'))
+                geometryType = await pg.getGeometryType(feature_class_name)
                 if (geometryType != 'ST_Point'):
                     #if the geometry type is a polygon, then get the area for each planning unit
-                    intersectionData = await self.executeQuery(sql.SQL("SELECT metadata.oid::integer species, puid pu, ST_Area(ST_Transform(ST_Union(ST_Intersection(grid.geometry,feature.geometry)),3410)) amount from marxan.{grid} grid, marxan.{feature} feature, marxan.metadata_interest_features metadata where st_intersects(grid.geometry,feature.geometry) and metadata.feature_class_name = %s group by 1,2;").format(grid=sql.Identifier(self.get_argument('planning_grid_name')), feature=sql.Identifier(self.get_argument('feature_class_name'))), data=[self.get_argument('feature_class_name')], returnFormat="DataFrame")
+                    intersectionData = await self.executeQuery(sql.SQL("SELECT metadata.oid::integer species, puid pu, ST_Area(ST_Transform(ST_Union(ST_Intersection(grid.geometry,feature.geometry)),3410)) amount from marxan.{grid} grid, marxan.{feature} feature, marxan.metadata_interest_features metadata where st_intersects(grid.geometry,feature.geometry) and metadata.feature_class_name = %s group by 1,2;").format(grid=sql.Identifier(planning_grid_name), feature=sql.Identifier(feature_class_name)), data=[feature_class_name], returnFormat="DataFrame")
                 else:
                     #if the geometry type is a point, then sum the point values for each planning unit
-                    intersectionData = await self.executeQuery(sql.SQL("SELECT metadata.oid::integer species, puid pu, SUM(feature.value) amount FROM marxan.{grid} grid, marxan.{feature} feature, marxan.metadata_interest_features metadata WHERE st_intersects(grid.geometry,feature.geometry) AND metadata.feature_class_name = %s GROUP BY 1,2;").format(grid=sql.Identifier(self.get_argument('planning_grid_name')), feature=sql.Identifier(self.get_argument('feature_class_name'))), data=[self.get_argument('feature_class_name')], returnFormat="DataFrame")
+                    intersectionData = await self.executeQuery(sql.SQL("SELECT metadata.oid::integer species, puid pu, SUM(feature.value) amount FROM marxan.{grid} grid, marxan.{feature} feature, marxan.metadata_interest_features metadata WHERE st_intersects(grid.geometry,feature.geometry) AND metadata.feature_class_name = %s GROUP BY 1,2;").format(grid=sql.Identifier(planning_grid_name), feature=sql.Identifier(feature_class_name)), data=[feature_class_name], returnFormat="DataFrame")
             except (MarxanServicesError) as e: # if the user stops the preprocessing
                 self.close({'error': e.args[0] })
             else:
@@ -6658,8 +7931,8 @@ class preprocessFeature(QueryWebSocketHandler):
                     _updateParameters(
                         self.folder_project + PROJECT_DATA_FILENAME, {'PUVSPRNAME': PUVSPR_FILENAME})
                     # set the response
-                    self.close({'info': "Feature '" + self.get_argument('alias') + "' preprocessed", "feature_class_name": self.get_argument(
-                        'feature_class_name'), "pu_area": str(record.iloc[0]['pu_area']), "pu_count": str(record.iloc[0]['pu_count']), "id": str(speciesId)})
+                    self.close({'info': "Feature '" + alias + "' preprocessed", "feature_class_name": feature_class_name, "pu_area": str(
+                        record.iloc[0]['pu_area']), "pu_count": str(record.iloc[0]['pu_count']), "id": str(speciesId)})
 
 # wss://61c92e42cb1042699911c485c38d52ae.vfs.cloud9.eu-west-1.amazonaws.com:8081/marxan-server/preprocessProtectedAreas?user=andrew&project=Tonga%20marine%2030km2&planning_grid_name=pu_ton_marine_hexagon_30
 
@@ -6681,14 +7954,14 @@ class preprocessProtectedAreas(QueryWebSocketHandler):
             "intersections" list[]: The intersection data between the planning units and the protected areas normalised by IUCN category. e.g. [['II',[245,3586]],['III',[45,297,5908,5909]]]  
         }   
     """
+    REQUIRED_ARGS = frozenset(['user', 'project', 'planning_grid_name'])
     async def open(self):
         try:
             await super().open({'info': "Preprocessing protected areas"})
         except MarxanServicesError:  # authentication/authorisation error
             pass
         else:
-            _validateArguments(self.request.arguments, [
-                               'user', 'project', 'planning_grid_name'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # do the intersection with the protected areas
             await _preprocessProtectedAreas(self, self.get_argument('planning_grid_name'), self.folder_input)
             # get the data to return to the client
@@ -6718,16 +7991,17 @@ class reprocessProtectedAreas(QueryWebSocketHandler):
             "status": One of Preprocessing or Finished  
         }  
     """
+    REQUIRED_ARGS = frozenset(['user'])
     async def open(self):
         try:
             await super().open({'info': "Reprocessing protected areas for projects"})
         except MarxanServicesError:  # authentication/authorisation error
             pass
         else:
-            _validateArguments(self.request.arguments, ['user'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            user = self.get_argument("user")
             # get the folder to process
-            folder = CASE_STUDIES_FOLDER if self.get_argument(
-                'user') == 'case_studies' else self.get_argument('user')
+            folder = CASE_STUDIES_FOLDER if user == 'case_studies' else user
             # reprocess the folder
             await _reprocessProtectedAreas(self, folder)
             # set the response
@@ -6751,28 +8025,29 @@ class preprocessPlanningUnits(QueryWebSocketHandler):
             "status": One of Preprocessing or Finished  
         }  
     """
+    REQUIRED_ARGS = frozenset(['user', 'project'])
     async def open(self):
         try:
             await super().open({'info': "Calculating boundary lengths"})
         except MarxanServicesError:  # authentication/authorisation error
             pass
         else:
-            _validateArguments(self.request.arguments, ['user', 'project'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # get the project data
             await _getProjectData(self)
             if (not self.projectData["metadata"]["OLDVERSION"]):
                 # new version of marxan - get the boundary lengths
                 feature_class_name = _getUniqueFeatureclassName("tmp_")
-                await pg.execute(sql.SQL("DROP TABLE IF EXISTS marxan.{};").format(sql.Identifier(feature_class_name)))
+                await pg.execute(_formatSQL("DROP TABLE IF EXISTS marxan.{};", feature_class_name))
                 # do the intersection
                 results = await self.executeQuery(sql.SQL("CREATE TABLE marxan.{feature_class_name} AS SELECT DISTINCT a.puid id1, b.puid id2, ST_Length(ST_CollectionExtract(ST_Intersection(ST_Transform(a.geometry, 3410), ST_Transform(b.geometry, 3410)), 2))/1000 boundary  FROM marxan.{planning_unit_name} a, marxan.{planning_unit_name} b  WHERE a.puid < b.puid AND ST_Touches(a.geometry, b.geometry);").format(feature_class_name=sql.Identifier(feature_class_name), planning_unit_name=sql.Identifier(self.projectData["metadata"]["PLANNING_UNIT_NAME"])))
                 # delete the file if it already exists
                 if (os.path.exists(self.folder_input + BOUNDARY_LENGTH_FILENAME)):
                     os.remove(self.folder_input + BOUNDARY_LENGTH_FILENAME)
                 # write the boundary lengths to file
-                await pg.execute(sql.SQL("SELECT * FROM marxan.{};").format(sql.Identifier(feature_class_name)), returnFormat="File", filename=self.folder_input + BOUNDARY_LENGTH_FILENAME)
+                await pg.execute(_formatSQL("SELECT * FROM marxan.{};", feature_class_name), returnFormat="File", filename=self.folder_input + BOUNDARY_LENGTH_FILENAME)
                 # delete the tmp table
-                await pg.execute(sql.SQL("DROP TABLE IF EXISTS marxan.{};").format(sql.Identifier(feature_class_name)))
+                await pg.execute(_formatSQL("DROP TABLE IF EXISTS marxan.{};", feature_class_name))
                 # update the input.dat file
                 _updateParameters(
                     self.folder_project + PROJECT_DATA_FILENAME, {'BOUNDNAME': 'bounds.dat'})
@@ -6802,30 +8077,34 @@ class createPlanningUnitGrid(QueryWebSocketHandler):
             "uploadId": The Mapbox tileset upload id  
         }
     """
+    REQUIRED_ARGS = frozenset(['iso3', 'domain', 'areakm2', 'shape'])
     async def open(self):
         try:
             await super().open({'info': "Creating planning grid.."})
         except MarxanServicesError:  # authentication/authorisation error
             pass
         else:
-            _validateArguments(self.request.arguments, [
-                               'iso3', 'domain', 'areakm2', 'shape'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            areakm2 = self.get_argument("areakm2")
+            domain = self.get_argument("domain")
+            iso3 = self.get_argument("iso3")
+            shape = self.get_argument("shape")
             # get the feature class name
-            fc = "pu_" + self.get_argument('iso3').lower() + "_" + self.get_argument('domain').lower(
-            ) + "_" + self.get_argument('shape').lower() + "_" + self.get_argument('areakm2')
+            fc = "pu_" + iso3.lower() + "_" + domain.lower(
+            ) + "_" + shape.lower() + "_" + areakm2
             # see if the planning grid already exists
             records = await pg.execute("SELECT * FROM marxan.metadata_planning_units WHERE feature_class_name =(%s);", data=[fc], returnFormat="Array")
             if len(records):
                 self.close({'error': "That item already exists"})
             else:
                 # estimate how many planning units are in the grid that will be created
-                unitCount = await _estimatePlanningUnitCount(self.get_argument('areakm2'), self.get_argument('iso3'), self.get_argument('domain'))
+                unitCount = await _estimatePlanningUnitCount(areakm2, iso3, domain)
                 # see if the unit count is above the PLANNING_GRID_UNITS_LIMIT
                 if (int(unitCount) > PLANNING_GRID_UNITS_LIMIT):
                     self.close({'error': "Number of planning units &gt; " + str(PLANNING_GRID_UNITS_LIMIT) + " (=" + str(int(unitCount)) +
                                 "). See <a href='" + ERRORS_PAGE + "#number-of-planning-units-exceeds-the-threshold' target='blank'>here</a>"})
                 else:
-                    results = await self.executeQuery("SELECT * FROM marxan.planning_grid(%s,%s,%s,%s,%s);", [self.get_argument('areakm2'), self.get_argument('iso3'), self.get_argument('domain'), self.get_argument('shape'), self.get_current_user()], returnFormat="Array")
+                    results = await self.executeQuery("SELECT * FROM marxan.planning_grid(%s,%s,%s,%s,%s);", [areakm2, iso3, domain, shape, self.get_current_user()], returnFormat="Array")
                     if results:
                         # get the planning grid alias
                         alias = results[0][0]
@@ -6833,6 +8112,8 @@ class createPlanningUnitGrid(QueryWebSocketHandler):
                         await pg.createPrimaryKey(fc, "puid")
                         # start the upload to Mapbox
                         uploadId = await _uploadTilesetToMapbox(fc, fc)
+                        # the cached planning grid metadata is now stale
+                        _RESPONSE_CACHE.pop("planning_unit_grids", None)
                         # set the response
                         self.close({'info': "Planning grid '" + alias + "' created",
                                     'feature_class_name': fc, 'alias': alias, 'uploadId': uploadId})
@@ -6856,13 +8137,14 @@ class runGapAnalysis(QueryWebSocketHandler):
             "data": dict[]: The gap analysis results. Each dict has the keys: country_area,current_protected_area,current_protected_percent,endemic,total_area,_alias,_feature_class_name  
         }   
     """
+    REQUIRED_ARGS = frozenset(['user', 'project'])
     async def open(self):
         try:
             await super().open({'info': "Running gap analysis.."})
         except MarxanServicesError:  # authentication/authorisation error
             pass
         else:
-            _validateArguments(self.request.arguments, ['user', 'project'])
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
             # get the identifiers of the features for the project
             df = await _getProjectInputData(self, "SPECNAME")
             featureIds = df['id'].to_numpy().tolist()
@@ -6965,6 +8247,7 @@ class updateWDPA(QueryWebSocketHandler):
             "status": One of Preprocessing or Finished  
         }  
     """
+    REQUIRED_ARGS = frozenset(['downloadUrl'])
     # authenticate and get the user folder and project folders
     async def open(self):
         try:
@@ -6972,8 +8255,8 @@ class updateWDPA(QueryWebSocketHandler):
         except MarxanServicesError:  # authentication/authorisation error
             pass
         else:
-            _validateArguments(self.request.arguments, ['downloadUrl'])
-            if "unittest" in list(self.request.arguments.keys()):
+            _validateArguments(self.request.arguments, self.REQUIRED_ARGS)
+            if "unittest" in self.request.arguments:
                 unittest = True
                 # if we are running a unit test then download the WDPA from a minimal zipped file geodatabase on google storage
                 downloadUrl = 'https://storage.googleapis.com/geeimageserver.appspot.com/WDPA_Jun2020.zip'
@@ -6994,7 +8277,7 @@ class updateWDPA(QueryWebSocketHandler):
                     # download finished - upzip the file geodatabase
                     self.send_response(
                         {'status': 'Preprocessing', 'info': "Unzipping file geodatabase '" + WDPA_DOWNLOAD_FILENAME + "'"})
-                    files = await IOLoop.current().run_in_executor(None, _unzipFile, IMPORT_FOLDER, WDPA_DOWNLOAD_FILENAME)
+                    files = await IOLoop.current().run_in_executor(IMPORT_EXECUTOR, _unzipFile, IMPORT_FOLDER, WDPA_DOWNLOAD_FILENAME)
                     # check the contents of the unzipped file - the contents should include a folder ending in .gdb - this is the file geodatabase
                     fileGDBPath = [f for f in files if f[-5:]
                                    == '.gdb' + os.sep][0]
@@ -7029,7 +8312,7 @@ class updateWDPA(QueryWebSocketHandler):
                             self.send_response(
                                 {'status': "Preprocessing", 'info': "Renamed 'wdpa' to 'wdpa_old'"})
                             # rename the tmp feature class
-                            await pg.execute(sql.SQL("ALTER TABLE marxan.{} RENAME TO wdpa;").format(sql.Identifier(feature_class_name)))
+                            await pg.execute(_formatSQL("ALTER TABLE marxan.{} RENAME TO wdpa;", feature_class_name))
                             self.send_response(
                                 {'status': "Preprocessing", 'info': "Renamed '" + feature_class_name + "' to 'wdpa'"})
                             # drop the columns that are not needed
@@ -7046,7 +8329,7 @@ class updateWDPA(QueryWebSocketHandler):
                                 {'status': "Preprocessing", 'info': "Deleted dissolved country WDPA feature classes"})
                         else:
                             # delete the tmp feature
-                            await pg.execute(sql.SQL("DROP TABLE IF EXISTS marxan.{}").format(sql.Identifier(feature_class_name)))
+                            await pg.execute(_formatSQL("DROP TABLE IF EXISTS marxan.{}", feature_class_name))
                             self.send_response(
                                 {'status': "Preprocessing", 'info': "Unittest has not replaced existing WDPA file"})
                     except (OSError) as e:  # TODO Add other exception classes especially PostGIS ones
@@ -7183,6 +8466,7 @@ class Application(tornado.web.Application):
             ("/marxan-server/importFeatures", importFeatures),
             ("/marxan-server/exportFeature", exportFeature),
             ("/marxan-server/deleteFeature", deleteFeature),
+            ("/marxan-server/deleteFeatures", deleteFeatures),
             ("/marxan-server/createFeatureFromLinestring",
              createFeatureFromLinestring),
             ("/marxan-server/createFeaturesFromWFS", createFeaturesFromWFS),
@@ -7237,7 +8521,7 @@ class Application(tornado.web.Application):
             ("/marxan-server/block", block),
             ("/marxan-server/testTornado", testTornado),
             ("/marxan-server/exports/(.*)",
-             StaticFileHandler, dict(path=EXPORT_FOLDER)),
+             exportFileHandler, dict(path=EXPORT_FOLDER)),
             # default handler if the REST services is cannot be found on this server - maybe a newer client is requesting a method on an old server
             ("/marxan-server/(.*)", methodNotFound),
             # assuming the marxan-client is installed in the same folder as the marxan-server all files will go to the client build folder
@@ -7324,10 +8608,15 @@ async def initialiseApp():
     if platform.system() == "Windows":
         asyncio.set_event_loop_policy(AnyThreadEventLoopPolicy())
     await SHUTDOWN_EVENT.wait()
+    # close the shared Mapbox session if it was created
+    if _MAPBOX_SESSION is not None:
+        await _MAPBOX_SESSION.close()
     log("Closing Postgres connections..")
     # close the database connection
     pg.pool.close()
     await pg.pool.wait_closed()
+    # stop the GDAL import worker processes
+    IMPORT_EXECUTOR.shutdown()
 
 if __name__ == "__main__":
     try:
@@ -435,6 +435,24 @@ class TestClass(AsyncHTTPTestCase):
         for f in fcns:
             self.makeRequest('/deleteFeature?feature_name=' + f, False)
 
+    def test_057a_deleteFeatures(self):
+        #create two features to delete in a single batch
+        body = urllib.parse.urlencode({"name": "wibble_batch_1","description":"wibble","linestring":"Linestring(-175.3421006344285 -20.69048933878365,-175.4011153142698 -20.86450796169632,-175.001631327652 -20.868749810194487,-174.98801255538095 -20.60977871499442,-175.3421006344285 -20.69048933878365)"})
+        f1 = self.makeRequest('/createFeatureFromLinestring', False, method="POST", body=body)
+        body = urllib.parse.urlencode({"name": "wibble_batch_2","description":"wibble","linestring":"Linestring(-175.3421006344285 -20.69048933878365,-175.4011153142698 -20.86450796169632,-175.001631327652 -20.868749810194487,-174.98801255538095 -20.60977871499442,-175.3421006344285 -20.69048933878365)"})
+        f2 = self.makeRequest('/createFeatureFromLinestring', False, method="POST", body=body)
+        #delete both features in one request
+        self.makeRequest('/deleteFeatures?feature_names=' + f1['feature_class_name'] + ',' + f2['feature_class_name'], False)
+        #the metadata records and feature classes should both be gone
+        _dict = self.makeRequest('/getAllSpeciesData', False)
+        remaining = [f['feature_class_name'] for f in _dict['data']]
+        self.assertFalse(f1['feature_class_name'] in remaining)
+        self.assertFalse(f2['feature_class_name'] in remaining)
+        #system supplied features cannot be deleted
+        self.makeRequest('/deleteFeatures?feature_names=intersesting_habitat', True)
+        #features that are in use cannot be deleted - volcano is in the test projects interest features
+        self.makeRequest('/deleteFeatures?feature_names=volcano', True)
+
     def test_058_createFeaturesFromWFS(self):
         features = self.makeWebSocketRequest('/createFeaturesFromWFS?endpoint=https%3A%2F%2Fdservices2.arcgis.com%2F7p8XMQ9sy7kJZN4K%2Farcgis%2Fservices%2FCranes_Species_Ranges%2FWFSServer%3Fservice%3Dwfs&featuretype=Cranes_Species_Ranges%3ABlack_Crowned_Cranes&name=test2&description=wibble&srs=EPSG:3857', False)
         #get the feature class names of those that have been imported